@@ -0,0 +1,142 @@
+"""
+Compares dispatching component interactions through every waiter's check function (the way
+`bot.wait_for("component_interaction", check=...)` works) against
+`utils.ComponentInteractionRouter`, which looks waiters up by their interaction ID.
+
+Run from the repository root:
+
+    $ python -m benchmarks.component_interaction_router --waiters 10000 --clicks 1000
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from collections.abc import Callable
+
+from cogs import utils
+
+
+class FakeComponentInteraction:
+    __slots__ = ("custom_id", "user")
+
+    def __init__(self, custom_id: str, user: int) -> None:
+        self.custom_id = custom_id
+        self.user = user
+
+
+def legacy_check_factory(
+    interaction_id: str, users: list[int], actions: list[str]
+) -> Callable[[FakeComponentInteraction], bool]:
+    # Mirrors the check closure the old wait_for_component_interaction gave to bot.wait_for
+    def check(component_interaction: FakeComponentInteraction) -> bool:
+        try:
+            found_interaction_id, found_action = component_interaction.custom_id.split(
+                "_", 1
+            )
+        except ValueError:
+            return False
+
+        if found_interaction_id != interaction_id:
+            return False
+
+        if users and component_interaction.user not in users:
+            return False
+
+        if actions and found_action not in actions:
+            return False
+
+        return True
+
+    return check
+
+
+def bench_legacy(
+    waiters: list[tuple[str, int]], clicks: list[FakeComponentInteraction]
+) -> float:
+    listeners = [
+        legacy_check_factory(interaction_id, [user], ["YES", "NO"])
+        for interaction_id, user in waiters
+    ]
+
+    start = time.perf_counter()
+
+    for click in clicks:
+        # Same as discord's dispatch: run every check, drop the listeners that matched
+        removed: list[int] = []
+        for index, check in enumerate(listeners):
+            if check(click):
+                removed.append(index)
+        for index in reversed(removed):
+            del listeners[index]
+
+    return time.perf_counter() - start
+
+
+async def bench_router(
+    waiters: list[tuple[str, int]], clicks: list[FakeComponentInteraction]
+) -> float:
+    tasks = [
+        asyncio.create_task(
+            utils.ComponentInteractionRouter.wait_for(
+                interaction_id,
+                users=[user],  # pyright: ignore[reportArgumentType]
+                actions=["YES", "NO"],
+                timeout=None,
+            )
+        )
+        for interaction_id, user in waiters
+    ]
+
+    # Let every waiter register itself
+    await asyncio.sleep(0)
+
+    start = time.perf_counter()
+
+    for click in clicks:
+        utils.ComponentInteractionRouter.route(
+            click  # pyright: ignore[reportArgumentType]
+        )
+
+    elapsed = time.perf_counter() - start
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--waiters", type=int, default=10_000)
+    parser.add_argument("--clicks", type=int, default=1_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    waiters = [
+        (uuid.uuid4().hex, random.randrange(10**17, 10**18))
+        for _ in range(args.waiters)
+    ]
+    clicks = [
+        FakeComponentInteraction(
+            f"{interaction_id}_{random.choice(['YES', 'NO'])}", user
+        )
+        for interaction_id, user in random.sample(
+            waiters, min(args.clicks, len(waiters))
+        )
+    ]
+
+    legacy = bench_legacy(waiters, clicks)
+    router = asyncio.run(bench_router(waiters, clicks))
+
+    print(f"{args.waiters} waiters, {len(clicks)} clicks")
+    print(f"  check functions: {legacy / len(clicks) * 1e6:10.2f} µs/click")
+    print(f"  router:          {router / len(clicks) * 1e6:10.2f} µs/click")
+    print(f"  speedup:         {legacy / router:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Measures how much memory a leaderboard snapshot takes, compared to the dict and list
+based cache `LeaderboardCache` used to keep (a position per user ID, an overtake
+difference per position and a `Pp` for every row while building).
+
+The peak is the most memory held at once while building, which is what every refresh
+needs. Doesn't need a database, rows are generated in memory. The legacy layout needs a
+few GB at 10M users, leave it out with `--skip-legacy`:
+
+    $ python -m benchmarks.leaderboard_memory --users 1000000 10000000
+"""
+
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from datetime import datetime
+from typing import Any
+
+from cogs import utils
+
+
+def generate_records(users: int) -> Iterator[dict[str, Any]]:
+    """Ranked like the size leaderboard query, one record at a time"""
+    created_at = datetime(2024, 1, 1)
+    size = users * 10
+
+    for _ in range(users):
+        size -= random.randint(0, 19)
+        yield {
+            "user_id": random.getrandbits(60),
+            "pp_multiplier": random.randint(1, 10_000),
+            "pp_size": size,
+            "pp_name": "Unnamed Pp",
+            "digging_depth": 0,
+            "created_at": created_at,
+            "version": 0,
+            "value": size,
+        }
+
+
+def build_legacy(records: Iterator[dict[str, Any]]) -> tuple[Any, ...]:
+    positions_per_user_id: dict[int, int] = {}
+    leaderboard_items: list[tuple[utils.Pp, int]] = []
+    values_by_position: list[int] = []
+    next_place: utils.Pp | None = None
+
+    for n, record in enumerate(records):
+        record.pop("value")
+        pp = utils.Pp.from_record(record)  # type: ignore
+
+        if n < 10:
+            leaderboard_items.append((pp, pp.size.value))
+
+        if next_place is None:
+            overtake_difference = 0
+        else:
+            overtake_difference = next_place.size.value - pp.size.value
+
+        positions_per_user_id[record["user_id"]] = n + 1
+        values_by_position.append(overtake_difference)
+        next_place = pp
+
+    return positions_per_user_id, leaderboard_items, values_by_position
+
+
+def build_snapshot(records: Iterator[dict[str, Any]]) -> utils.LeaderboardSnapshot:
+    return utils.LeaderboardSnapshot.from_records(records)
+
+
+LAYOUTS: dict[str, Callable[[Iterator[dict[str, Any]]], Any]] = {
+    "legacy": build_legacy,
+    "snapshot": build_snapshot,
+}
+
+
+def measure(
+    build: Callable[[Iterator[dict[str, Any]]], Any], users: int, seed: int
+) -> tuple[int, int, float]:
+    """Returns `(retained: int, peak: int, elapsed: float)`, in bytes and seconds"""
+    random.seed(seed)
+    gc.collect()
+    tracemalloc.start()
+
+    start = time.perf_counter()
+    leaderboard = build(generate_records(users))
+    elapsed = time.perf_counter() - start
+
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del leaderboard
+
+    return retained, peak, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, nargs="+", default=[1_000_000, 10_000_000])
+    parser.add_argument("--skip-legacy", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    layouts = [name for name in LAYOUTS if not (args.skip_legacy and name == "legacy")]
+
+    print(
+        f"  {'users':>10} {'layout':<10} {'retained':>12} {'per user':>9}"
+        f" {'peak':>12} {'per user':>9} {'build':>8}"
+    )
+
+    for users in args.users:
+        for name in layouts:
+            retained, peak, elapsed = measure(LAYOUTS[name], users, args.seed)
+            print(
+                f"  {users:>10} {name:<10}"
+                f" {retained / 2**20:>9.1f} MB {retained / users:>7.1f} B"
+                f" {peak / 2**20:>9.1f} MB {peak / users:>7.1f} B {elapsed:>7.1f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -251,6 +251,7 @@ class BegCommandCog(vbu.Cog[utils.Bot]):
     @commands.command(
         "beg",
         utils.Command,
+        serialised=True,
         category=utils.CommandCategory.GROWING_PP,
         application_command_meta=commands.ApplicationCommandMeta(),
     )
@@ -263,24 +264,24 @@ class BegCommandCog(vbu.Cog[utils.Bot]):
         """
         Beg for some inches
         """
-        async with (
-            utils.DatabaseWrapper() as db,
-            db.conn.transaction(),
-            utils.DatabaseTimeoutManager.notify(
-                ctx.author.id, "You're still busy begging!"
-            ),
-        ):
-            pp = await utils.Pp.fetch_from_user(db.conn, ctx.author.id, edit=True)
-
-            if utils.MinigameDialogueManager.variant == "christmas":
-                activity = ChristmasActivity.random()
-                dialogue = self.CHRISTMAS_DIALOGUE
-            else:
-                activity = Activity.random()
-                dialogue = self.DEFAULT_DIALOGUE
-
-            if activity.name.endswith("_MINIGAME"):
-                activity = cast(MinigameActivity | ChristmasMinigameActivity, activity)
+        if utils.MinigameDialogueManager.variant == "christmas":
+            activity = ChristmasActivity.random()
+            dialogue = self.CHRISTMAS_DIALOGUE
+        else:
+            activity = Activity.random()
+            dialogue = self.DEFAULT_DIALOGUE
+
+        if activity.name.endswith("_MINIGAME"):
+            activity = cast(MinigameActivity | ChristmasMinigameActivity, activity)
+
+            async with (
+                utils.DatabaseWrapper() as db,
+                db.conn.transaction(),
+                utils.DatabaseTimeoutManager.notify(
+                    ctx.author.id, "You're still busy begging!"
+                ),
+            ):
+                pp = await utils.Pp.fetch_from_user(db.conn, ctx.author.id, edit=True)
                 await self.start_minigame(
                     activity,
                     bot=self.bot,
@@ -288,43 +289,57 @@ class BegCommandCog(vbu.Cog[utils.Bot]):
                     pp=pp,
                     interaction=ctx.interaction,
                 )
-                return
-
-            donator = random.choice(list(dialogue.donators))
-            embed = utils.Embed()
-
-            if activity in [Activity.DONATION, ChristmasActivity.DONATION]:
-                pp.grow_with_multipliers(
-                    random.randint(1, 15),
-                    voted=await pp.has_voted(),
-                    channel=ctx.channel,
+            return
+
+        donator = random.choice(list(dialogue.donators))
+        embed = utils.Embed()
+
+        if activity in [Activity.DONATION, ChristmasActivity.DONATION]:
+            growth = random.randint(1, 15)
+            voted = await vbu.user_has_voted(ctx.author.id)
+
+            async with (
+                utils.DatabaseWrapper() as db,
+                utils.DatabaseTimeoutManager.notify(
+                    ctx.author.id, "You're still busy begging!"
+                ),
+            ):
+                pp = await utils.Pp.grow_from_user(
+                    db.conn, ctx.author.id, growth, voted=voted, channel=ctx.channel
                 )
-                embed.colour = utils.GREEN
-                embed.description = f"**{donator}** donated {pp.format_growth()} to {ctx.author.mention}"
+                assert pp is not None
 
-            elif activity in [Activity.REJECTION, ChristmasActivity.REJECTION]:
-                embed.colour = utils.BLUE
-                response = dialogue.donators[donator]
+            embed.colour = utils.GREEN
+            embed.description = (
+                f"**{donator}** donated {pp.format_growth()} to {ctx.author.mention}"
+            )
 
-                if isinstance(response, list):
-                    quote = random.choice(response)
-                elif isinstance(response, str):
-                    quote = response
-                else:
-                    quote = random.choice(dialogue.responses)
+        elif activity in [Activity.REJECTION, ChristmasActivity.REJECTION]:
+            # Nothing to write, but beggars still need a pp
+            async with utils.DatabaseWrapper() as db:
+                await utils.Pp.fetch_from_user(db.conn, ctx.author.id)
 
-                embed.description = f"**{donator}:** {quote}"
+            embed.colour = utils.BLUE
+            response = dialogue.donators[donator]
 
+            if isinstance(response, list):
+                quote = random.choice(response)
+            elif isinstance(response, str):
+                quote = response
             else:
-                raise ValueError(
-                    f"Can't complete begging command: No handling for activity {activity!r}"
-                    " available"
-                )
+                quote = random.choice(dialogue.responses)
+
+            embed.description = f"**{donator}:** {quote}"
+
+        else:
+            raise ValueError(
+                f"Can't complete begging command: No handling for activity {activity!r}"
+                " available"
+            )
 
-            await pp.update(db.conn)
-            embed.add_tip()
+        embed.add_tip()
 
-            await ctx.interaction.response.send_message(embed=embed)
+        await ctx.interaction.response.send_message(embed=embed)
 
 
 async def setup(bot: utils.Bot):
@@ -2,11 +2,10 @@ import asyncio
 import enum
 import uuid
 import random
-from datetime import datetime, timedelta, UTC
 from typing import Self, Literal, NoReturn
 
 import discord
-from discord.ext import commands, vbu, tasks
+from discord.ext import commands, vbu
 
 from . import utils
 
@@ -35,6 +34,8 @@ class CasinoSession(utils.Object):
     MIN_STAKES = 25
     MAX_STAKES = 10**7
     cache: dict[commands.SlashContext[utils.Bot], Self] = {}
+    sessions_by_id: dict[str, Self] = {}
+    timeouts = utils.DeadlineScheduler()
     _repr_attributes = ("ctx", "id", "stakes", "pp", "state")
 
     def __init__(self, ctx: commands.SlashContext[utils.Bot], pp: utils.Pp) -> None:
@@ -48,8 +49,20 @@ class CasinoSession(utils.Object):
         )
         self.game_components = discord.ui.MessageComponents()
         self.state = CasinoState.MENU
-        self.last_interaction: datetime | None = datetime.now(UTC).replace(tzinfo=None)
         self.cache[ctx] = self
+        self.sessions_by_id[self.id] = self
+        self.refresh_timeout()
+
+    def refresh_timeout(self) -> None:
+        """(Re)starts the countdown until the idle session gets closed"""
+        self.timeouts.schedule(self.id, self.TIMEOUT, self._expire)
+
+    def pause_timeout(self) -> None:
+        """Used while playing, since the games handle their own timeouts"""
+        self.timeouts.cancel(self.id)
+
+    def _expire(self) -> None:
+        self.ctx.bot.dispatch("casino_leave", self, None, asyncio.TimeoutError())
 
     @property
     def stakes(self) -> int:
@@ -137,9 +150,10 @@ class CasinoSession(utils.Object):
             return None
         if len(casino_session_id) != 32:
             return None
-        for casino_session in cls.cache.values():
-            if casino_session.id == casino_session_id:
-                return casino_session, interaction_id
+        casino_session = cls.sessions_by_id.get(casino_session_id)
+        if casino_session is None:
+            return None
+        return casino_session, interaction_id
 
     def generate_embed(self, *, entrance: bool = False) -> utils.Embed:
         embed = utils.Embed()
@@ -279,6 +293,8 @@ class CasinoSession(utils.Object):
         response: discord.InteractionResponse | None = None,
     ) -> None:
         self.cache.pop(self.ctx)
+        self.sessions_by_id.pop(self.id, None)
+        self.pause_timeout()
         embed = utils.Embed()
         embed.set_author(
             name=f"{utils.clean(self.ctx.author.display_name).title()}'s Casino"
@@ -316,15 +332,9 @@ class CasinoSession(utils.Object):
         self, *actions: str, timeout: float | None = TIMEOUT
     ) -> tuple[discord.ComponentInteraction, str]:
         """Returns `(interaction: discord.ComponentInteraction, action: str)`"""
-
-        def check(interaction: discord.ComponentInteraction) -> bool:
-            interaction_data = self.from_interaction(interaction)
-            return interaction_data is not None and interaction_data[0] is self
-
-        interaction = await self.ctx.bot.wait_for(
-            "component_interaction", check=check, timeout=timeout
+        interaction, action = await utils.wait_for_component_interaction(
+            self.ctx.bot, self.id, timeout=timeout
         )
-        action = interaction.custom_id.split("_", 1)[1]
 
         if action not in actions:
             raise InvalidAction(action)
@@ -336,8 +346,7 @@ class CasinoSession(utils.Object):
     ) -> tuple[discord.ComponentInteraction | None, Exception | None]:
         """Returns (interaction: discord.ComponentInteraction | None, error: Exception | None)"""
         self.state = CasinoState.PLAYING_DICE
-
-        self.last_interaction = None
+        self.pause_timeout()
 
         while True:
             self.game_embed = utils.Embed()
@@ -418,7 +427,7 @@ class CasinoSession(utils.Object):
     ) -> tuple[discord.ComponentInteraction | None, Exception | None]:
         """Returns (interaction: discord.ComponentInteraction | None, error: Exception | None)"""
         self.state = CasinoState.PLAYING_BLACKJACK
-        self.last_interaction = None
+        self.pause_timeout()
 
         while True:
             last_move: Literal["HIT", "STAND"] | None = None
@@ -642,13 +651,9 @@ class CasinoSession(utils.Object):
 
 
 class CasinoCommandCog(vbu.Cog[utils.Bot]):
-    def __init__(self, bot: utils.Bot, logger_name: str | None = None) -> None:
-        super().__init__(bot, logger_name)
-        self.garbage_collector.start()
-
     def cog_unload(self) -> None:
         super().cog_unload()
-        self.garbage_collector.cancel()
+        CasinoSession.timeouts.cancel_all()
 
         # Force-close every open casino session
         # ? Use this instead of a direct for-loop to avoid runtime errors
@@ -668,6 +673,7 @@ class CasinoCommandCog(vbu.Cog[utils.Bot]):
     @commands.command(
         "casino",
         utils.Command,
+        serialised=True,
         category=utils.CommandCategory.GAMBLING,
         application_command_meta=commands.ApplicationCommandMeta(),
     )
@@ -744,9 +750,7 @@ class CasinoCommandCog(vbu.Cog[utils.Bot]):
         try:
             if casino_session.state in [CasinoState.MENU, CasinoState.CHANGING_STAKES]:
                 if interaction_id == "STAKES":
-                    casino_session.last_interaction = datetime.now(UTC).replace(
-                        tzinfo=None
-                    )
+                    casino_session.refresh_timeout()
                     casino_session.state = CasinoState.CHANGING_STAKES
                     await interaction.response.send_modal(
                         discord.ui.Modal(
@@ -821,9 +825,7 @@ class CasinoCommandCog(vbu.Cog[utils.Bot]):
                             Exception("The code fucked up"),
                         )
                         return
-                    casino_session.last_interaction = datetime.now(UTC).replace(
-                        tzinfo=None
-                    )
+                    casino_session.refresh_timeout()
                     casino_session.state = CasinoState.MENU
                     await casino_session.send(response=result_interaction.response)
                     return
@@ -850,7 +852,7 @@ class CasinoCommandCog(vbu.Cog[utils.Bot]):
         if casino_session.ctx.author.id != interaction.user.id:
             return
 
-        casino_session.last_interaction = datetime.now(UTC).replace(tzinfo=None)
+        casino_session.refresh_timeout()
 
         if (
             casino_session.state == CasinoState.CHANGING_STAKES
@@ -868,30 +870,6 @@ class CasinoCommandCog(vbu.Cog[utils.Bot]):
             NotImplementedError(3, interaction_id),
         )
 
-    @tasks.loop(seconds=1)
-    async def garbage_collector(self) -> None:
-        # ? Use this instead of a direct for-loop to avoid runtime errors
-        cache_keys = tuple(CasinoSession.cache.keys())
-
-        for cache_key in cache_keys:
-            # ? Cache could've been modified while looping
-            try:
-                casino_session = CasinoSession.cache[cache_key]
-            except KeyError:
-                continue
-
-            if casino_session.last_interaction is None:
-                continue
-
-            if datetime.now(UTC).replace(
-                tzinfo=None
-            ) - casino_session.last_interaction < timedelta(seconds=30):
-                continue
-
-            self.bot.dispatch(
-                "casino_leave", casino_session, None, asyncio.TimeoutError()
-            )
-
 
 async def setup(bot: utils.Bot):
     await bot.add_cog(CasinoCommandCog(bot))
@@ -103,7 +103,9 @@ class CommandEventHandlerCog(vbu.Cog):
 
         async with utils.DatabaseWrapper() as db:
             try:
-                pp = await utils.Pp.fetch_from_user(db.conn, user_id=ctx.author.id)
+                pp = await utils.Pp.fetch_from_user(
+                    db.conn, user_id=ctx.author.id, cached=True
+                )
             except (utils.PpMissing, utils.DatabaseTimeout):
                 return
 
@@ -117,32 +117,21 @@ class CompareCommandCog(vbu.Cog[utils.Bot]):
             raise commands.BadArgument("You can't compare against yourself silly!")
 
         async with utils.DatabaseWrapper() as db:
-            pp = await utils.Pp.fetch_from_user(db.conn, ctx.author.id)
-
-            try:
-                opponent_pp = await utils.Pp.fetch_from_user(db.conn, opponent.id)
-            except utils.PpMissing:
-                raise utils.PpMissing(
-                    f"{opponent.mention} ain't got a pp :(", user=opponent
-                )
-
-            inventory = await utils.InventoryItem.fetch(
-                db.conn,
-                {"user_id": ctx.author.id},
-                fetch_multiple_rows=True,
+            summaries = await utils.ProfileSummary.fetch_from_users(
+                db.conn, [ctx.author.id, opponent.id], cached=True
             )
-            item_count = 0
-            for item in inventory:
-                item_count += item.amount.value
-
-            opponent_inventory = await utils.InventoryItem.fetch(
-                db.conn,
-                {"user_id": opponent.id},
-                fetch_multiple_rows=True,
+
+        if ctx.author.id not in summaries:
+            raise utils.Pp.missing_error()
+        if opponent.id not in summaries:
+            raise utils.PpMissing(
+                f"{opponent.mention} ain't got a pp :(", user=opponent
             )
-            opponent_item_count = 0
-            for item in opponent_inventory:
-                opponent_item_count += item.amount.value
+
+        pp = summaries[ctx.author.id].pp
+        item_count = summaries[ctx.author.id].item_count
+        opponent_pp = summaries[opponent.id].pp
+        opponent_item_count = summaries[opponent.id].item_count
 
         display_name = utils.clean(ctx.author.display_name)
         opponent_display_name = utils.clean(opponent.display_name)
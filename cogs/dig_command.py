@@ -200,6 +200,7 @@ class DigCommandCog(vbu.Cog[utils.Bot]):
     @commands.command(
         "dig",
         utils.Command,
+        serialised=True,
         category=utils.CommandCategory.GROWING_PP,
         application_command_meta=commands.ApplicationCommandMeta(),
     )
@@ -223,8 +224,8 @@ class DigCommandCog(vbu.Cog[utils.Bot]):
             pp = await utils.Pp.fetch_from_user(db.conn, ctx.author.id, edit=True)
             tool = utils.ItemManager.get_command_tool("dig")
 
-            if not await utils.InventoryItem.user_has_item(
-                db.conn, ctx.author.id, tool.id
+            if not await utils.InventoryItem.user_has_tool(
+                db.conn, ctx.author.id, tool
             ):
                 raise utils.MissingTool(tool=tool)
 
@@ -3,13 +3,26 @@ import random
 import uuid
 
 import discord
-from discord.ext import commands, vbu
+from discord.ext import commands, vbu, tasks
 
 from . import utils
 
 
 class DonateCommandCog(vbu.Cog[utils.Bot]):
-    DONATION_LIMIT = 100_000_000
+    DONATION_LIMIT = utils.DonationEngine.DONATION_LIMIT
+
+    def __init__(self, bot: utils.Bot, logger_name: str | None = None):
+        super().__init__(bot, logger_name)
+        self.prune_donation_buckets.start()
+
+    async def cog_unload(self) -> None:
+        self.prune_donation_buckets.cancel()
+
+    @tasks.loop(hours=1)
+    async def prune_donation_buckets(self) -> None:
+        async with utils.DatabaseWrapper() as db:
+            pruned = await utils.Donation.prune_buckets(db.conn)
+        self.logger.debug(f"Pruned {pruned} donation buckets")
 
     @commands.command(
         "donate",
@@ -55,14 +68,9 @@ class DonateCommandCog(vbu.Cog[utils.Bot]):
                 )
 
             try:
-                recipiant_pp = await utils.Pp.fetch_from_user(db.conn, recipiant.id)
+                await utils.Pp.fetch_from_user(db.conn, recipiant.id)
             except utils.PpMissing:
-                raise utils.PpMissing(
-                    f"{recipiant.mention} doesn't have a pp 🫵😂😂"
-                    f" tell em to go make one with {utils.format_slash_command('new')}"
-                    " and get started on the pp grind",
-                    user=recipiant,
-                )
+                raise self._recipiant_missing(recipiant)
 
             if amount <= 0:
                 raise commands.BadArgument(
@@ -70,79 +78,90 @@ class DonateCommandCog(vbu.Cog[utils.Bot]):
                     f" you gotta donate atleast {utils.format_inches(1)} lil bro"
                 )
 
-            if amount > pp.size.value:
+            # Inches promised in other donation prompts aren't available
+            available_size = pp.size.value - utils.DonationEngine.reserved_by_donor.get(
+                ctx.author.id, 0
+            )
+
+            if amount > available_size:
                 raise utils.PpNotBigEnough(
                     f"{ctx.author.mention} your pp isn't big enough to donate that much 🫵😂😂"
-                    f" you only have {utils.format_inches(pp.size.value)} lil bro"
+                    f" you only have {utils.format_inches(available_size)} lil bro"
                 )
 
             relevant_received_donation_sum = (
                 await utils.Donation.fetch_relevant_received_donation_sum(
                     db.conn, recipiant.id
                 )
+                + utils.DonationEngine.reserved_for_recipiant.get(recipiant.id, 0)
             )
 
-            if relevant_received_donation_sum >= self.DONATION_LIMIT:
-                raise commands.CheckFailure(
-                    f"{recipiant.mention} has already hit the daily donation limit"
-                    f" of {utils.format_inches(self.DONATION_LIMIT)}"
-                )
+        # Nothing is locked while the donor makes up their mind, the amount is reserved instead
 
-            interaction_id = uuid.uuid4().hex
+        if relevant_received_donation_sum >= self.DONATION_LIMIT:
+            raise commands.CheckFailure(
+                f"{recipiant.mention} has already hit the daily donation limit"
+                f" of {utils.format_inches(self.DONATION_LIMIT)}"
+            )
 
-            if amount + relevant_received_donation_sum > self.DONATION_LIMIT:
-                embed = utils.Embed(color=utils.RED)
-                embed.description = (
-                    f"{ctx.author.mention} you can't donate that much to {recipiant.mention} bro the limit"
-                    f" is {utils.format_inches(self.DONATION_LIMIT)}"
-                )
+        interaction_id = uuid.uuid4().hex
 
-                if relevant_received_donation_sum:
-                    embed.description += (
-                        " and they already received"
-                        f" {utils.format_inches(relevant_received_donation_sum)}"
-                        " in the last 24 hours"
-                    )
+        if amount + relevant_received_donation_sum > self.DONATION_LIMIT:
+            embed = utils.Embed(color=utils.RED)
+            embed.description = (
+                f"{ctx.author.mention} you can't donate that much to {recipiant.mention} bro the limit"
+                f" is {utils.format_inches(self.DONATION_LIMIT)}"
+            )
 
-                components = discord.ui.MessageComponents(
-                    discord.ui.ActionRow(
-                        discord.ui.Button(
-                            label=f"Change amount to {utils.format_inches(self.DONATION_LIMIT - relevant_received_donation_sum, markdown=None)}",
-                            custom_id=f"{interaction_id}_DONATE",
-                            style=discord.ButtonStyle.green,
-                        ),
-                        discord.ui.Button(
-                            label=f"Cancel donation",
-                            custom_id=f"{interaction_id}_CANCEL_DONATION",
-                            style=discord.ButtonStyle.red,
-                        ),
-                    )
+            if relevant_received_donation_sum:
+                embed.description += (
+                    " and they already received"
+                    f" {utils.format_inches(relevant_received_donation_sum)}"
+                    " in the last 24 hours"
                 )
 
-                amount = self.DONATION_LIMIT - relevant_received_donation_sum
-
-            else:
-                embed = utils.Embed()
-                embed.description = (
-                    f"{ctx.author.mention} are u sure you want to donate"
-                    f" {utils.format_inches(amount)} to {recipiant.mention}?"
+            components = discord.ui.MessageComponents(
+                discord.ui.ActionRow(
+                    discord.ui.Button(
+                        label=f"Change amount to {utils.format_inches(self.DONATION_LIMIT - relevant_received_donation_sum, markdown=None)}",
+                        custom_id=f"{interaction_id}_DONATE",
+                        style=discord.ButtonStyle.green,
+                    ),
+                    discord.ui.Button(
+                        label=f"Cancel donation",
+                        custom_id=f"{interaction_id}_CANCEL_DONATION",
+                        style=discord.ButtonStyle.red,
+                    ),
                 )
+            )
 
-                components = discord.ui.MessageComponents(
-                    discord.ui.ActionRow(
-                        discord.ui.Button(
-                            label=f"yes!!",
-                            custom_id=f"{interaction_id}_DONATE",
-                            style=discord.ButtonStyle.green,
-                        ),
-                        discord.ui.Button(
-                            label=f"no",
-                            custom_id=f"{interaction_id}_CANCEL_DONATION",
-                            style=discord.ButtonStyle.red,
-                        ),
-                    )
+            amount = self.DONATION_LIMIT - relevant_received_donation_sum
+
+        else:
+            embed = utils.Embed()
+            embed.description = (
+                f"{ctx.author.mention} are u sure you want to donate"
+                f" {utils.format_inches(amount)} to {recipiant.mention}?"
+            )
+
+            components = discord.ui.MessageComponents(
+                discord.ui.ActionRow(
+                    discord.ui.Button(
+                        label=f"yes!!",
+                        custom_id=f"{interaction_id}_DONATE",
+                        style=discord.ButtonStyle.green,
+                    ),
+                    discord.ui.Button(
+                        label=f"no",
+                        custom_id=f"{interaction_id}_CANCEL_DONATION",
+                        style=discord.ButtonStyle.red,
+                    ),
                 )
+            )
+
+        reservation = utils.DonationEngine.reserve(ctx.author.id, recipiant.id, amount)
 
+        try:
             await ctx.interaction.response.send_message(
                 embed=embed, components=components
             )
@@ -178,47 +197,80 @@ class DonateCommandCog(vbu.Cog[utils.Bot]):
 
                 return
 
-            # Fetch the recipiant pp again with edit=true
-            # Do this only now so that the recipiant isn't locked from using
-            # other commands while acceping a donation
             async with (
-                utils.DatabaseWrapper() as recipiant_db,
-                recipiant_db.conn.transaction(),
+                utils.DatabaseWrapper() as db,
+                utils.DatabaseTimeoutManager.notify(
+                    ctx.author.id, "You're still busy donating!"
+                ),
                 utils.DatabaseTimeoutManager.notify(
                     recipiant.id,
                     "You're receiving a donation right now and it's still being processed! Please try again!!",
                 ),
             ):
                 try:
-                    recipiant_pp = await utils.Pp.fetch_from_user(
-                        recipiant_db.conn, recipiant.id, edit=True
-                    )
-                except utils.DatabaseTimeout:
-                    await ctx.interaction.edit_original_message(
-                        components=components.disable_components()
-                    )
-                    raise commands.CheckFailure(
-                        f"{recipiant.mention} seems to be busy right now! Try donating another time :)"
-                    )
+                    receipt = await utils.DonationEngine.commit(db.conn, reservation)
+                except utils.DonationFailed as error:
+                    try:
+                        await ctx.interaction.edit_original_message(
+                            components=components.disable_components()
+                        )
+                    except discord.HTTPException:
+                        pass
+                    raise self._donation_failed(ctx, recipiant, error.failure)
 
-                await utils.Donation.register(
-                    db.conn, recipiant.id, ctx.author.id, amount
-                )
+        finally:
+            utils.DonationEngine.release(reservation)
 
-                pp.size.value -= amount
-                recipiant_pp.size.value += amount
-                await pp.update(db.conn)
-                await recipiant_pp.update(recipiant_db.conn)
+        embed = utils.Embed(color=utils.GREEN)
+        embed.title = "Donation successful!"
+        embed.description = (
+            f"u successfully donated {utils.format_inches(amount)} to {recipiant}"
+            f"\n\n {ctx.author.mention} now has {utils.format_inches(receipt.donor_size)}"
+            f"\n {recipiant.mention} now has {utils.format_inches(receipt.recipiant_size)}"
+        )
 
-            embed = utils.Embed(color=utils.GREEN)
-            embed.title = "Donation successful!"
-            embed.description = (
-                f"u successfully donated {utils.format_inches(amount)} to {recipiant}"
-                f"\n\n {ctx.author.mention} now has {utils.format_inches(pp.size.value)}"
-                f"\n {recipiant.mention} now has {utils.format_inches(recipiant_pp.size.value)}"
-            )
+        await interaction.response.edit_message(embed=embed, components=None)
 
-            await interaction.response.edit_message(embed=embed, components=None)
+    @staticmethod
+    def _recipiant_missing(
+        recipiant: discord.Member | discord.User,
+    ) -> utils.PpMissing:
+        return utils.PpMissing(
+            f"{recipiant.mention} doesn't have a pp 🫵😂😂"
+            f" tell em to go make one with {utils.format_slash_command('new')}"
+            " and get started on the pp grind",
+            user=recipiant,
+        )
+
+    def _donation_failed(
+        self,
+        ctx: commands.SlashContext[utils.Bot],
+        recipiant: discord.Member | discord.User,
+        failure: utils.DonationFailure,
+    ) -> commands.CheckFailure:
+        match failure:
+            case utils.DonationFailure.DONOR_BUSY:
+                return utils.DatabaseTimeoutManager.get_error(ctx.author.id)
+            case utils.DonationFailure.RECIPIANT_BUSY:
+                return commands.CheckFailure(
+                    f"{recipiant.mention} seems to be busy right now! Try donating another time :)"
+                )
+            case utils.DonationFailure.DONOR_MISSING:
+                return utils.PpMissing(
+                    f"You don't have a pp! Go make one with {utils.format_slash_command('new')}"
+                    " and get started :)"
+                )
+            case utils.DonationFailure.RECIPIANT_MISSING:
+                return self._recipiant_missing(recipiant)
+            case utils.DonationFailure.NOT_BIG_ENOUGH:
+                return utils.PpNotBigEnough(
+                    f"{ctx.author.mention} your pp isn't big enough to donate that much anymore 🫵😂😂"
+                )
+            case utils.DonationFailure.LIMIT_REACHED:
+                return commands.CheckFailure(
+                    f"{recipiant.mention} has already hit the daily donation limit"
+                    f" of {utils.format_inches(self.DONATION_LIMIT)}"
+                )
 
 
 async def setup(bot: utils.Bot):
@@ -9,6 +9,7 @@ class GrowCommandCog(vbu.Cog[utils.Bot]):
     @commands.command(
         "grow",
         utils.Command,
+        serialised=True,
         category=utils.CommandCategory.GROWING_PP,
         application_command_meta=commands.ApplicationCommandMeta(),
     )
@@ -21,28 +22,26 @@ class GrowCommandCog(vbu.Cog[utils.Bot]):
         """
         Grow your pp to get more inches!
         """
+        growth = random.randint(1, 15)
+        voted = await vbu.user_has_voted(ctx.author.id)
+
         async with (
             utils.DatabaseWrapper() as db,
-            db.conn.transaction(),
             utils.DatabaseTimeoutManager.notify(
                 ctx.author.id, "You're still busy with the grow command!"
             ),
         ):
-            pp = await utils.Pp.fetch_from_user(db.conn, ctx.author.id, edit=True)
-
-            pp.grow_with_multipliers(
-                random.randint(1, 15), voted=await pp.has_voted(), channel=ctx.channel
+            pp = await utils.Pp.grow_from_user(
+                db.conn, ctx.author.id, growth, voted=voted, channel=ctx.channel
             )
-            await pp.update(db.conn)
+            assert pp is not None
 
-            embed = utils.Embed()
-            embed.colour = utils.GREEN
-            embed.description = (
-                f"{ctx.author.mention}, ur pp grew {pp.format_growth()}!"
-            )
-            embed.add_tip()
+        embed = utils.Embed()
+        embed.colour = utils.GREEN
+        embed.description = f"{ctx.author.mention}, ur pp grew {pp.format_growth()}!"
+        embed.add_tip()
 
-            await ctx.interaction.response.send_message(embed=embed)
+        await ctx.interaction.response.send_message(embed=embed)
 
 
 async def setup(bot: utils.Bot):
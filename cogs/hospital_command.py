@@ -12,6 +12,7 @@ class HospitalCommandCog(vbu.Cog[utils.Bot]):
     @commands.command(
         "hospital",
         utils.Command,
+        serialised=True,
         aliases=["h"],
         category=utils.CommandCategory.GROWING_PP,
         application_command_meta=commands.ApplicationCommandMeta(),
@@ -25,21 +26,30 @@ class HospitalCommandCog(vbu.Cog[utils.Bot]):
         """
         Take a risky surgery that can increase your pp size
         """
+        voted = await vbu.user_has_voted(ctx.author.id)
+        growth = random.choice(self.REWARD_RANGE)
+        successful = random.random() < self.SUCCESS_RATE
+
         async with (
             utils.DatabaseWrapper() as db,
-            db.conn.transaction(),
             utils.DatabaseTimeoutManager.notify(
                 ctx.author.id, "You're still busy with the hospital command!"
             ),
         ):
-            pp = await utils.Pp.fetch_from_user(db.conn, ctx.author.id, edit=True)
-
-            voted = await pp.has_voted()
-            multiplier = pp.get_full_multiplier(voted=voted, channel=ctx.channel)[0]
+            pp = await utils.Pp.grow_from_user(
+                db.conn,
+                ctx.author.id,
+                growth if successful else -growth,
+                voted=voted,
+                channel=ctx.channel,
+                required_size=self.MIN_SIZE,
+            )
 
-            min_size = self.MIN_SIZE * multiplier
+            if pp is None:
+                pp = await utils.Pp.fetch_from_user(db.conn, ctx.author.id)
+                multiplier = pp.get_full_multiplier(voted=voted, channel=ctx.channel)[0]
+                min_size = self.MIN_SIZE * multiplier
 
-            if pp.size.value < min_size:
                 assert isinstance(ctx.command, utils.Command)
                 await ctx.command.async_reset_cooldown(ctx)
                 raise utils.PpNotBigEnough(
@@ -47,45 +57,39 @@ class HospitalCommandCog(vbu.Cog[utils.Bot]):
                     " inches** to visit the hospital crodie"
                 )
 
-            embed = utils.Embed()
-            embed.title = "HOSPITAL"
-            embed.description = (
-                f"{ctx.author.mention} goes to the hospital for some pp surgery..."
+        embed = utils.Embed()
+        embed.title = "HOSPITAL"
+        embed.description = (
+            f"{ctx.author.mention} goes to the hospital for some pp surgery..."
+        )
+
+        # success!
+        if successful:
+            embed.color = utils.GREEN
+            embed.add_field(
+                name="SUCCESSFUL",
+                value=(
+                    "The operation was successful!"
+                    f" Your pp gained {pp.format_growth()}!"
+                    f" It is now {pp.format_growth(pp.size.value)}."
+                ),
             )
 
-            growth = random.choice(self.REWARD_RANGE) * multiplier
-
-            # success!
-            if random.random() < self.SUCCESS_RATE:
-                pp.grow(growth)
-                embed.color = utils.GREEN
-                embed.add_field(
-                    name="SUCCESSFUL",
-                    value=(
-                        "The operation was successful!"
-                        f" Your pp gained {pp.format_growth()}!"
-                        f" It is now {pp.format_growth(pp.size.value)}."
-                    ),
-                )
-
-            # L moves
-            else:
-                pp.grow(-growth)
-                embed.color = utils.RED
-                embed.add_field(
-                    name="FAILED",
-                    value=(
-                        "The operation failed."
-                        f" Your pp snapped and you {pp.format_growth(prefixed=True)} 😭"
-                        f" It is now {pp.format_growth(pp.size.value)}."
-                    ),
-                )
-
-            await pp.update(db.conn)
+        # L moves
+        else:
+            embed.color = utils.RED
+            embed.add_field(
+                name="FAILED",
+                value=(
+                    "The operation failed."
+                    f" Your pp snapped and you {pp.format_growth(prefixed=True)} 😭"
+                    f" It is now {pp.format_growth(pp.size.value)}."
+                ),
+            )
 
-            embed.add_tip()
+        embed.add_tip()
 
-            await ctx.interaction.response.send_message(embed=embed)
+        await ctx.interaction.response.send_message(embed=embed)
 
 
 async def setup(bot: utils.Bot):
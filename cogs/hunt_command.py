@@ -140,6 +140,7 @@ class HuntCommandCog(vbu.Cog[utils.Bot]):
     @commands.command(
         "hunt",
         utils.Command,
+        serialised=True,
         category=utils.CommandCategory.GROWING_PP,
         application_command_meta=commands.ApplicationCommandMeta(),
     )
@@ -153,39 +154,49 @@ class HuntCommandCog(vbu.Cog[utils.Bot]):
         Hunt for some inches, nothing wrong with that
         """
 
+        tool = utils.ItemManager.get_command_tool("hunt")
+
+        if utils.MinigameDialogueManager.variant == "christmas":
+            activity = ChristmasActivity.random()
+            dialogue = self.CHRISTMAS_DIALOGUE
+        else:
+            activity = Activity.random()
+            dialogue = self.DEFAULT_DIALOGUE
+
+        activity = Activity.random()
+
+        voted = False
+        if activity in [Activity.SUCCESS, ChristmasActivity.SUCCESS]:
+            # An HTTP request, so it's made before a pooled connection is taken
+            voted = await vbu.user_has_voted(ctx.author.id)
+
         async with (
             utils.DatabaseWrapper() as db,
-            db.conn.transaction(),
             utils.DatabaseTimeoutManager.notify(
                 ctx.author.id, "You're still busy hunting!"
             ),
         ):
-            pp = await utils.Pp.fetch_from_user(db.conn, ctx.author.id, edit=True)
-            tool = utils.ItemManager.get_command_tool("hunt")
-
-            if not await utils.InventoryItem.user_has_item(
-                db.conn, ctx.author.id, tool.id
+            if not await utils.InventoryItem.user_has_tool(
+                db.conn, ctx.author.id, tool
             ):
+                # No pp means no rifle either, tell them about the pp first
+                await utils.Pp.fetch_from_user(db.conn, ctx.author.id)
                 raise utils.MissingTool(tool=tool)
 
-            if utils.MinigameDialogueManager.variant == "christmas":
-                activity = ChristmasActivity.random()
-                dialogue = self.CHRISTMAS_DIALOGUE
-            else:
-                activity = Activity.random()
-                dialogue = self.DEFAULT_DIALOGUE
-
-            activity = Activity.random()
-
             if activity.name.endswith("_MINIGAME"):
                 activity = cast(MinigameActivity | ChristmasMinigameActivity, activity)
-                await self.start_minigame(
-                    activity,
-                    bot=self.bot,
-                    connection=db.conn,
-                    pp=pp,
-                    interaction=ctx.interaction,
-                )
+
+                async with db.conn.transaction():
+                    pp = await utils.Pp.fetch_from_user(
+                        db.conn, ctx.author.id, edit=True
+                    )
+                    await self.start_minigame(
+                        activity,
+                        bot=self.bot,
+                        connection=db.conn,
+                        pp=pp,
+                        interaction=ctx.interaction,
+                    )
                 return
 
             embed = utils.Embed()
@@ -194,13 +205,14 @@ class HuntCommandCog(vbu.Cog[utils.Bot]):
                 embed.set_author(name="🎄🤑 holiday hunting")
 
             if activity in [Activity.RIFLE_BREAK, ChristmasActivity.RIFLE_BREAK]:
-                inv_tool = await utils.InventoryItem.fetch(
-                    db.conn,
-                    {"user_id": ctx.author.id, "id": tool.id},
-                    lock=utils.RowLevelLockMode.FOR_UPDATE,
-                )
-                inv_tool.amount.value -= 1
-                await inv_tool.update(db.conn)
+                async with db.conn.transaction():
+                    inv_tool = await utils.InventoryItem.fetch(
+                        db.conn,
+                        {"user_id": ctx.author.id, "id": tool.id},
+                        lock=utils.RowLevelLockMode.FOR_UPDATE,
+                    )
+                    inv_tool.amount.value -= 1
+                    await inv_tool.update(db.conn)
 
                 embed.colour = utils.RED
                 embed.description = random.choice(dialogue.item_break_responses).format(
@@ -217,9 +229,14 @@ class HuntCommandCog(vbu.Cog[utils.Bot]):
 
             elif activity in [Activity.SUCCESS, ChristmasActivity.SUCCESS]:
                 option, growth = self.get_hunting_option()
-                pp.grow_with_multipliers(
-                    growth, voted=await pp.has_voted(), channel=ctx.channel
+                pp = await utils.Pp.grow_from_user(
+                    db.conn,
+                    ctx.author.id,
+                    growth,
+                    voted=voted,
+                    channel=ctx.channel,
                 )
+                assert pp is not None
 
                 embed.colour = utils.GREEN
                 embed.description = (
@@ -232,10 +249,9 @@ class HuntCommandCog(vbu.Cog[utils.Bot]):
                     " available"
                 )
 
-            await pp.update(db.conn)
-            embed.add_tip()
+        embed.add_tip()
 
-            await ctx.interaction.response.send_message(embed=embed)
+        await ctx.interaction.response.send_message(embed=embed)
 
 
 async def setup(bot: utils.Bot):
@@ -0,0 +1,17 @@
+import discord
+from discord.ext import vbu
+
+from . import utils
+
+
+class InteractionEventHandlerCog(vbu.Cog[utils.Bot]):
+
+    @vbu.Cog.listener("on_component_interaction")
+    async def route_component_interaction(
+        self, interaction: discord.ComponentInteraction
+    ) -> None:
+        utils.ComponentInteractionRouter.route(interaction)
+
+
+async def setup(bot: utils.Bot):
+    await bot.add_cog(InteractionEventHandlerCog(bot))
@@ -2,69 +2,204 @@ import asyncio
 import logging
 import uuid
 from datetime import timedelta
-from typing import Generic, TypeVar, Literal, cast, Self
+from typing import Literal, cast, Self
 
 import discord
 from discord.ext import commands, vbu, tasks
 
 from . import utils
 
-_T_co = TypeVar("_T_co", covariant=True)
-_V_co = TypeVar("_V_co", covariant=True)
-
 
 LeaderboardScope = Literal["GLOBAL", "GUILD"]
 
 
-class LeaderboardCache(utils.Object, Generic[_T_co, _V_co]):
+class LeaderboardCache(utils.Object):
     """
-    Logic in case I forget:
-    You take the user's ID, put it into positions_per_user_id to
-    get their position, use that minus 1 as the index for leaderboard_items
-    and get the stats
+    Holds the latest `utils.LeaderboardSnapshot` of a leaderboard. Subclasses give the
+    queries, which rank every `user_id` along with their `value`, and the formatting.
+    `GUILD_QUERY` gets the guild's ID as `$1`. Global leaderboards with a `RANK_VIEW`
+    are read from that materialized view instead while `utils.RankView.ENABLED`
     """
 
-    __slots__ = ("positions_per_user_id", "leaderboard_items")
-    positions_per_user_id: dict[int, int]
-    leaderboard_items: list[tuple[utils.Pp, _T_co]]
-    values_by_position: list[_V_co]
+    __slots__ = (
+        "logger",
+        "guild_id",
+        "snapshot",
+        "rank_view",
+        "_rendered_version",
+        "_rendered_pages",
+    )
+    PAGE_SIZE = 10
+    MAX_RENDERED_PAGES = 100
+    # Positions shown above and below the user in the "around me" view
+    AROUND_RADIUS = 5
     title: str
+    guild_title: str
     label: str
+    QUERY: str
+    GUILD_QUERY: str
+    RANK_VIEW: str | None = None
 
     def __init__(
         self,
         *,
         logger: logging.Logger,
+        guild_id: int | None = None,
     ) -> None:
         self.logger = logger
-        self.positions_per_user_id = {}
-        self.leaderboard_items = []
-        self.values_by_position = []
+        self.guild_id = guild_id
+        self.snapshot = utils.LeaderboardSnapshot.empty()
+        self.rank_view = (
+            utils.RankView(self.RANK_VIEW)
+            if self.RANK_VIEW is not None and guild_id is None
+            else None
+        )
+        # Pages rendered from the ranks with this version, by `(start, size)`
+        self._rendered_version = self.snapshot.version
+        self._rendered_pages: dict[tuple[int, int], list[tuple[int, str, str]]] = {}
 
     @classmethod
     def for_guild(cls: type[Self], guild: discord.Guild) -> Self:
-        raise NotImplementedError
+        leaderboard_cache = cls(
+            logger=logging.getLogger(
+                f"vbu.bot.cog.LeaderboardCommandCog.{cls.__name__}-GUILD-{guild.id}"
+            ),
+            guild_id=guild.id,
+        )
+        leaderboard_cache.title = cls.guild_title
+        return leaderboard_cache
+
+    @property
+    def ranks(self) -> utils.LeaderboardSnapshot | utils.RankView:
+        if self.rank_view is not None and utils.RankView.ENABLED:
+            return self.rank_view
+
+        return self.snapshot
 
     async def update(self) -> None:
-        raise NotImplementedError
+        self.logger.debug(f"Updating {self.label.lower()} leaderboard cache...")
+
+        if self.rank_view is not None and utils.RankView.ENABLED:
+            async with utils.DatabaseWrapper() as db:
+                refreshed = await self.rank_view.refresh(db.conn)
+
+            # The snapshot isn't read anymore, so don't hold on to it
+            self.snapshot = utils.LeaderboardSnapshot.empty()
+
+            self.logger.debug(
+                f"{self.label} leaderboard view"
+                f" {'refreshed' if refreshed else 'refreshed elsewhere'}"
+                f" ({self.rank_view.size} rows)"
+            )
+            return
+
+        async with utils.DatabaseWrapper() as db:
+            if self.guild_id is None:
+                snapshot = await utils.LeaderboardSnapshot.stream(db.conn, self.QUERY)
+            else:
+                snapshot = await utils.LeaderboardSnapshot.stream(
+                    db.conn, self.GUILD_QUERY, self.guild_id
+                )
+
+        self.snapshot = snapshot
 
-    def podium_value_formatter(self, position: int) -> str:
+        self.logger.debug(
+            f"{self.label} leaderboard cache updated ({self.snapshot.size} rows)"
+        )
+
+    def podium_value_formatter(self, value: int) -> str:
         raise NotImplementedError
 
-    def comparison_formatter(self, position: int) -> str | None:
+    def comparison_formatter(self, position: int, difference: int) -> str | None:
         raise NotImplementedError
 
-    def generate_embed(self, ctx: commands.SlashContext[utils.Bot]) -> utils.Embed:
+    async def fetch_standing(self, user_id: int) -> tuple[int, int] | None:
+        """Returns `(position: int, overtake_difference: int)`, `None` if unranked"""
+        ranks = self.ranks
+
+        if isinstance(ranks, utils.RankView):
+            async with utils.DatabaseWrapper() as db:
+                return await ranks.fetch_standing(db.conn, user_id)
+
+        position = ranks.get_position(user_id)
+
+        if position is None:
+            return None
+
+        return position, ranks.get_overtake_difference(position)
+
+    async def render_page(self, start: int, size: int) -> list[tuple[int, str, str]]:
+        """
+        Returns `[(position: int, prefix: str, text: str), ...]`. Pages are rendered once
+        per version of the ranks and shared by every caller, see `generate_embed`
+        """
+        ranks = self.ranks
+
+        if self._rendered_version != ranks.version:
+            self._rendered_version = ranks.version
+            self._rendered_pages = {}
+
+        try:
+            return self._rendered_pages[(start, size)]
+        except KeyError:
+            pass
+
+        async with utils.DatabaseWrapper() as db:
+            page = await ranks.fetch_page(db.conn, start, size)
+
+        segments: list[tuple[int, str, str]] = []
+
+        for position, value, pp in page:
+            if position <= 3:
+                prefix = ["🥇", "🥈", "🥉"][position - 1]
+            elif position == 10:
+                prefix = "<a:nerd:1244646167799791637>"
+            elif position < 10:
+                prefix = "🔹"
+            else:
+                prefix = f"`#{utils.format_int(position)}`"
+
+            segments.append(
+                (
+                    position,
+                    prefix,
+                    f"{self.podium_value_formatter(value)}"
+                    f" - {pp.name.value} `({pp.user_id})`",
+                )
+            )
+
+        # Don't keep it if the ranks were updated while fetching the page
+        if self._rendered_version == ranks.version:
+            if len(self._rendered_pages) >= self.MAX_RENDERED_PAGES:
+                del self._rendered_pages[next(iter(self._rendered_pages))]
+            self._rendered_pages[(start, size)] = segments
+
+        return segments
+
+    async def generate_embed(
+        self,
+        standing: tuple[int, int] | None,
+        *,
+        start: int = 1,
+        size: int = PAGE_SIZE,
+    ) -> utils.Embed:
+        """
+        Shows `size` positions from `start` onwards, to the user with `standing` (see
+        `fetch_standing`)
+        """
+        segments = await self.render_page(start, size)
+
         embed = utils.Embed()
         embed.set_author(
             name=self.title,
             url=utils.MEME_URL,
         )
 
-        user_position = self.positions_per_user_id.get(ctx.author.id)
+        user_position = None
 
-        if user_position is not None:
-            comparison = self.comparison_formatter(user_position)
+        if standing is not None:
+            user_position, difference = standing
+            comparison = self.comparison_formatter(user_position, difference)
 
             if comparison:
                 embed.set_footer(
@@ -87,394 +222,111 @@ class LeaderboardCache(utils.Object, Generic[_T_co, _V_co]):
         else:
             embed.set_footer(text="use /new to make your own pp :3")
 
-        segments: list[str] = []
-
-        for position, (pp, _) in enumerate(self.leaderboard_items, start=1):
-            if position <= 3:
-                prefix = ["🥇", "🥈", "🥉"][position - 1]
-            elif position == 10:
-                prefix = "<a:nerd:1244646167799791637>"
-            else:
-                prefix = "🔹"
-
-            if position == user_position:
-                prefix += "🫵"
-
-            segments.append(
-                f"{prefix} {self.podium_value_formatter(position)}"
-                f" - {pp.name.value} `({pp.user_id})`"
-            )
-
-        embed.description = "\n".join(segments)
+        embed.description = "\n".join(
+            f"{prefix}{'🫵' if position == user_position else ''} {text}"
+            for position, prefix, text in segments
+        )
 
         return embed
 
 
-class SizeLeaderboardCache(LeaderboardCache[int, int]):
-    """Values by position: list[overtake_difference: int]"""
-
+class SizeLeaderboardCache(LeaderboardCache):
     title = "the biggest pps in the entire universe"
+    guild_title = "the biggest pps in this server"
     label = "Size"
+    RANK_VIEW = "size_ranks"
+    QUERY = """
+        SELECT user_id, pp_size AS value
+        FROM pps
+        ORDER BY pp_size DESC
+        """
+    GUILD_QUERY = """
+        SELECT pps.user_id, pp_size AS value
+        FROM pps
+        INNER JOIN pp_guilds ON
+            pp_guilds.user_id=pps.user_id
+            AND pp_guilds.guild_id=$1
+        ORDER BY pp_size DESC
+        """
 
-    @classmethod
-    def for_guild(cls: type[Self], guild: discord.Guild) -> Self:
-        leaderboard_cache = cls(
-            logger=logging.getLogger(
-                "vbu.bot.cog.LeaderboardCommandCog.SizeLeaderboardCache"
-                f"-GUILD-{guild.id}"
-            ),
-        )
-
-        leaderboard_cache.title = "the biggest pps in this server"
-
-        async def guild_update():
-            leaderboard_cache.logger.debug("Updating size leaderboard cache...")
-
-            new_position_per_user_id: dict[int, int] = {}
-            new_leaderboard_items: list[tuple[utils.Pp, int]] = []
-            new_values_by_position: list[int] = []
-
-            async with utils.DatabaseWrapper() as db:
-                records = await db(
-                    """
-                    SELECT pps.*
-                    FROM pps
-                    INNER JOIN pp_guilds ON
-                        pp_guilds.user_id=pps.user_id
-                        AND pp_guilds.guild_id=$1 
-                    ORDER BY pp_size DESC
-                    """,
-                    guild.id,
-                )
-                next_place: utils.Pp | None = None
-                for n, record in enumerate(records):
-                    pp_data = dict(record)
-                    pp = utils.Pp.from_record(pp_data)
-
-                    if n < 10:
-                        new_leaderboard_items.append((pp, pp.size.value))
-
-                    if next_place is None:
-                        overtake_difference = 0
-                    else:
-                        overtake_difference = next_place.size.value - pp.size.value
-
-                    new_position_per_user_id[record["user_id"]] = n + 1
-                    new_values_by_position.append(overtake_difference)
-                    next_place = pp
-
-            leaderboard_cache.positions_per_user_id = new_position_per_user_id
-            leaderboard_cache.leaderboard_items = new_leaderboard_items
-            leaderboard_cache.values_by_position = new_values_by_position
-
-            leaderboard_cache.logger.debug("Size leaderboard cache updated")
-
-        leaderboard_cache.update = guild_update
-
-        return leaderboard_cache
-
-    async def update(self) -> None:
-        self.logger.debug("Updating size leaderboard cache...")
-
-        new_position_per_user_id: dict[int, int] = {}
-        new_leaderboard_items: list[tuple[utils.Pp, int]] = []
-        new_values_by_position: list[int] = []
+    def podium_value_formatter(self, value: int) -> str:
+        return utils.format_inches(value)
 
-        async with utils.DatabaseWrapper() as db:
-            records = await db("""
-                SELECT *
-                FROM pps
-                ORDER BY pp_size DESC
-                """)
-            next_place: utils.Pp | None = None
-            for n, record in enumerate(records):
-                pp_data = dict(record)
-                pp = utils.Pp.from_record(pp_data)
-
-                if n < 10:
-                    new_leaderboard_items.append((pp, pp.size.value))
-
-                if next_place is None:
-                    overtake_difference = 0
-                else:
-                    overtake_difference = next_place.size.value - pp.size.value
-
-                new_position_per_user_id[record["user_id"]] = n + 1
-                new_values_by_position.append(overtake_difference)
-                next_place = pp
-
-        self.positions_per_user_id = new_position_per_user_id
-        self.leaderboard_items = new_leaderboard_items
-        self.values_by_position = new_values_by_position
-
-        self.logger.debug("Size leaderboard cache updated")
-
-    def podium_value_formatter(self, position: int) -> str:
-        size = self.leaderboard_items[position - 1][1]
-        return utils.format_inches(size)
-
-    def comparison_formatter(self, position: int) -> str | None:
+    def comparison_formatter(self, position: int, difference: int) -> str | None:
         if position == 1:
             return
 
-        difference = self.values_by_position[position - 1]
-
         return (
             f"{utils.format_inches(difference, markdown=None)} behind"
             f" {utils.format_ordinal(position - 1)} place"
         )
 
 
-class MultiplierLeaderboardCache(LeaderboardCache[int, int]):
+class MultiplierLeaderboardCache(LeaderboardCache):
     title = "the craziest multipliers across all of pp bot (boosts not included)"
+    guild_title = "the craziest multipliers in this server (boosts not included)"
     label = "Multiplier"
+    RANK_VIEW = "multiplier_ranks"
+    QUERY = """
+        SELECT user_id, pp_multiplier AS value
+        FROM pps
+        ORDER BY pp_multiplier DESC
+        """
+    GUILD_QUERY = """
+        SELECT pps.user_id, pp_multiplier AS value
+        FROM pps
+        INNER JOIN pp_guilds ON
+            pp_guilds.user_id=pps.user_id
+            AND pp_guilds.guild_id=$1
+        ORDER BY pp_multiplier DESC
+        """
 
-    @classmethod
-    def for_guild(cls: type[Self], guild: discord.Guild) -> Self:
-        leaderboard_cache = cls(
-            logger=logging.getLogger(
-                "vbu.bot.cog.LeaderboardCommandCog.MultiplierLeaderboardCache"
-                f"-GUILD-{guild.id}"
-            ),
-        )
-
-        leaderboard_cache.title = (
-            "the craziest multipliers in this server (boosts not included)"
-        )
-
-        async def guild_update():
-            leaderboard_cache.logger.debug("Updating multiplier leaderboard cache...")
-
-            new_position_per_user_id: dict[int, int] = {}
-            new_leaderboard_items: list[tuple[utils.Pp, int]] = []
-            new_values_by_position: list[int] = []
-
-            async with utils.DatabaseWrapper() as db:
-                records = await db(
-                    """
-                    SELECT pps.*
-                    FROM pps
-                    INNER JOIN pp_guilds ON
-                        pp_guilds.user_id=pps.user_id
-                        AND pp_guilds.guild_id=$1
-                    ORDER BY pp_multiplier DESC
-                    """,
-                    guild.id,
-                )
-                next_place: utils.Pp | None = None
-                for n, record in enumerate(records):
-                    pp_data = dict(record)
-                    pp = utils.Pp.from_record(pp_data)
-
-                    if n < 10:
-                        new_leaderboard_items.append((pp, pp.multiplier.value))
-
-                    if next_place is None:
-                        overtake_difference = 0
-                    else:
-                        overtake_difference = (
-                            next_place.multiplier.value - pp.multiplier.value
-                        )
-
-                    new_position_per_user_id[record["user_id"]] = n + 1
-                    new_values_by_position.append(overtake_difference)
-                    next_place = pp
-
-            leaderboard_cache.positions_per_user_id = new_position_per_user_id
-            leaderboard_cache.leaderboard_items = new_leaderboard_items
-            leaderboard_cache.values_by_position = new_values_by_position
-
-            leaderboard_cache.logger.debug("Multiplier leaderboard cache updated")
-
-        leaderboard_cache.update = guild_update
-
-        return leaderboard_cache
-
-    async def update(self) -> None:
-        self.logger.debug("Updating multiplier leaderboard cache...")
-
-        new_position_per_user_id: dict[int, int] = {}
-        new_leaderboard_items: list[tuple[utils.Pp, int]] = []
-        new_values_by_position: list[int] = []
-
-        async with utils.DatabaseWrapper() as db:
-            records = await db("""
-                SELECT *
-                FROM pps
-                ORDER BY pp_multiplier DESC
-                """)
-            next_place: utils.Pp | None = None
-            for n, record in enumerate(records):
-                pp_data = dict(record)
-                pp = utils.Pp.from_record(pp_data)
-
-                if n < 10:
-                    new_leaderboard_items.append((pp, pp.multiplier.value))
-
-                if next_place is None:
-                    overtake_difference = 0
-                else:
-                    overtake_difference = (
-                        next_place.multiplier.value - pp.multiplier.value
-                    )
-
-                new_position_per_user_id[record["user_id"]] = n + 1
-                new_values_by_position.append(overtake_difference)
-                next_place = pp
-
-        self.positions_per_user_id = new_position_per_user_id
-        self.leaderboard_items = new_leaderboard_items
-        self.values_by_position = new_values_by_position
-
-        self.logger.debug("Multiplier leaderboard cache updated")
-
-    def podium_value_formatter(self, position: int) -> str:
-        multiplier = self.leaderboard_items[position - 1][1]
-        return f"**{utils.format_int(multiplier)}x** multiplier"
+    def podium_value_formatter(self, value: int) -> str:
+        return f"**{utils.format_int(value)}x** multiplier"
 
-    def comparison_formatter(self, position: int) -> str | None:
+    def comparison_formatter(self, position: int, difference: int) -> str | None:
         if position == 1:
             return
 
-        difference = self.values_by_position[position - 1]
-
         return (
             f"{utils.format_int(difference)}x multiplier behind"
             f" {utils.format_ordinal(position - 1)} place"
         )
 
 
-class DonationLeaderboardCache(LeaderboardCache[int, int]):
+class DonationLeaderboardCache(LeaderboardCache):
     title = "the most generous people sharing their pp with everyone"
+    guild_title = "the most generous server members sharing their pp with everyone"
     label = "Donations (via /donate)"
+    QUERY = """
+        SELECT
+            pps.user_id,
+            donor_totals.total_amount AS value
+        FROM donor_totals
+        JOIN pps
+            ON donor_totals.donor_id = pps.user_id
+        ORDER BY donor_totals.total_amount DESC
+        """
+    GUILD_QUERY = """
+        SELECT
+            pps.user_id,
+            donor_totals.total_amount AS value
+        FROM donor_totals
+        INNER JOIN pp_guilds ON
+            pp_guilds.user_id=donor_totals.donor_id
+            AND pp_guilds.guild_id=$1
+        JOIN pps
+            ON donor_totals.donor_id = pps.user_id
+        ORDER BY donor_totals.total_amount DESC
+        """
 
-    @classmethod
-    def for_guild(cls: type[Self], guild: discord.Guild) -> Self:
-        leaderboard_cache = cls(
-            logger=logging.getLogger(
-                "vbu.bot.cog.LeaderboardCommandCog.DonationLeaderboardCache"
-                f"-GUILD-{guild.id}"
-            ),
-        )
-
-        leaderboard_cache.title = (
-            "the most generous server members sharing their pp with everyone"
-        )
-
-        async def guild_update():
-            leaderboard_cache.logger.debug("Updating donation leaderboard cache...")
-
-            new_position_per_user_id: dict[int, int] = {}
-            new_leaderboard_items: list[tuple[utils.Pp, int]] = []
-            new_values_by_position: list[int] = []
-
-            async with utils.DatabaseWrapper() as db:
-                records = await db(
-                    """
-                    WITH donation_totals AS (
-                        SELECT
-                            donor_id,
-                            SUM(amount) AS total_donations
-                        FROM donations
-                        INNER JOIN pp_guilds ON
-                            pp_guilds.user_id=donations.donor_id
-                            AND pp_guilds.guild_id=$1 
-                        GROUP BY donor_id
-                    )
-                    SELECT
-                        pps.*,
-                        donation_totals.total_donations
-                    FROM donation_totals
-                    JOIN pps
-                        ON donation_totals.donor_id = pps.user_id
-                    ORDER BY donation_totals.total_donations DESC
-                    """,
-                    guild.id,
-                )
-                next_place_total_donations = 0
-
-                for n, record in enumerate(records):
-                    pp_data = dict(record)
-                    total_donations = pp_data.pop("total_donations")
-
-                    if n < 10:
-                        pp = utils.Pp.from_record(pp_data)
-                        new_leaderboard_items.append((pp, total_donations))
-
-                    new_position_per_user_id[record["user_id"]] = n + 1
-                    new_values_by_position.append(
-                        next_place_total_donations - total_donations
-                    )
-
-                    next_place_total_donations = total_donations
-
-            leaderboard_cache.positions_per_user_id = new_position_per_user_id
-            leaderboard_cache.leaderboard_items = new_leaderboard_items
-            leaderboard_cache.values_by_position = new_values_by_position
-
-            leaderboard_cache.logger.debug("Donation leaderboard cache updated")
-
-        leaderboard_cache.update = guild_update
-
-        return leaderboard_cache
-
-    async def update(self) -> None:
-        self.logger.debug("Updating donation leaderboard cache...")
-
-        new_position_per_user_id: dict[int, int] = {}
-        new_leaderboard_items: list[tuple[utils.Pp, int]] = []
-        new_values_by_position: list[int] = []
-
-        async with utils.DatabaseWrapper() as db:
-            records = await db("""
-                WITH donation_totals AS (
-                    SELECT
-                        donor_id,
-                        SUM(amount) AS total_donations
-                    FROM donations
-                    GROUP BY donor_id
-                )
-                SELECT
-                    pps.*,
-                    donation_totals.total_donations
-                FROM donation_totals
-                JOIN pps
-                    ON donation_totals.donor_id = pps.user_id
-                ORDER BY donation_totals.total_donations DESC
-                """)
-            next_place_total_donations = 0
-
-            for n, record in enumerate(records):
-                pp_data = dict(record)
-                total_donations = pp_data.pop("total_donations")
-
-                if n < 10:
-                    pp = utils.Pp.from_record(pp_data)
-                    new_leaderboard_items.append((pp, total_donations))
-
-                new_position_per_user_id[record["user_id"]] = n + 1
-                new_values_by_position.append(
-                    next_place_total_donations - total_donations
-                )
-
-                next_place_total_donations = total_donations
-
-        self.positions_per_user_id = new_position_per_user_id
-        self.leaderboard_items = new_leaderboard_items
-        self.values_by_position = new_values_by_position
-
-        self.logger.debug("Donation leaderboard cache updated")
-
-    def podium_value_formatter(self, position: int) -> str:
-        amount = self.leaderboard_items[position - 1][1]
-        return f"{utils.format_inches(amount)} donated"
+    def podium_value_formatter(self, value: int) -> str:
+        return f"{utils.format_inches(value)} donated"
 
-    def comparison_formatter(self, position: int) -> str | None:
+    def comparison_formatter(self, position: int, difference: int) -> str | None:
         if position == 1:
             return
 
-        difference = self.values_by_position[position - 1]
-
         return (
             f"{utils.format_int(difference)} in donations behind"
             f" {utils.format_ordinal(position - 1)} place"
@@ -518,6 +370,40 @@ class LeaderboardCommandCog(vbu.Cog[utils.Bot]):
         await self.multiplier_leaderboard_cache.update()
         await self.donation_leaderboard_cache.update()
 
+    @staticmethod
+    def _page_buttons_factory(interaction_id: str) -> dict[str, discord.ui.Button]:
+        return {
+            "PREVIOUS": discord.ui.Button(
+                custom_id=f"{interaction_id}_PREVIOUS",
+                emoji="<:previous:1108442605718610051>",
+            ),
+            "NEXT": discord.ui.Button(
+                custom_id=f"{interaction_id}_NEXT",
+                emoji="<:next:1108442607039811735>",
+            ),
+            "MY_PAGE": discord.ui.Button(
+                label="Jump to me", custom_id=f"{interaction_id}_MY_PAGE"
+            ),
+            "AROUND_ME": discord.ui.Button(
+                label="Around me", custom_id=f"{interaction_id}_AROUND_ME"
+            ),
+        }
+
+    @staticmethod
+    def _update_page_buttons(
+        page_buttons: dict[str, discord.ui.Button],
+        leaderboard_cache: LeaderboardCache,
+        standing: tuple[int, int] | None,
+        start: int,
+        size: int,
+    ) -> None:
+        is_ranked = standing is not None
+
+        page_buttons["PREVIOUS"].disabled = start == 1
+        page_buttons["NEXT"].disabled = start + size > leaderboard_cache.ranks.size
+        page_buttons["MY_PAGE"].disabled = not is_ranked
+        page_buttons["AROUND_ME"].disabled = not is_ranked
+
     @commands.command(
         "leaderboard",
         utils.Command,
@@ -534,8 +420,11 @@ class LeaderboardCommandCog(vbu.Cog[utils.Bot]):
         current_category = "SIZE"
         current_scope = "GLOBAL"
         leaderboard_cache = self.CATEGORIES[current_category]
+        start = 1
+        size = leaderboard_cache.PAGE_SIZE
 
-        embed = leaderboard_cache.generate_embed(ctx)
+        standing = await leaderboard_cache.fetch_standing(ctx.author.id)
+        embed = await leaderboard_cache.generate_embed(standing)
 
         interaction_id = uuid.uuid4().hex
         category_menu = discord.ui.SelectMenu(
@@ -582,6 +471,12 @@ class LeaderboardCommandCog(vbu.Cog[utils.Bot]):
                 discord.ui.ActionRow(category_menu)
             )
 
+        page_buttons = self._page_buttons_factory(interaction_id)
+        components.add_component(discord.ui.ActionRow(*page_buttons.values()))
+        self._update_page_buttons(
+            page_buttons, leaderboard_cache, standing, start, size
+        )
+
         await ctx.interaction.response.send_message(
             embed=embed,
             components=components,
@@ -593,7 +488,14 @@ class LeaderboardCommandCog(vbu.Cog[utils.Bot]):
                     self.bot,
                     interaction_id,
                     users=[ctx.author],
-                    actions=["CATEGORY", "SCOPE"],
+                    actions=[
+                        "CATEGORY",
+                        "SCOPE",
+                        "PREVIOUS",
+                        "NEXT",
+                        "MY_PAGE",
+                        "AROUND_ME",
+                    ],
                     timeout=120,
                 )
             except asyncio.TimeoutError:
@@ -604,28 +506,55 @@ class LeaderboardCommandCog(vbu.Cog[utils.Bot]):
                     pass
                 break
 
-            if action == "CATEGORY":
-                current_category = interaction.values[0]
-                for option in category_menu.options:
-                    option.default = option.value == current_category
-            elif ctx.guild is not None:
-                current_scope = cast(LeaderboardScope, interaction.values[0])
+            page_size = leaderboard_cache.PAGE_SIZE
+            standing = await leaderboard_cache.fetch_standing(ctx.author.id)
+            user_position = None if standing is None else standing[0]
+
+            if action == "PREVIOUS":
+                start, size = max(1, start - page_size), page_size
+            elif action == "NEXT":
+                start, size = start + size, page_size
+            elif action == "MY_PAGE" and user_position is not None:
+                start = (user_position - 1) // page_size * page_size + 1
+                size = page_size
+            elif action == "AROUND_ME" and user_position is not None:
+                radius = leaderboard_cache.AROUND_RADIUS
+                start, size = max(1, user_position - radius), radius * 2 + 1
+            elif action in ("CATEGORY", "SCOPE"):
+                if action == "CATEGORY":
+                    current_category = interaction.values[0]
+                    for option in category_menu.options:
+                        option.default = option.value == current_category
+                elif ctx.guild is not None:
+                    current_scope = cast(LeaderboardScope, interaction.values[0])
+
+                    # get scope_menu the hard way cause its pOsSiBlY uNbOuNd
+                    scope_menu_row = cast(
+                        discord.ui.ActionRow, components.components[1]
+                    )
+                    scope_menu = cast(
+                        discord.ui.SelectMenu, scope_menu_row.components[0]
+                    )
 
-                # get scope_menu the hard way cause its pOsSiBlY uNbOuNd
-                scope_menu_row = cast(discord.ui.ActionRow, components.components[1])
-                scope_menu = cast(discord.ui.SelectMenu, scope_menu_row.components[0])
+                    for option in scope_menu.options:
+                        option.default = option.value == current_scope
 
-                for option in scope_menu.options:
-                    option.default = option.value == current_scope
+                leaderboard_cache = self.CATEGORIES[current_category]
 
-            leaderboard_cache = self.CATEGORIES[current_category]
+                if current_scope == "GUILD" and ctx.guild is not None:
+                    guild = cast(discord.Guild, ctx.guild)
+                    leaderboard_cache = leaderboard_cache.for_guild(guild)
+                    await leaderboard_cache.update()
 
-            if current_scope == "GUILD" and ctx.guild is not None:
-                guild = cast(discord.Guild, ctx.guild)
-                leaderboard_cache = leaderboard_cache.for_guild(guild)
-                await leaderboard_cache.update()
+                start, size = 1, leaderboard_cache.PAGE_SIZE
+                standing = await leaderboard_cache.fetch_standing(ctx.author.id)
 
-            embed = leaderboard_cache.generate_embed(ctx)
+            embed = await leaderboard_cache.generate_embed(
+                standing, start=start, size=size
+            )
+            self._update_page_buttons(
+                page_buttons, leaderboard_cache, standing, start, size
+            )
 
             await interaction.response.edit_message(embed=embed, components=components)
 
@@ -1,17 +1,42 @@
-from discord.ext import vbu
+from discord.ext import vbu, tasks
 
 from . import utils
 
 
 class LoadingCog(vbu.Cog[utils.Bot]):
+    CONFIG_POLL_INTERVAL = 5
+    SNAPSHOT_LISTEN_RETRY_INTERVAL = 5
+
     def __init__(self, bot: utils.Bot, logger_name: str | None = None):
         super().__init__(bot, logger_name)
         bot_ready_on_init = bot.is_ready()
 
-        self.load_sync_managers()
+        utils.UserCommandLockManager.CROSS_PROCESS = bot.config.get(
+            "command_locks", {}
+        ).get("cross_process", False)
+        utils.DatabaseTimeoutManager.MIRROR_TO_REDIS = bot.config.get(
+            "database_timeouts", {}
+        ).get("mirror_to_redis", False)
+        utils.LeaderboardSnapshot.CHUNK_SIZE = bot.config.get("leaderboards", {}).get(
+            "chunk_size", utils.LeaderboardSnapshot.CHUNK_SIZE
+        )
+        utils.RankView.ENABLED = bot.config.get("leaderboards", {}).get(
+            "rank_views", False
+        )
 
         if bot_ready_on_init:
+            # The managers are already live, so don't stall the event loop reparsing them
+            bot.loop.create_task(self.reload_sync_managers())
             bot.loop.create_task(self.load_async_managers())
+        else:
+            self.load_sync_managers()
+
+        self.watch_config_files.start()
+        self.listen_for_snapshot_invalidations.start()
+
+    async def cog_unload(self) -> None:
+        self.watch_config_files.cancel()
+        self.listen_for_snapshot_invalidations.cancel()
 
     def load_sync_managers(self) -> None:
         self.logger.info("Loading SYNC managers...")
@@ -25,6 +50,41 @@ class LoadingCog(vbu.Cog[utils.Bot]):
         utils.ChangelogManager.load()
         self.logger.info(" * Loading ChangelogManager... success")
 
+    async def reload_sync_managers(self) -> None:
+        self.logger.info("Reloading SYNC managers...")
+
+        for manager in utils.ConfigReloader.managers:
+            await utils.ConfigReloader.reload(manager)
+
+        await self.load_item_catalogue()
+
+    async def load_item_catalogue(self) -> None:
+        async with utils.DatabaseWrapper() as db:
+            await utils.ItemManager.load_catalogue(db.conn)
+
+    @tasks.loop(seconds=CONFIG_POLL_INTERVAL)
+    async def watch_config_files(self) -> None:
+        reloaded = await utils.ConfigReloader.poll()
+
+        if reloaded:
+            self.logger.info(
+                f"Hot-reloaded {', '.join(reloaded)}"
+                f" ({utils.ConfigReloader.get_versions()})"
+            )
+
+        # New items need interning before they can end up in anyone's inventory
+        if utils.ItemManager.__name__ in reloaded:
+            await self.load_item_catalogue()
+
+    @tasks.loop(seconds=SNAPSHOT_LISTEN_RETRY_INTERVAL)
+    async def listen_for_snapshot_invalidations(self) -> None:
+        # Only returns once the connection drops, the loop then reconnects
+        try:
+            async with utils.DatabaseWrapper() as db:
+                await utils.SnapshotCache.listen(db.conn)
+        except Exception as error:
+            self.logger.error(f"Lost the snapshot invalidation listener: {error!r}")
+
     @vbu.Cog.listener("on_ready")
     async def load_async_managers(self) -> None:
         self.logger.info("Loading ASYNC managers...")
@@ -32,6 +92,9 @@ class LoadingCog(vbu.Cog[utils.Bot]):
         await utils.SlashCommandMappingManager.load(self.bot)
         self.logger.info(" * Loading SlashCommandMappingManager... success")
 
+        await self.load_item_catalogue()
+        self.logger.info(" * Loading item catalogue... success")
+
 
 async def setup(bot: utils.Bot):
     await bot.add_cog(LoadingCog(bot))
@@ -7,6 +7,7 @@ class NewCommandCog(vbu.Cog[utils.Bot]):
     @commands.command(
         "new",
         utils.Command,
+        serialised=True,
         category=utils.CommandCategory.GETTING_STARTED,
         application_command_meta=commands.ApplicationCommandMeta(),
     )
@@ -29,17 +29,14 @@ class ReplyCommandCog(vbu.Cog[utils.Bot]):
 
         assert ctx.channel is not None
 
-        try:
-            future, check = utils.ReplyManager.active_listeners[ctx.channel]
-        except KeyError:
+        if utils.ReplyManager.get_listener(ctx.channel.id, ctx.author.id) is None:
             await ctx.interaction.response.send_message(
                 f"There's nothing to reply to! If you've randomly stumbled across this command, don't worry. The {utils.format_slash_command('reply')} command is only meant to be used when the bot tells you to, i.e., during a random event.",
                 ephemeral=True,
             )
             return
 
-        if check(ctx, content):
-            future.set_result((ctx, content))
+        utils.ReplyManager.resolve(ctx, content)
 
 
 async def setup(bot: utils.Bot):
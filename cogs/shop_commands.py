@@ -165,6 +165,7 @@ class ShopCommandCog(vbu.Cog[utils.Bot]):
     @commands.command(
         "buy",
         utils.Command,
+        serialised=True,
         category=utils.CommandCategory.SHOP,
         application_command_meta=commands.ApplicationCommandMeta(
             options=[
@@ -292,11 +293,10 @@ class ShopCommandCog(vbu.Cog[utils.Bot]):
                 )
 
                 try:
-                    component_interaction = await self.bot.wait_for(
-                        "component_interaction",
-                        check=lambda i: i.user == ctx.author
-                        and i.custom_id.startswith(interaction_id),
-                        timeout=180,
+                    component_interaction, action = (
+                        await utils.wait_for_component_interaction(
+                            self.bot, interaction_id, users=[ctx.author], timeout=180
+                        )
                     )
                 except asyncio.TimeoutError:
                     try:
@@ -308,8 +308,6 @@ class ShopCommandCog(vbu.Cog[utils.Bot]):
                         pass
                     return
 
-                _, action = component_interaction.custom_id.split("_", 1)
-
                 if action == "CANCEL":
                     await ctx.interaction.delete_original_message()
                     return
@@ -442,11 +440,10 @@ class ShopCommandCog(vbu.Cog[utils.Bot]):
             )
 
             try:
-                component_interaction = await self.bot.wait_for(
-                    "component_interaction",
-                    check=lambda i: i.user == ctx.author
-                    and i.custom_id.startswith(interaction_id),
-                    timeout=180,
+                component_interaction, action = (
+                    await utils.wait_for_component_interaction(
+                        self.bot, interaction_id, users=[ctx.author], timeout=180
+                    )
                 )
             except asyncio.TimeoutError:
                 try:
@@ -458,8 +455,6 @@ class ShopCommandCog(vbu.Cog[utils.Bot]):
                     pass
                 return
 
-            _, action = component_interaction.custom_id.split("_", 1)
-
             if action == "NO":
                 embed.colour = utils.RED
                 embed.title = "Purchase cancelled"
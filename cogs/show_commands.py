@@ -290,17 +290,36 @@ class ShowCommandsCog(vbu.Cog[utils.Bot]):
 
         return embed
 
+    async def _fetch_profile(
+        self,
+        ctx: commands.SlashContext[utils.Bot],
+        member: discord.Member | discord.User,
+    ) -> utils.Profile:
+        async with utils.DatabaseWrapper() as db:
+            try:
+                return await utils.Profile.fetch_from_user(
+                    db.conn, member.id, cached=True
+                )
+            except utils.PpMissing:
+                if member == ctx.author:
+                    raise
+                raise utils.PpMissing(
+                    f"{member.mention} ain't got a pp :(", user=member
+                )
+
     async def handle_tabs(
         self,
         ctx: commands.SlashContext[utils.Bot],
         member: discord.Member | discord.User,
         interaction_id: str,
         components: discord.ui.MessageComponents,
-        pp: utils.Pp | None = None,
-        pp_extras: utils.PpExtras | None = None,
-        streaks: utils.Streaks | None = None,
+        profile: utils.Profile | None = None,
         inventory: list[utils.InventoryItem] | None = None,
     ) -> None:
+        # The session keeps the profile it loaded, so tabs are switched without queries
+        if inventory is None and profile is not None:
+            inventory = profile.inventory
+
         embed = None
         while True:
             try:
@@ -318,64 +337,43 @@ class ShowCommandsCog(vbu.Cog[utils.Bot]):
                     pass
                 break
 
-            if action == "INVENTORY":
-                if inventory is None:
-                    async with utils.DatabaseWrapper() as db:
-                        inventory = await utils.InventoryItem.fetch(
-                            db.conn,
-                            {"user_id": member.id},
-                            fetch_multiple_rows=True,
-                        )
-                embed = self._inventory_embed_factory(
-                    member, inventory, is_author=ctx.author == member
-                )
-                interaction_id, components = self._component_factory(
-                    current_page_id="INVENTORY"
-                )
-            elif action == "SHOW":
-                if pp is None or pp_extras is None or streaks is None:
-                    async with utils.DatabaseWrapper() as db:
-                        if pp is None:
-                            try:
-                                pp = await utils.Pp.fetch_from_user(db.conn, member.id)
-                            except utils.PpMissing:
-                                if member == ctx.author:
-                                    raise
-                                raise utils.PpMissing(
-                                    f"{member.mention} ain't got a pp :(", user=member
-                                )
-                        if pp_extras is None:
-                            pp_extras = await utils.PpExtras.fetch_from_user(
-                                db.conn, member.id
-                            )
-                        if streaks is None:
-                            streaks = await utils.Streaks.fetch_from_user(
-                                db.conn, member.id
-                            )
+            if action == "SHOW":
+                if profile is None:
+                    profile = await self._fetch_profile(ctx, member)
+                    inventory = profile.inventory
 
                 embed = await self._show_embed_factory(
                     member,
-                    pp,
-                    pp_extras,
-                    streaks,
+                    profile.pp,
+                    profile.pp_extras,
+                    profile.streaks,
                     ctx.channel,
                     is_author=ctx.author == member,
                 )
                 interaction_id, components = self._component_factory(
                     current_page_id="SHOW"
                 )
-            elif action == "UNLOCKED_COMMANDS":
+            else:
                 if inventory is None:
                     async with utils.DatabaseWrapper() as db:
                         inventory = await utils.InventoryItem.fetch(
                             db.conn,
-                            {"user_id": ctx.author.id},
+                            {"user_id": member.id},
                             fetch_multiple_rows=True,
                         )
-                embed = self._unlocked_commands_embed_factory(member, inventory)
-                interaction_id, components = self._component_factory(
-                    current_page_id="UNLOCKED_COMMANDS"
-                )
+
+                if action == "INVENTORY":
+                    embed = self._inventory_embed_factory(
+                        member, inventory, is_author=ctx.author == member
+                    )
+                    interaction_id, components = self._component_factory(
+                        current_page_id="INVENTORY"
+                    )
+                elif action == "UNLOCKED_COMMANDS":
+                    embed = self._unlocked_commands_embed_factory(member, inventory)
+                    interaction_id, components = self._component_factory(
+                        current_page_id="UNLOCKED_COMMANDS"
+                    )
 
             await component_interaction.response.edit_message(
                 embed=embed, components=components
@@ -405,28 +403,22 @@ class ShowCommandsCog(vbu.Cog[utils.Bot]):
         """
 
         member = user or ctx.author
-
-        async with utils.DatabaseWrapper() as db:
-            try:
-                pp = await utils.Pp.fetch_from_user(db.conn, member.id)
-            except utils.PpMissing:
-                if member == ctx.author:
-                    raise
-                raise utils.PpMissing(
-                    f"{member.mention} ain't got a pp :(", user=member
-                )
-            pp_extras = await utils.PpExtras.fetch_from_user(db.conn, member.id)
-            streaks = await utils.Streaks.fetch_from_user(db.conn, member.id)
+        profile = await self._fetch_profile(ctx, member)
 
         embed = await self._show_embed_factory(
-            member, pp, pp_extras, streaks, ctx.channel, is_author=ctx.author == member
+            member,
+            profile.pp,
+            profile.pp_extras,
+            profile.streaks,
+            ctx.channel,
+            is_author=ctx.author == member,
         )
 
         interaction_id, components = self._component_factory(current_page_id="SHOW")
         await ctx.interaction.response.send_message(embed=embed, components=components)
 
         await self.handle_tabs(
-            ctx, member, interaction_id, components=components, pp=pp, streaks=streaks
+            ctx, member, interaction_id, components=components, profile=profile
         )
 
     @commands.command(
@@ -455,7 +447,7 @@ class ShowCommandsCog(vbu.Cog[utils.Bot]):
 
         async with utils.DatabaseWrapper() as db:
             inventory = await utils.InventoryItem.fetch(
-                db.conn, {"user_id": ctx.author.id}, fetch_multiple_rows=True
+                db.conn, {"user_id": member.id}, fetch_multiple_rows=True
             )
 
         embed = self._inventory_embed_factory(
@@ -87,8 +87,10 @@ from .formatters import (
 from .errors import (
     PpMissing as PpMissing,
     PpNotBigEnough as PpNotBigEnough,
+    DatabaseTimeout as DatabaseTimeout,
     InvalidArgumentAmount as InvalidArgumentAmount,
 )
+from .cache import SnapshotCache as SnapshotCache
 from .helpers import (
     limit_text as limit_text,
     compare as compare,
@@ -105,6 +107,7 @@ from .helpers import (
     SlashCommandMappingManager as SlashCommandMappingManager,
     format_slash_command as format_slash_command,
 )
+from .scheduler import DeadlineScheduler as DeadlineScheduler
 from .cards import (
     Rank as Rank,
     Suit as Suit,
@@ -113,6 +116,20 @@ from .cards import (
     Hand as Hand,
     BlackjackHand as BlackjackHand,
 )
+from .managers import (
+    DuplicateReplyListenerError as DuplicateReplyListenerError,
+    ReplyListener as ReplyListener,
+    ReplyManager as ReplyManager,
+    DatabaseTimeoutReason as DatabaseTimeoutReason,
+    DatabaseTimeoutManager as DatabaseTimeoutManager,
+    NotificationContextManager as NotificationContextManager,
+    UserCommandQueue as UserCommandQueue,
+    UserCommandLockManager as UserCommandLockManager,
+    ComponentInteractionWaiter as ComponentInteractionWaiter,
+    ComponentInteractionRouter as ComponentInteractionRouter,
+    wait_for_component_interaction as wait_for_component_interaction,
+    ChangelogManager as ChangelogManager,
+)
 from .command import (
     ExtendBucketType as ExtendBucketType,
     CooldownFactory as CooldownFactory,
@@ -122,13 +139,6 @@ from .command import (
     CommandCategory as CommandCategory,
     Command as Command,
 )
-from .managers import (
-    DuplicateReplyListenerError as DuplicateReplyListenerError,
-    ReplyManager as ReplyManager,
-    DatabaseTimeoutManager as DatabaseTimeoutManager,
-    wait_for_component_interaction as wait_for_component_interaction,
-    ChangelogManager as ChangelogManager,
-)
 from .command_logs import CommandLog as CommandLog
 from .streaks import Streaks as Streaks
 from .items import (
@@ -148,7 +158,12 @@ from .pps import (
     Pp as Pp,
     PpExtras as PpExtras,
     PpGuilds as PpGuilds,
-    DatabaseTimeout as DatabaseTimeout,
+)
+from .leaderboards import LeaderboardSnapshot as LeaderboardSnapshot
+from .leaderboards import RankView as RankView
+from .profiles import (
+    Profile as Profile,
+    ProfileSummary as ProfileSummary,
 )
 from .paginator import (
     PaginatorActions as PaginatorActions,
@@ -165,4 +180,15 @@ from .minigames import (
     ClickThatButtonMinigame as ClickThatButtonMinigame,
     MinigameDialogueManager as MinigameDialogueManager,
 )
-from .donations import Donation
+from .donations import (
+    Donation as Donation,
+    DonationFailure as DonationFailure,
+    DonationFailed as DonationFailed,
+    DonationReceipt as DonationReceipt,
+    DonationReservation as DonationReservation,
+    DonationEngine as DonationEngine,
+)
+from .config_reloader import (
+    ReloadableManager as ReloadableManager,
+    ConfigReloader as ConfigReloader,
+)
@@ -0,0 +1,179 @@
+from __future__ import annotations
+import asyncio
+import contextlib
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Hashable, Iterator
+from contextvars import ContextVar
+from typing import Any
+
+import asyncpg
+
+
+class SnapshotCache:
+    """
+    Read-through cache of database rows for read-only paths, used by
+    `DatabaseWrapperObject.fetch_cached`. Rows live for at most `TTL` seconds, and the least
+    recently used ones are evicted past `MAX_SIZE`. Writes through `DatabaseWrapperObject`
+    invalidate their row straight away. Every other write, from any process, is caught by
+    the `snapshot_invalidation` trigger (see config/database.pgsql), whose NOTIFY is picked
+    up by `listen`. Only found rows are cached, so a missing row never hides a new one.
+    """
+
+    TTL = 60
+    MAX_SIZE = 50_000
+    # Rows whose last invalidation is remembered, see `set`
+    MAX_INVALIDATIONS = 10_000
+    CHANNEL = "snapshot_invalidation"
+    # Entries built from several tables' rows (see cogs/utils/profiles.py), invalidated
+    # along with any of them. They're keyed by `(user_id,)` too
+    DEPENDENTS: dict[str, tuple[str, ...]] = {
+        "pps": ("profiles", "profile_summaries"),
+        "pp_extras": ("profiles",),
+        "streaks": ("profiles",),
+        "inventories": ("profiles", "profile_summaries"),
+    }
+
+    _snapshots: OrderedDict[tuple[str, Hashable], tuple[float, Any]] = OrderedDict()
+    # Bumped by every invalidation, see `set`
+    generation = 0
+    # The generation each row was last invalidated at, oldest first. Anything older than
+    # `_forgotten_generation` isn't known anymore
+    _invalidations: OrderedDict[tuple[str, Hashable], int] = OrderedDict()
+    _forgotten_generation = 0
+    _strict: ContextVar[bool] = ContextVar("snapshot_cache_strict", default=False)
+    counters = {
+        "hits": 0,
+        "misses": 0,
+        "bypasses": 0,
+        "invalidations": 0,
+        "expirations": 0,
+        "evictions": 0,
+        "notifications": 0,
+    }
+    _logger = logging.getLogger("vbu.bot.cog.utils.SnapshotCache")
+
+    @classmethod
+    @contextlib.contextmanager
+    def strict(cls) -> Iterator[None]:
+        """Every cached fetch inside bypasses the cache, for write paths"""
+        token = cls._strict.set(True)
+        try:
+            yield
+        finally:
+            cls._strict.reset(token)
+
+    @classmethod
+    def is_strict(cls) -> bool:
+        return cls._strict.get()
+
+    @classmethod
+    def get(
+        cls, table: str, key: Hashable, *, ignore_strict: bool = False
+    ) -> Any | None:
+        """
+        `ignore_strict` is for lookups that stay valid on write paths, as everything that
+        could change them is serialised per user anyway
+        """
+        if cls.is_strict() and not ignore_strict:
+            cls.counters["bypasses"] += 1
+            return None
+
+        try:
+            expires_at, record = cls._snapshots[(table, key)]
+        except KeyError:
+            cls.counters["misses"] += 1
+            return None
+
+        if expires_at <= time.monotonic():
+            del cls._snapshots[(table, key)]
+            cls.counters["expirations"] += 1
+            cls.counters["misses"] += 1
+            return None
+
+        cls._snapshots.move_to_end((table, key))
+        cls.counters["hits"] += 1
+        return record
+
+    @classmethod
+    def set(cls, table: str, key: Hashable, record: Any, *, generation: int) -> None:
+        """
+        `generation` is the one from before the record was fetched. If the row was
+        invalidated since, the record might predate that write, so it isn't cached.
+        Invalidations of other rows don't matter
+        """
+        if (
+            generation < cls._forgotten_generation
+            or cls._invalidations.get((table, key), 0) > generation
+        ):
+            return
+
+        cls._snapshots[(table, key)] = (time.monotonic() + cls.TTL, record)
+        cls._snapshots.move_to_end((table, key))
+
+        while len(cls._snapshots) > cls.MAX_SIZE:
+            cls._snapshots.popitem(last=False)
+            cls.counters["evictions"] += 1
+
+    @classmethod
+    def invalidate(cls, table: str, key: Hashable) -> None:
+        cls.generation += 1
+
+        for invalidated_table in (table, *cls.DEPENDENTS.get(table, ())):
+            cls._invalidations[(invalidated_table, key)] = cls.generation
+            cls._invalidations.move_to_end((invalidated_table, key))
+
+            if cls._snapshots.pop((invalidated_table, key), None) is not None:
+                cls.counters["invalidations"] += 1
+
+        while len(cls._invalidations) > cls.MAX_INVALIDATIONS:
+            _, cls._forgotten_generation = cls._invalidations.popitem(last=False)
+
+    @classmethod
+    def clear(cls) -> None:
+        cls.generation += 1
+        cls._forgotten_generation = cls.generation
+        cls._invalidations.clear()
+        cls._snapshots.clear()
+
+    @classmethod
+    def _on_notification(
+        cls, connection: asyncpg.Connection, pid: int, channel: str, payload: str
+    ) -> None:
+        # Payloads are `{table}:{user_id}`
+        table, _, user_id = payload.partition(":")
+        cls.counters["notifications"] += 1
+
+        try:
+            cls.invalidate(table, (int(user_id),))
+        except ValueError:
+            cls._logger.error(f"Invalid {cls.CHANNEL} payload: {payload!r}")
+
+    @classmethod
+    async def listen(cls, connection: asyncpg.Connection) -> None:
+        """
+        Invalidates rows as their NOTIFYs come in, until the connection is closed. Clears
+        the cache first, since anything could've changed while nobody was listening
+        """
+        closed = asyncio.Event()
+
+        def on_termination(_: asyncpg.Connection) -> None:
+            closed.set()
+
+        connection.add_termination_listener(on_termination)
+        await connection.add_listener(cls.CHANNEL, cls._on_notification)
+        cls.clear()
+
+        try:
+            await closed.wait()
+        finally:
+            connection.remove_termination_listener(on_termination)
+            if not connection.is_closed():
+                await connection.remove_listener(cls.CHANNEL, cls._on_notification)
+            # Notifications are lost from here on, so don't trust anything cached
+            cls.clear()
+
+    @classmethod
+    def get_stats(cls) -> dict[str, int]:
+        return {**cls.counters, "size": len(cls._snapshots)}
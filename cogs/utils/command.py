@@ -1,5 +1,7 @@
 from __future__ import annotations
+import contextlib
 import time
+from collections.abc import AsyncIterator
 from datetime import timezone
 from enum import Enum
 from typing import Any, cast, Callable, Coroutine, Self, TypedDict
@@ -7,7 +9,7 @@ from typing import Any, cast, Callable, Coroutine, Self, TypedDict
 import discord
 from discord.ext import commands, vbu
 
-from . import Bot, format_cooldown, VOTE_URL
+from . import Bot, format_cooldown, VOTE_URL, UserCommandLockManager, SnapshotCache
 
 type ExtendBucketType = commands.BucketType | Callable[
     [discord.Message | discord.Interaction], Any
@@ -175,6 +177,7 @@ class CommandOnCooldown(commands.CommandOnCooldown):
 
 class Command(commands.Command):
     category: CommandCategory
+    serialised: bool
     _cooldown_factory: CooldownFactory | None
     _buckets: RedisCooldownMapping
 
@@ -183,12 +186,15 @@ class Command(commands.Command):
         func,
         *,
         category: CommandCategory = CommandCategory.OTHER,
+        serialised: bool = False,
         cooldown_factory: CooldownFactory | None = None,
         cooldown_tier_info: CooldownTierInfoDict | None = None,
         **kwargs,
     ):
         super().__init__(func, **kwargs)
         self.category = category
+        # Whether the command writes to the user's pp, see UserCommandLockManager
+        self.serialised = serialised
 
         try:
             self._cooldown_factory = cast(
@@ -222,6 +228,22 @@ class Command(commands.Command):
 
         return other
 
+    @contextlib.asynccontextmanager
+    async def serialise(self, ctx: commands.Context[Bot]) -> AsyncIterator[None]:
+        """Runs the inside under the user's command lock, if the command is serialised"""
+        if not self.serialised:
+            yield
+            return
+
+        # Writing commands never read from the cache, even through helpers
+        with SnapshotCache.strict():
+            async with UserCommandLockManager.hold(ctx.author.id):
+                yield
+
+    async def invoke(self, ctx: commands.Context[Bot]) -> None:
+        async with self.serialise(ctx):
+            await super().invoke(ctx)
+
     async def _get_buckets(self, ctx: commands.Context[Bot]) -> RedisCooldownMapping:
         if self._cooldown_factory is not None:
             cooldown, bucket_type = await self._cooldown_factory(ctx)
@@ -37,3 +37,19 @@ class CommandLog(DatabaseWrapperObject):
             """,
             command_name,
         )
+
+    @classmethod
+    async def fetch_mix(
+        cls, connection: asyncpg.Connection, *, since: datetime | None = None
+    ) -> dict[str, int]:
+        """Returns `{command_name: usage}`, summed over every hour from `since` onwards"""
+        records = await connection.fetch(
+            f"""
+            SELECT command_name, sum(usage)::BIGINT AS usage
+            FROM {cls._table}
+            WHERE $1::TIMESTAMP IS NULL OR timeframe >= $1
+            GROUP BY command_name
+            """,
+            since,
+        )
+        return {record["command_name"]: record["usage"] for record in records}
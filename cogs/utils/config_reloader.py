@@ -0,0 +1,100 @@
+from __future__ import annotations
+import asyncio
+import logging
+import os
+from typing import Any, Protocol
+
+from . import ItemManager, MinigameDialogueManager, ChangelogManager
+
+
+class ReloadableManager(Protocol):
+    __name__: str
+    snapshot_version: int
+
+    def get_paths(self) -> list[str]: ...
+
+    def parse(self) -> Any: ...
+
+    def apply(self, snapshot: Any) -> None: ...
+
+
+_FileStamp = tuple[int, int] | None
+
+
+class ConfigReloader:
+    """
+    Hot-reloads config managers. Files are parsed off-thread into a fresh snapshot, which
+    is then swapped in on the event loop in one go, so commands only ever see either the
+    previous or the new config. If parsing fails, the previous snapshot stays live.
+    """
+
+    managers: list[ReloadableManager] = [
+        ItemManager,
+        MinigameDialogueManager,
+        ChangelogManager,
+    ]
+    _stamps: dict[str, dict[str, _FileStamp]] = {}
+    _lock = asyncio.Lock()
+    _logger = logging.getLogger("vbu.bot.cog.utils.ConfigReloader")
+
+    @staticmethod
+    def _get_stamp(path: str) -> _FileStamp:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    @classmethod
+    def _get_stamps(cls, manager: ReloadableManager) -> dict[str, _FileStamp]:
+        return {path: cls._get_stamp(path) for path in manager.get_paths()}
+
+    @classmethod
+    async def reload(cls, manager: ReloadableManager) -> bool:
+        """Returns whether the manager's new snapshot was swapped in"""
+        async with cls._lock:
+            try:
+                snapshot = await asyncio.to_thread(manager.parse)
+            except Exception as error:
+                cls._logger.error(
+                    f" * Reloading {manager.__name__} failed, keeping snapshot"
+                    f" v{manager.snapshot_version}: {error}"
+                )
+                return False
+
+            manager.apply(snapshot)
+            cls._stamps[manager.__name__] = await asyncio.to_thread(
+                cls._get_stamps, manager
+            )
+
+        cls._logger.info(
+            f" * Reloaded {manager.__name__} (snapshot v{manager.snapshot_version})"
+        )
+        return True
+
+    @classmethod
+    async def poll(cls) -> list[str]:
+        """
+        Reloads every manager whose files changed since they were last seen, returns the
+        names of the managers that were reloaded
+        """
+        reloaded: list[str] = []
+
+        for manager in cls.managers:
+            stamps = await asyncio.to_thread(cls._get_stamps, manager)
+            previous_stamps = cls._stamps.setdefault(manager.__name__, stamps)
+
+            if stamps == previous_stamps:
+                continue
+
+            # Remember the failed stamps too, so a broken file isn't reparsed every poll
+            cls._stamps[manager.__name__] = stamps
+
+            if await cls.reload(manager):
+                reloaded.append(manager.__name__)
+
+        return reloaded
+
+    @classmethod
+    def get_versions(cls) -> dict[str, int]:
+        return {manager.__name__: manager.snapshot_version for manager in cls.managers}
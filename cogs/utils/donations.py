@@ -1,10 +1,16 @@
-from datetime import datetime
-from typing import Self
+import asyncio
+import enum
+import uuid
+from datetime import datetime, timedelta
+from typing import NamedTuple, Self
 
 import asyncpg
 
 from . import (
     DatabaseWrapperObject,
+    DeadlineScheduler,
+    Object,
+    SnapshotCache,
 )
 
 
@@ -20,6 +26,17 @@ class Donation(DatabaseWrapperObject):
     }
     _column_attributes = {attribute: column for column, attribute in _columns.items()}
 
+    # Relevant received donations are summed from hourly buckets, so the 24h window is
+    # the current hour plus the 23 before it
+    BUCKET_TABLE = "donation_buckets"
+    BUCKET_WINDOW_SQL = (
+        "timeframe > timezone('UTC', date_trunc('hour', now())) - INTERVAL '24 hours'"
+    )
+    BUCKET_RETENTION = timedelta(hours=48)
+
+    # Lifetime donated amount per donor, maintained alongside every registered donation
+    DONOR_TOTALS_TABLE = "donor_totals"
+
     def __init__(
         self, recipiant_id: int, donor_id: int, created_at: datetime, amount: int
     ) -> None:
@@ -37,9 +54,22 @@ class Donation(DatabaseWrapperObject):
         amount: int,
     ) -> None:
         await connection.execute(
-            """
-            INSERT INTO donations (recipiant_id, donor_id, amount)
-            VALUES ($1, $2, $3)
+            f"""
+            WITH donation AS (
+                INSERT INTO {cls._table} (recipiant_id, donor_id, amount)
+                VALUES ($1, $2, $3)
+            ),
+            donor_total AS (
+                INSERT INTO {cls.DONOR_TOTALS_TABLE} (donor_id, total_amount)
+                VALUES ($2, $3)
+                ON CONFLICT (donor_id)
+                DO UPDATE SET total_amount = {cls.DONOR_TOTALS_TABLE}.total_amount
+                    + EXCLUDED.total_amount
+            )
+            INSERT INTO {cls.BUCKET_TABLE} (recipiant_id, amount)
+            VALUES ($1, $3)
+            ON CONFLICT (recipiant_id, timeframe)
+            DO UPDATE SET amount = {cls.BUCKET_TABLE}.amount + EXCLUDED.amount
             """,
             recipiant_id,
             donor_id,
@@ -76,9 +106,9 @@ class Donation(DatabaseWrapperObject):
         record = await connection.fetchrow(
             f"""
             SELECT sum(amount) AS total_amount
-            FROM {cls._table}
+            FROM {cls.BUCKET_TABLE}
             WHERE recipiant_id = $1
-            AND created_at > timezone('UTC', now()) - INTERVAL '24 hours'
+            AND {cls.BUCKET_WINDOW_SQL}
             """,
             user_id,
             timeout=timeout,
@@ -88,3 +118,225 @@ class Donation(DatabaseWrapperObject):
             return 0
 
         return record["total_amount"]
+
+    @classmethod
+    async def prune_buckets(
+        cls,
+        connection: asyncpg.Connection,
+        *,
+        retention: timedelta = BUCKET_RETENTION,
+    ) -> int:
+        """Returns the amount of pruned buckets"""
+        status = await connection.execute(
+            f"""
+            DELETE FROM {cls.BUCKET_TABLE}
+            WHERE timeframe < timezone('UTC', now()) - $1::interval
+            """,
+            retention,
+        )
+        return int(status.rsplit(" ", 1)[-1])
+
+
+class DonationFailure(enum.Enum):
+    DONOR_BUSY = enum.auto()
+    RECIPIANT_BUSY = enum.auto()
+    DONOR_MISSING = enum.auto()
+    RECIPIANT_MISSING = enum.auto()
+    NOT_BIG_ENOUGH = enum.auto()
+    LIMIT_REACHED = enum.auto()
+
+
+class DonationFailed(Exception):
+    def __init__(self, failure: DonationFailure) -> None:
+        super().__init__(failure.name)
+        self.failure = failure
+
+
+class DonationReceipt(NamedTuple):
+    donor_size: int
+    recipiant_size: int
+
+
+class DonationReservation(Object):
+    __slots__ = ("id", "donor_id", "recipiant_id", "amount")
+    _repr_attributes = __slots__
+
+    def __init__(self, donor_id: int, recipiant_id: int, amount: int) -> None:
+        self.id = uuid.uuid4().hex
+        self.donor_id = donor_id
+        self.recipiant_id = recipiant_id
+        self.amount = amount
+
+
+class DonationEngine:
+    """
+    Donations happen in two phases, so no connection or row lock is held while the donor
+    is looking at the confirmation prompt:
+
+    1. `reserve` puts the amount on hold in memory, so concurrent donations from the same
+       donor or to the same recipiant can't promise more than is available
+    2. `commit` locks both pps in user ID order (so crossing donations can't deadlock) and
+       then debits, credits, registers the donation (with its hourly bucket and donor
+       total) and enforces the 24h limit in a single statement. The database has the
+       final say, the reservations only make the prompt honest.
+    """
+
+    DONATION_LIMIT = 100_000_000
+    RESERVATION_TIMEOUT = 30
+
+    reservations: dict[str, DonationReservation] = {}
+    reserved_by_donor: dict[int, int] = {}
+    reserved_for_recipiant: dict[int, int] = {}
+    timeouts = DeadlineScheduler()
+
+    @classmethod
+    def reserve(
+        cls,
+        donor_id: int,
+        recipiant_id: int,
+        amount: int,
+        *,
+        timeout: float = RESERVATION_TIMEOUT,
+    ) -> DonationReservation:
+        if donor_id == recipiant_id:
+            raise ValueError("Can't reserve a donation to oneself")
+
+        reservation = DonationReservation(donor_id, recipiant_id, amount)
+        cls.reservations[reservation.id] = reservation
+        cls.reserved_by_donor[donor_id] = (
+            cls.reserved_by_donor.get(donor_id, 0) + amount
+        )
+        cls.reserved_for_recipiant[recipiant_id] = (
+            cls.reserved_for_recipiant.get(recipiant_id, 0) + amount
+        )
+        cls.timeouts.schedule(reservation.id, timeout, lambda: cls.release(reservation))
+
+        return reservation
+
+    @classmethod
+    def release(cls, reservation: DonationReservation) -> bool:
+        """Returns whether the reservation was still being held"""
+        if cls.reservations.pop(reservation.id, None) is None:
+            return False
+
+        cls.timeouts.cancel(reservation.id)
+
+        for reserved, user_id in (
+            (cls.reserved_by_donor, reservation.donor_id),
+            (cls.reserved_for_recipiant, reservation.recipiant_id),
+        ):
+            remaining = reserved[user_id] - reservation.amount
+            if remaining:
+                reserved[user_id] = remaining
+            else:
+                del reserved[user_id]
+
+        return True
+
+    @classmethod
+    async def commit(
+        cls,
+        connection: asyncpg.Connection,
+        reservation: DonationReservation,
+        *,
+        timeout: float | None = 2,
+    ) -> DonationReceipt:
+        cls.release(reservation)
+
+        async with connection.transaction():
+            for user_id in sorted((reservation.donor_id, reservation.recipiant_id)):
+                try:
+                    await connection.execute(
+                        "SELECT 1 FROM pps WHERE user_id = $1 FOR UPDATE",
+                        user_id,
+                        timeout=timeout,
+                    )
+                except asyncio.TimeoutError:
+                    raise DonationFailed(
+                        DonationFailure.DONOR_BUSY
+                        if user_id == reservation.donor_id
+                        else DonationFailure.RECIPIANT_BUSY
+                    )
+
+            # Both rows are locked now, so this statement's snapshot includes every
+            # donation to the recipiant that was committed before us
+            record = await connection.fetchrow(
+                f"""
+                WITH received AS (
+                    SELECT COALESCE(sum(amount), 0) AS total_amount
+                    FROM {Donation.BUCKET_TABLE}
+                    WHERE recipiant_id = $2
+                    AND {Donation.BUCKET_WINDOW_SQL}
+                ),
+                debit AS (
+                    UPDATE pps
+                    SET pp_size = pp_size - $3, version = version + 1
+                    WHERE user_id = $1
+                    AND pp_size >= $3
+                    AND (SELECT total_amount FROM received) + $3 <= $4
+                    AND EXISTS (SELECT 1 FROM pps WHERE user_id = $2)
+                    RETURNING pp_size
+                ),
+                credit AS (
+                    UPDATE pps
+                    SET pp_size = pp_size + $3, version = version + 1
+                    WHERE user_id = $2
+                    AND EXISTS (SELECT 1 FROM debit)
+                    RETURNING pp_size
+                ),
+                donation AS (
+                    INSERT INTO {Donation._table} (recipiant_id, donor_id, amount)
+                    SELECT $2, $1, $3
+                    FROM credit
+                ),
+                bucket AS (
+                    INSERT INTO {Donation.BUCKET_TABLE} (recipiant_id, amount)
+                    SELECT $2, $3
+                    FROM credit
+                    ON CONFLICT (recipiant_id, timeframe)
+                    DO UPDATE SET amount = {Donation.BUCKET_TABLE}.amount + EXCLUDED.amount
+                ),
+                donor_total AS (
+                    INSERT INTO {Donation.DONOR_TOTALS_TABLE} (donor_id, total_amount)
+                    SELECT $1, $3
+                    FROM credit
+                    ON CONFLICT (donor_id)
+                    DO UPDATE SET total_amount = {Donation.DONOR_TOTALS_TABLE}.total_amount
+                        + EXCLUDED.total_amount
+                )
+                SELECT
+                    (SELECT pp_size FROM debit) AS donor_size,
+                    (SELECT pp_size FROM credit) AS recipiant_size,
+                    (SELECT pp_size FROM pps WHERE user_id = $1) AS previous_donor_size,
+                    EXISTS (SELECT 1 FROM pps WHERE user_id = $2) AS recipiant_exists
+                """,
+                reservation.donor_id,
+                reservation.recipiant_id,
+                reservation.amount,
+                cls.DONATION_LIMIT,
+                timeout=timeout,
+            )
+            assert record is not None
+
+            # Raising inside the transaction rolls back a debit without a credit, though
+            # that can't happen while both rows are locked
+            if record["recipiant_size"] is None:
+                if record["previous_donor_size"] is None:
+                    raise DonationFailed(DonationFailure.DONOR_MISSING)
+                if not record["recipiant_exists"]:
+                    raise DonationFailed(DonationFailure.RECIPIANT_MISSING)
+                if record["previous_donor_size"] < reservation.amount:
+                    raise DonationFailed(DonationFailure.NOT_BIG_ENOUGH)
+                raise DonationFailed(DonationFailure.LIMIT_REACHED)
+
+        for user_id in (reservation.donor_id, reservation.recipiant_id):
+            SnapshotCache.invalidate("pps", (user_id,))
+
+        return DonationReceipt(record["donor_size"], record["recipiant_size"])
+
+    @classmethod
+    def get_stats(cls) -> dict[str, int]:
+        return {
+            "reservations": len(cls.reservations),
+            "reserved_amount": sum(cls.reserved_by_donor.values()),
+        }
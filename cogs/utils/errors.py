@@ -19,6 +19,19 @@ class PpNotBigEnough(commands.CheckFailure):
     pass
 
 
+class DatabaseTimeout(commands.CheckFailure):
+    def __init__(
+        self,
+        message: str | None = None,
+        *args,
+        reason: str,
+        casino_id: str | None = None,
+    ) -> None:
+        super().__init__(message, *args)
+        self.reason = reason
+        self.casino_id = casino_id
+
+
 class InvalidArgumentAmount(commands.BadArgument):
     def __init__(
         self,
@@ -1,14 +1,15 @@
 from __future__ import annotations
 import enum
+import inspect
 import random
-from collections.abc import Mapping, Iterable
+from collections.abc import Awaitable, Callable, Mapping, Iterable
 from datetime import datetime, UTC
 from typing import Generic, TypeVar, Any, Literal, overload, cast, Self
 
 import asyncpg
 import discord
 
-from . import RED, BLUE, Bot
+from . import RED, BLUE, Bot, SnapshotCache
 
 _T_co = TypeVar("_T_co", covariant=True)
 
@@ -182,6 +183,13 @@ class DatabaseWrapperObject(Object):
     _column_attributes: dict[str, str] = {}
     _identifier_attributes: tuple[str, ...] = ()
     _trackers: tuple[str, ...] = ()
+    # Optional row version column, bumped on every update. Enables compare_and_swap
+    _version_column: str | None = None
+    # Whether fetch_cached may serve rows from SnapshotCache
+    _cacheable: bool = False
+
+    CAS_ATTEMPTS = 3
+    cas_stats: dict[str, dict[str, int]] = {}
 
     def _generate_pgsql_set_query(
         self, *, argument_position: int = 1
@@ -218,6 +226,16 @@ class DatabaseWrapperObject(Object):
             else None
         )
 
+    @classmethod
+    def _encode_value(cls, attribute: str, value: Any) -> Any:
+        """Converts an attribute's value into what's stored in its column"""
+        return value
+
+    @classmethod
+    def _decode_value(cls, column: str, value: Any) -> Any:
+        """Converts a column's stored value into its attribute's value"""
+        return value
+
     @classmethod
     def _generate_cls_pgsql_where_query(
         cls, required_values: dict[str, Any], *, argument_position: int = 1
@@ -227,7 +245,7 @@ class DatabaseWrapperObject(Object):
         query_arguments = []
 
         for required_column, required_value in required_values.items():
-            query_arguments.append(required_value)
+            query_arguments.append(cls._encode_value(required_column, required_value))
             conditional_values.append(
                 f"{cls._column_attributes[required_column]}=${argument_position}"
             )
@@ -249,7 +267,9 @@ class DatabaseWrapperObject(Object):
         query_arguments = []
 
         for required_attribute, required_value in required_values.items():
-            query_arguments.append(required_value)
+            query_arguments.append(
+                cls._encode_value(required_attribute, required_value)
+            )
             query_insert_parts.append(cls._column_attributes[required_attribute])
             query_value_parts.append(f"${argument_position}")
             argument_position += 1
@@ -270,7 +290,11 @@ class DatabaseWrapperObject(Object):
         query_arguments = []
 
         for identifier_attribute in self._identifier_attributes:
-            query_arguments.append(getattr(self, identifier_attribute))
+            query_arguments.append(
+                self._encode_value(
+                    identifier_attribute, getattr(self, identifier_attribute)
+                )
+            )
             sql_conditions.append(
                 f"{self._column_attributes[identifier_attribute]}=${argument_position}"
             )
@@ -291,7 +315,12 @@ class DatabaseWrapperObject(Object):
 
     @classmethod
     def from_record(cls: type[Self], record: Record) -> Self:
-        return cls(**{cls._columns[column]: value for column, value in record.items()})  # type: ignore
+        return cls(
+            **{
+                cls._columns[column]: cls._decode_value(column, value)
+                for column, value in record.items()
+            }
+        )  # type: ignore
 
     @overload
     @classmethod
@@ -433,6 +462,57 @@ class DatabaseWrapperObject(Object):
 
         return cls.from_record(record)
 
+    @classmethod
+    async def fetch_cached(
+        cls: type[Self],
+        connection: asyncpg.Connection,
+        required_values: dict[str, Any],
+        *,
+        timeout: float | None = None,
+        insert_if_not_found: bool = False,
+    ) -> Self:
+        """
+        Like `fetch`, but served from `SnapshotCache` when the table is cacheable and the
+        row is looked up by its identifier. For read-only paths, rows about to be written
+        should always be fetched with `fetch`
+        """
+        if not cls._cacheable or set(required_values) != set(
+            cls._identifier_attributes
+        ):
+            return await cls.fetch(
+                connection,
+                required_values,
+                timeout=timeout,
+                insert_if_not_found=insert_if_not_found,
+            )
+
+        key = tuple(
+            required_values[attribute] for attribute in cls._identifier_attributes
+        )
+        record = SnapshotCache.get(cls._table, key)
+
+        if record is None:
+            generation = SnapshotCache.generation
+            record = await cls.fetch_record(
+                connection,
+                required_values,
+                timeout=timeout,
+                insert_if_not_found=insert_if_not_found,
+            )
+            SnapshotCache.set(cls._table, key, record, generation=generation)
+
+        return cls.from_record(record)
+
+    def invalidate_cached(self) -> None:
+        if self._cacheable:
+            SnapshotCache.invalidate(
+                self._table,
+                tuple(
+                    getattr(self, attribute)
+                    for attribute in self._identifier_attributes
+                ),
+            )
+
     async def update(self, connection: asyncpg.Connection) -> None:
         set_query_result = self._generate_pgsql_set_query()
         if set_query_result is None:
@@ -441,8 +521,115 @@ class DatabaseWrapperObject(Object):
         where_query, where_arguments, _ = self._generate_pgsql_where_query(
             argument_position=argument_position
         )
-        query = f"UPDATE {self._table} {set_query} {where_query}"
-        await connection.execute(query, *set_arguments, *where_arguments)
+
+        if self._version_column is None:
+            query = f"UPDATE {self._table} {set_query} {where_query}"
+            await connection.execute(query, *set_arguments, *where_arguments)
+            self.invalidate_cached()
+            return
+
+        # Locked updates bump the version too, so they invalidate concurrent swaps
+        query = (
+            f"UPDATE {self._table} {set_query},"
+            f" {self._version_column}={self._version_column}+1"
+            f" {where_query} RETURNING {self._version_column}"
+        )
+        version = await connection.fetchval(query, *set_arguments, *where_arguments)
+        self.invalidate_cached()
+        if version is not None:
+            setattr(self, self._columns[self._version_column], version)
+
+    async def compare_and_swap(
+        self, connection: asyncpg.Connection, *, timeout: float | None = None
+    ) -> bool:
+        """
+        Like `update`, but only writes if the row is still at the version this object was
+        fetched with. Returns whether it did
+        """
+        if self._version_column is None:
+            raise TypeError(f"{type(self).__name__} has no version column")
+
+        set_query_result = self._generate_pgsql_set_query()
+        if set_query_result is None:
+            return True
+        set_query, set_arguments, argument_position = set_query_result
+        where_query, where_arguments, argument_position = (
+            self._generate_pgsql_where_query(argument_position=argument_position)
+        )
+        version_attribute = self._columns[self._version_column]
+
+        query = (
+            f"UPDATE {self._table} {set_query},"
+            f" {self._version_column}={self._version_column}+1"
+            f" {where_query} AND {self._version_column}=${argument_position}"
+            f" RETURNING {self._version_column}"
+        )
+        version = await connection.fetchval(
+            query,
+            *set_arguments,
+            *where_arguments,
+            getattr(self, version_attribute),
+            timeout=timeout,
+        )
+
+        if version is None:
+            return False
+
+        self.invalidate_cached()
+        setattr(self, version_attribute, version)
+        return True
+
+    @classmethod
+    async def fetch_and_update(
+        cls: type[Self],
+        connection: asyncpg.Connection,
+        required_values: dict[str, Any],
+        modify: Callable[[Self], Awaitable[None] | None],
+        *,
+        attempts: int | None = None,
+        timeout: float | None = None,
+    ) -> Self:
+        """
+        Read-modify-write without holding a row lock while `modify` runs: fetches the row,
+        applies `modify` and writes it back with `compare_and_swap`, refetching and trying
+        again if someone else wrote first. After `attempts` conflicts it falls back to a
+        `FOR UPDATE` fetch, so contention costs retries instead of failed commands.
+        `modify` may be called more than once and should only change the object.
+        """
+        stats = cls.cas_stats.setdefault(
+            cls._table, {"swaps": 0, "retries": 0, "fallbacks": 0}
+        )
+
+        for _ in range(cls.CAS_ATTEMPTS if attempts is None else attempts):
+            instance = await cls.fetch(connection, required_values, timeout=timeout)
+
+            result = modify(instance)
+            if inspect.isawaitable(result):
+                await result
+
+            if await instance.compare_and_swap(connection, timeout=timeout):
+                stats["swaps"] += 1
+                return instance
+
+            stats["retries"] += 1
+
+        stats["fallbacks"] += 1
+
+        async with connection.transaction():
+            instance = await cls.fetch(
+                connection,
+                required_values,
+                lock=RowLevelLockMode.FOR_UPDATE,
+                timeout=timeout,
+            )
+
+            result = modify(instance)
+            if inspect.isawaitable(result):
+                await result
+
+            await instance.update(connection)
+
+        return instance
 
 
 class DifferenceTracker(Object, Generic[_T_co]):
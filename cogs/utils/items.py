@@ -3,7 +3,6 @@ import asyncpg
 import logging
 import re
 from datetime import timedelta
-from functools import cached_property
 from typing import Any, Literal, Self
 from string import ascii_letters, digits
 
@@ -19,6 +18,7 @@ from . import (
     format_slash_command,
     format_amount,
     Article,
+    SnapshotCache,
 )
 
 
@@ -274,24 +274,41 @@ class InventoryItem(DatabaseWrapperObject):
     __slots__ = ("user_id", "id", "amount")
     _repr_attributes = __slots__ + ("item",)
     _table = "inventories"
+    # Item ids are stored as their SMALLINT item number, see ItemManager.load_catalogue
     _columns = {
         "user_id": "user_id",
-        "item_id": "id",
+        "item_number": "id",
         "item_amount": "amount",
     }
     _column_attributes = {attribute: column for column, attribute in _columns.items()}
     _identifier_attributes = ("user_id", "id")
     _trackers = ("amount",)
 
+    # Tool bitmaps are invalidated along with the inventories row NOTIFYs, and so are
+    # the cached profiles built from inventories
+    TOOL_BITMAP_TABLE = "inventories"
+
     def __init__(self, user_id: int, id: str, amount: int) -> None:
         self.user_id = user_id
         self.id = id
         self.amount = DifferenceTracker(amount, column="item_amount")
 
-    @cached_property
+    @property
     def item(self) -> Item:
         return ItemManager.get(self.id, possible_legacy=True)
 
+    @classmethod
+    def _encode_value(cls, attribute: str, value: Any) -> Any:
+        if attribute == "id":
+            return ItemManager.get_item_number(value)
+        return value
+
+    @classmethod
+    def _decode_value(cls, column: str, value: Any) -> Any:
+        if column == "item_number":
+            return ItemManager.get_item_id(value)
+        return value
+
     def format_item(
         self,
         *,
@@ -316,64 +333,125 @@ class InventoryItem(DatabaseWrapperObject):
         if ensure_difference and self.amount.difference is None:
             return
 
+        SnapshotCache.invalidate(self.TOOL_BITMAP_TABLE, (self.user_id,))
+
+        item_number = ItemManager.get_item_number(self.id)
+
         if not self.amount.value and not additional:
             await connection.execute(
-                "DELETE FROM inventories WHERE user_id=$1 AND item_id=$2",
+                "DELETE FROM inventories WHERE user_id=$1 AND item_number=$2",
                 self.user_id,
-                self.id,
+                item_number,
             )
             return
 
         await connection.execute(
             f"""
-            INSERT INTO inventories
+            INSERT INTO inventories (user_id, item_number, item_amount)
             VALUES ($1, $2, $3)
-            ON CONFLICT (user_id, item_id)
+            ON CONFLICT (user_id, item_number)
             DO UPDATE SET item_amount={'inventories.item_amount+' if additional else ''}$3
             """,
             self.user_id,
-            self.id,
+            item_number,
             self.amount.value,
         )
 
     @staticmethod
-    async def user_has_item(
-        connection: asyncpg.Connection, user_id: int, *item_ids: str, any: bool = True
-    ) -> bool:
+    async def fetch_owned_item_ids(
+        connection: asyncpg.Connection,
+        user_id: int,
+        *item_ids: str,
+        timeout: float | None = None,
+    ) -> set[str]:
+        """Returns which of the given items the user has at least one of, in one query"""
         if not item_ids:
             raise ValueError("No item ID(s) given")
 
+        # Items that were never interned can't be in anyone's inventory
+        item_numbers = [
+            ItemManager.item_numbers[item_id]
+            for item_id in item_ids
+            if item_id in ItemManager.item_numbers
+        ]
+        if not item_numbers:
+            return set()
+
+        records = await connection.fetch(
+            """
+            SELECT item_number
+            FROM inventories
+            WHERE
+                user_id = $1
+                AND item_number = ANY($2::SMALLINT[])
+                AND item_amount > 0
+            """,
+            user_id,
+            item_numbers,
+            timeout=timeout,
+        )
+        return {ItemManager.get_item_id(record["item_number"]) for record in records}
+
+    @classmethod
+    async def user_has_item(
+        cls,
+        connection: asyncpg.Connection,
+        user_id: int,
+        *item_ids: str,
+        any: bool = True,
+    ) -> bool:
+        """With `any=False`, the user needs every one of the items"""
+        owned_item_ids = await cls.fetch_owned_item_ids(connection, user_id, *item_ids)
+
         if any:
-            return bool(
-                await connection.fetchval(
-                    f"""
-                    SELECT 1
-                    FROM inventories
-                    WHERE
-                        user_id = $1
-                        AND item_id IN ({", ".join(f"${n + 2}" for n in range(len(item_ids)))})
-                        AND item_amount > 0
-                    """,
-                    user_id,
-                    *item_ids,
-                )
-            )
-        for item_id in item_ids:
-            if await connection.fetchval(
-                f"""
-                SELECT 1
-                FROM inventories
-                WHERE
-                    user_id = $1
-                    AND item_id = $2
-                    AND item_amount > 0
-                """,
-                user_id,
-                item_id,
-            ):
-                return True
+            return bool(owned_item_ids)
+        return owned_item_ids == set(item_ids)
+
+    @classmethod
+    async def fetch_tool_bitmap(
+        cls, connection: asyncpg.Connection, user_id: int
+    ) -> int:
+        """
+        Returns the user's tools as a bitmap of `ItemManager.tool_bits`. Cached in
+        SnapshotCache until their inventory changes or the items are reloaded
+        """
+        key = (user_id,)
+        cached = SnapshotCache.get(cls.TOOL_BITMAP_TABLE, key, ignore_strict=True)
+
+        if cached is not None:
+            snapshot_version, bitmap = cached
+            if snapshot_version == ItemManager.snapshot_version:
+                return bitmap
+
+        if not ItemManager.tools:
+            return 0
+
+        generation = SnapshotCache.generation
+        snapshot_version = ItemManager.snapshot_version
+        tool_bits = ItemManager.tool_bits
+
+        bitmap = 0
+        for item_id in await cls.fetch_owned_item_ids(
+            connection, user_id, *ItemManager.tools
+        ):
+            bitmap |= tool_bits[item_id]
+
+        SnapshotCache.set(
+            cls.TOOL_BITMAP_TABLE,
+            key,
+            (snapshot_version, bitmap),
+            generation=generation,
+        )
+        return bitmap
 
-        return False
+    @classmethod
+    async def user_has_tool(
+        cls, connection: asyncpg.Connection, user_id: int, tool: ToolItem
+    ) -> bool:
+        return bool(
+            await cls.fetch_tool_bitmap(connection, user_id)
+            & ItemManager.tool_bits[tool.id]
+        )
 
 
 class ItemManager:
@@ -382,8 +460,16 @@ class ItemManager:
     multipliers: dict[str, MultiplierItem] = {}
     buffs: dict[str, BuffItem] = {}
     tools: dict[str, ToolItem] = {}
+    # One bit per tool, see InventoryItem.fetch_tool_bitmap
+    tool_bits: dict[str, int] = {}
     useless: dict[str, UselessItem] = {}
     items_by_name: dict[str, Item] = {}
+    # The item_catalogue table, which interns item ids as SMALLINTs. It only ever grows,
+    # so it outlives item reloads
+    item_numbers: dict[str, int] = {}
+    item_ids_by_number: dict[int, str] = {}
+    ITEMS_PATH = "config/items.toml"
+    snapshot_version = 0
     _MATCH_SLASH_COMMANDS_PATTERN = re.compile(r"<\/[A-z](?:[A-z]|[0-9]|-|\s)*>")
     _logger = logging.getLogger("vbu.bot.cog.utils.ItemManager")
 
@@ -444,6 +530,59 @@ class ItemManager:
 
         return item
 
+    @classmethod
+    def get_item_number(cls, item_id: str) -> int:
+        try:
+            return cls.item_numbers[item_id]
+        except KeyError:
+            raise UnknownItemError(f"{item_id!r} isn't in the item catalogue")
+
+    @classmethod
+    def get_item_id(cls, item_number: int) -> str:
+        try:
+            return cls.item_ids_by_number[item_number]
+        except KeyError:
+            raise UnknownItemError(
+                f"Item number {item_number} isn't in the item catalogue"
+            )
+
+    @classmethod
+    async def load_catalogue(cls, connection: asyncpg.Connection) -> None:
+        """
+        Interns every loaded item that isn't in the item catalogue yet and loads the
+        whole catalogue. Has to run before inventories are touched, and again after
+        items are reloaded
+        """
+        records = await connection.fetch("SELECT * FROM item_catalogue")
+        known_item_ids = {record["item_id"] for record in records}
+        missing_item_ids = [
+            item_id for item_id in cls.items if item_id not in known_item_ids
+        ]
+
+        if missing_item_ids:
+            # Only inserting ids which are actually missing, as conflicting inserts
+            # still use up numbers from the identity
+            await connection.execute(
+                """
+                INSERT INTO item_catalogue (item_id)
+                SELECT new.item_id
+                FROM unnest($1::TEXT[]) AS new (item_id)
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM item_catalogue WHERE item_catalogue.item_id = new.item_id
+                )
+                ON CONFLICT (item_id) DO NOTHING
+                """,
+                missing_item_ids,
+            )
+            records = await connection.fetch("SELECT * FROM item_catalogue")
+
+        item_numbers = {record["item_id"]: record["item_number"] for record in records}
+        cls.item_numbers = item_numbers
+        cls.item_ids_by_number = {
+            item_number: item_id for item_id, item_number in item_numbers.items()
+        }
+        cls._logger.info(f" * Loaded {len(item_numbers)} interned item ids")
+
     @classmethod
     def get_command_tool(cls, command_name: str) -> ToolItem:
         tools = [
@@ -477,6 +616,7 @@ class ItemManager:
 
             elif isinstance(item, ToolItem):
                 cls.tools[item.id] = item
+                cls.tool_bits.setdefault(item.id, 1 << len(cls.tool_bits))
 
             else:
                 cls.useless[item.id] = item
@@ -507,10 +647,31 @@ class ItemManager:
 
     @classmethod
     def load(cls) -> None:
-        item_data: dict[str, dict[str, dict[str, Any]]] = toml.load("config/items.toml")
+        cls.apply(cls.parse())
 
-        # Store the new items in a temporary list to avoid having an extended period of time where
-        # the self.items list is empty. This should make the transition nearly instant
+    @classmethod
+    def get_paths(cls) -> list[str]:
+        return [cls.ITEMS_PATH]
+
+    @classmethod
+    def apply(cls, new_items: list[Item]) -> None:
+        # Swap in fresh mappings instead of clearing the current ones, so anything still
+        # holding on to the previous mappings keeps seeing a complete set of items
+        cls.items = {}
+        cls.items_by_name = {}
+        cls.seasonal = {}
+        cls.multipliers = {}
+        cls.buffs = {}
+        cls.tools = {}
+        cls.tool_bits = {}
+        cls.useless = {}
+        cls.add(*new_items)
+        cls.snapshot_version += 1
+
+    @classmethod
+    def parse(cls) -> list[Item]:
+        """Doesn't touch any of the manager's state, so it's safe to run off-thread"""
+        item_data: dict[str, dict[str, dict[str, Any]]] = toml.load(cls.ITEMS_PATH)
         new_items: list[Item] = []
 
         for item_id, item in item_data["seasonal"].items():
@@ -571,8 +732,7 @@ class ItemManager:
             new_items.append(new_item)
             cls._logger.info(f" * Loaded useless item {new_item.id!r}")
 
-        cls.items.clear()
-        cls.add(*new_items)
+        return new_items
 
 
 class MissingTool(commands.CheckFailure):
@@ -0,0 +1,335 @@
+from __future__ import annotations
+import bisect
+import heapq
+import itertools
+from array import array
+from collections.abc import Iterable, Mapping
+from datetime import datetime
+from typing import Any, Self
+
+import asyncpg
+
+from . import Object, Pp
+
+
+class LeaderboardSnapshot(Object):
+    """
+    A ranked leaderboard stored as parallel typed arrays, 28 bytes per user instead of
+    a `Pp`, a dict entry and a list entry each. `user_ids` and `values` are in rank order
+    (position 1 at index 0). Ranks are looked up through a copy of the user ids sorted by
+    id, with the matching positions alongside. Building that copy takes another 12 bytes
+    per user until it's done, see `_build_index`. Only the podium is kept as `Pp`s.
+    Snapshots are immutable, each gets a new `version`.
+    """
+
+    __slots__ = (
+        "version",
+        "user_ids",
+        "values",
+        "podium",
+        "_sorted_user_ids",
+        "_positions",
+    )
+    _repr_attributes = ("version", "size")
+    _versions = itertools.count(1)
+
+    PODIUM_SIZE = 10
+    # Rows fetched from the cursor at a time by `stream`
+    CHUNK_SIZE = 10_000
+    # User ids sorted at a time by `_build_index`
+    INDEX_RUN_SIZE = 100_000
+
+    def __init__(
+        self, user_ids: array[int], values: array[int], podium: list[Pp]
+    ) -> None:
+        self.version = next(self._versions)
+        self.user_ids = user_ids
+        self.values = values
+        self.podium = podium
+        self._sorted_user_ids, self._positions = self._build_index(user_ids)
+
+    @classmethod
+    def _build_index(cls, user_ids: array[int]) -> tuple[array[int], array[int]]:
+        """
+        Returns `(sorted_user_ids: array[int], positions: array[int])`. Sorting every user
+        id at once would hold a Python int and a key per user, around 88 bytes each, so
+        they're sorted in runs of `INDEX_RUN_SIZE` and merged into the arrays after. The
+        runs take another 12 bytes per user until the merge is done
+        """
+        runs: list[tuple[array[int], array[int]]] = []
+
+        for start in range(0, len(user_ids), cls.INDEX_RUN_SIZE):
+            order = sorted(
+                range(start, min(start + cls.INDEX_RUN_SIZE, len(user_ids))),
+                key=user_ids.__getitem__,
+            )
+            runs.append(
+                (
+                    array("q", (user_ids[index] for index in order)),
+                    array("i", (index + 1 for index in order)),
+                )
+            )
+
+        if len(runs) == 1:
+            return runs[0]
+
+        sorted_user_ids = array("q")
+        positions = array("i")
+
+        for user_id, position in heapq.merge(*(zip(*run) for run in runs)):
+            sorted_user_ids.append(user_id)
+            positions.append(position)
+
+        return sorted_user_ids, positions
+
+    @property
+    def size(self) -> int:
+        return len(self.user_ids)
+
+    @classmethod
+    def empty(cls) -> Self:
+        return cls(array("q"), array("q"), [])
+
+    @classmethod
+    def from_records(
+        cls, records: Iterable[Mapping[str, Any]], *, podium_size: int = PODIUM_SIZE
+    ) -> Self:
+        """
+        `records` need to be ranked already, each with a `user_id` and `value`. The first
+        `podium_size` need every pps column too
+        """
+        user_ids = array("q")
+        values = array("q")
+        podium: list[Pp] = []
+
+        for record in records:
+            user_ids.append(record["user_id"])
+            values.append(record["value"])
+
+            if len(podium) < podium_size:
+                podium.append(
+                    Pp.from_record(
+                        {column: record[column] for column in Pp._columns}  # type: ignore
+                    )
+                )
+
+        return cls(user_ids, values, podium)
+
+    @classmethod
+    async def stream(
+        cls,
+        connection: asyncpg.Connection,
+        query: str,
+        *args: Any,
+        chunk_size: int | None = None,
+        podium_size: int = PODIUM_SIZE,
+    ) -> Self:
+        """
+        Builds a snapshot from `query`, which has to select ranked `user_id`s and their
+        `value` (in that order), through a server-side cursor. At most `chunk_size`
+        records are held at a time. The rest of the peak is the snapshot and its index
+        being built, 40 bytes per user (see `_build_index`)
+        """
+        user_ids = array("q")
+        values = array("q")
+
+        # Repeatable read, so the podium is fetched from the same snapshot as the ranks
+        async with connection.transaction(isolation="repeatable_read", readonly=True):
+            cursor = await connection.cursor(query, *args)
+
+            while records := await cursor.fetch(chunk_size or cls.CHUNK_SIZE):
+                user_ids.extend(record[0] for record in records)
+                values.extend(record[1] for record in records)
+
+            podium_user_ids = user_ids[:podium_size]
+            pps = await cls._fetch_pps(connection, podium_user_ids)
+            podium = [pps[user_id] for user_id in podium_user_ids]
+
+        return cls(user_ids, values, podium)
+
+    @staticmethod
+    async def _fetch_pps(
+        connection: asyncpg.Connection, user_ids: array[int]
+    ) -> dict[int, Pp]:
+        records = await connection.fetch(
+            f"SELECT * FROM {Pp._table} WHERE user_id = ANY($1::BIGINT[])",
+            list(user_ids),
+        )
+        return {record["user_id"]: Pp.from_record(record) for record in records}
+
+    async def fetch_page(
+        self, connection: asyncpg.Connection, start: int, size: int
+    ) -> list[tuple[int, int, Pp]]:
+        """
+        Returns `[(position: int, value: int, pp: Pp), ...]` from position `start`
+        onwards. The positions are a slice of the arrays, so every page costs the same:
+        nothing for the podium, a primary key lookup of `size` pps anywhere else. Pps
+        deleted since the snapshot was taken are left out
+        """
+        end = min(start + size, self.size + 1)
+
+        if end - 1 <= len(self.podium):
+            return [
+                (position, self.get_value(position), self.podium[position - 1])
+                for position in range(start, end)
+            ]
+
+        user_ids = self.user_ids[start - 1 : end - 1]
+        pps = await self._fetch_pps(connection, user_ids)
+
+        return [
+            (position, self.get_value(position), pps[user_id])
+            for position, user_id in enumerate(user_ids, start=start)
+            if user_id in pps
+        ]
+
+    def get_position(self, user_id: int) -> int | None:
+        index = bisect.bisect_left(self._sorted_user_ids, user_id)
+
+        if (
+            index < len(self._sorted_user_ids)
+            and self._sorted_user_ids[index] == user_id
+        ):
+            return self._positions[index]
+
+        return None
+
+    def get_value(self, position: int) -> int:
+        return self.values[position - 1]
+
+    def get_overtake_difference(self, position: int) -> int:
+        """How far behind the position is from the one above it"""
+        if position == 1:
+            return 0
+
+        return self.values[position - 2] - self.values[position - 1]
+
+
+class RankView(Object):
+    """
+    A leaderboard kept by the database instead of the bot: a materialized view of
+    `(user_id, value, rank)` with unique indexes on `user_id` and `rank` (see
+    config/database.pgsql). Positions are point lookups and pages are range scans of the
+    rank index, so every bot process reads the same ranks and only holds the view's
+    `size`. Used instead of a `LeaderboardSnapshot` when `ENABLED`.
+    """
+
+    __slots__ = ("name", "version", "size", "refreshed_at")
+    _repr_attributes = __slots__
+
+    ENABLED = False
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        # Shares the snapshots' counter, so a version never means two different things
+        self.version = next(LeaderboardSnapshot._versions)
+        self.size = 0
+        self.refreshed_at: datetime | None = None
+
+    async def refresh(self, connection: asyncpg.Connection) -> bool:
+        """
+        Rebuilds the view with `REFRESH MATERIALIZED VIEW CONCURRENTLY`, which doesn't
+        block readers. Only one process refreshes a view at a time, the others skip it.
+        Every process picks up the new size and `version` once a refresh is committed,
+        going by `rank_view_refreshes`, and keeps its version (and the pages rendered
+        for it) until then. Returns whether this one refreshed it
+        """
+        refreshed = await connection.fetchval(
+            "SELECT pg_try_advisory_lock(hashtext($1))", self.name
+        )
+
+        if refreshed:
+            try:
+                async with connection.transaction():
+                    await connection.execute(
+                        f"REFRESH MATERIALIZED VIEW CONCURRENTLY {self.name}"
+                    )
+                    await connection.execute(
+                        """
+                        INSERT INTO rank_view_refreshes (view_name)
+                        VALUES ($1)
+                        ON CONFLICT (view_name)
+                        DO UPDATE SET refreshed_at = EXCLUDED.refreshed_at
+                        """,
+                        self.name,
+                    )
+            finally:
+                await connection.execute(
+                    "SELECT pg_advisory_unlock(hashtext($1))", self.name
+                )
+
+        record = await connection.fetchrow(
+            f"""
+            SELECT
+                (
+                    SELECT refreshed_at
+                    FROM rank_view_refreshes
+                    WHERE view_name = $1
+                ) AS refreshed_at,
+                (SELECT COALESCE(max(rank), 0) FROM {self.name}) AS size
+            """,
+            self.name,
+        )
+
+        if (
+            record["refreshed_at"] is not None
+            and record["refreshed_at"] == self.refreshed_at
+        ):
+            return refreshed
+
+        self.refreshed_at = record["refreshed_at"]
+        self.size = record["size"]
+        self.version = next(LeaderboardSnapshot._versions)
+
+        return refreshed
+
+    async def fetch_standing(
+        self, connection: asyncpg.Connection, user_id: int
+    ) -> tuple[int, int] | None:
+        """Returns `(position: int, overtake_difference: int)`"""
+        record = await connection.fetchrow(
+            f"""
+            SELECT
+                ranks.rank,
+                COALESCE(above.value - ranks.value, 0) AS overtake_difference
+            FROM {self.name} AS ranks
+            LEFT JOIN {self.name} AS above
+                ON above.rank = ranks.rank - 1
+            WHERE ranks.user_id = $1
+            """,
+            user_id,
+        )
+
+        if record is None:
+            return None
+
+        return record["rank"], record["overtake_difference"]
+
+    async def fetch_page(
+        self, connection: asyncpg.Connection, start: int, size: int
+    ) -> list[tuple[int, int, Pp]]:
+        """
+        Returns `[(position: int, value: int, pp: Pp), ...]` from position `start`
+        onwards, like `LeaderboardSnapshot.fetch_page`
+        """
+        records = await connection.fetch(
+            f"""
+            SELECT {Pp._table}.*, ranks.rank, ranks.value
+            FROM {self.name} AS ranks
+            JOIN {Pp._table}
+                ON {Pp._table}.user_id = ranks.user_id
+            WHERE ranks.rank BETWEEN $1 AND $2
+            ORDER BY ranks.rank
+            """,
+            start,
+            start + size - 1,
+        )
+        page: list[tuple[int, int, Pp]] = []
+
+        for record in records:
+            columns = dict(record)
+            position = columns.pop("rank")
+            value = columns.pop("value")
+            page.append((position, value, Pp.from_record(columns)))  # type: ignore
+
+        return page
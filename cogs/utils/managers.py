@@ -1,38 +1,69 @@
 from __future__ import annotations
 import asyncio
+import contextlib
+import json
 import logging
+import math
 import random
-from collections.abc import Callable
-from typing import TypedDict
+import statistics
+import time
+import uuid
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+from typing import Self, TypedDict
 
 import discord
 import toml
-from discord.ext import commands
+from discord.ext import commands, vbu
 
-from . import InteractionChannel, MEME_URL, Bot, Object
+from . import (
+    InteractionChannel,
+    MEME_URL,
+    Bot,
+    Object,
+    DeadlineScheduler,
+    DatabaseTimeout,
+)
 
 
 class DuplicateReplyListenerError(Exception):
     pass
 
 
+class ReplyListener(Object):
+    __slots__ = ("future", "check")
+    _repr_attributes = __slots__
+
+    def __init__(
+        self,
+        check: Callable[[commands.SlashContext[Bot], str], bool],
+    ) -> None:
+        self.future: asyncio.Future[tuple[commands.SlashContext[Bot], str]] = (
+            asyncio.get_running_loop().create_future()
+        )
+        self.check = check
+
+    def expire(self) -> None:
+        if not self.future.done():
+            self.future.set_exception(asyncio.TimeoutError())
+
+
 class ReplyManager:
-    """See further implementation in /cogs/reply_command.py"""
+    """
+    Routes replies by `(channel_id, user_id)`, so any number of users can wait for a reply in
+    the same channel. See further implementation in /cogs/reply_command.py
+    """
 
     DEFAULT_TIMEOUT = 30
 
-    active_listeners: dict[
-        InteractionChannel | discord.Member | discord.User,
-        tuple[
-            asyncio.Future[tuple[commands.SlashContext[Bot], str]],
-            Callable[[commands.SlashContext[Bot], str], bool],
-        ],
-    ] = {}
+    active_listeners: dict[tuple[int, int], ReplyListener] = {}
+    timeouts = DeadlineScheduler()
 
     @classmethod
     async def wait_for_reply(
         cls,
         channel: InteractionChannel | discord.Member | discord.User,
+        user: discord.Member | discord.User,
         *,
         check: Callable[
             [commands.SlashContext[Bot], str], bool
@@ -40,31 +71,117 @@ class ReplyManager:
         timeout: float = DEFAULT_TIMEOUT,
     ) -> tuple[commands.SlashContext[Bot], str]:
         """Returns `(ctx: commands.SlashContext[Bot], reply: str)`"""
-        if channel in cls.active_listeners:
-            raise DuplicateReplyListenerError(repr(channel))
+        key = (channel.id, user.id)
 
-        future: asyncio.Future[tuple[commands.SlashContext[Bot], str]] = (
-            asyncio.Future()
-        )
-        cls.active_listeners[channel] = (future, check)
+        if key in cls.active_listeners:
+            raise DuplicateReplyListenerError(repr(key))
+
+        listener = ReplyListener(check)
+        cls.active_listeners[key] = listener
+        cls.timeouts.schedule(key, timeout, listener.expire)
 
         try:
-            result = await asyncio.wait_for(future, timeout=timeout)
-            return result
+            return await listener.future
         finally:
-            cls.active_listeners.pop(channel)
+            cls.timeouts.cancel(key)
+            if cls.active_listeners.get(key) is listener:
+                del cls.active_listeners[key]
+
+    @classmethod
+    def get_listener(cls, channel_id: int, user_id: int) -> ReplyListener | None:
+        return cls.active_listeners.get((channel_id, user_id))
+
+    @classmethod
+    def resolve(cls, ctx: commands.SlashContext[Bot], reply: str) -> bool:
+        """Returns whether the reply resolved a listener"""
+        assert ctx.channel is not None
+        listener = cls.get_listener(ctx.channel.id, ctx.author.id)
+
+        if listener is None or listener.future.done() or not listener.check(ctx, reply):
+            return False
+
+        listener.future.set_result((ctx, reply))
+        return True
+
+    @classmethod
+    def get_stats(cls) -> dict[str, int]:
+        return {
+            "channels": len({channel_id for channel_id, _ in cls.active_listeners}),
+            "listeners": len(cls.active_listeners),
+            "scheduled_timeouts": cls.timeouts.size,
+        }
+
+
+class DatabaseTimeoutReason(Object):
+    __slots__ = ("id", "user_id", "reason", "casino_id", "created_at", "expires_at")
+    _repr_attributes = __slots__
+
+    def __init__(
+        self,
+        user_id: int,
+        reason: str,
+        *,
+        casino_id: str | None = None,
+        ttl: float,
+        id: str | None = None,
+        created_at: float | None = None,
+    ) -> None:
+        self.id = uuid.uuid4().hex if id is None else id
+        self.user_id = user_id
+        self.reason = reason
+        self.casino_id = casino_id
+        self.created_at = time.time() if created_at is None else created_at
+        self.expires_at = self.created_at + ttl
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "reason": self.reason,
+                "casino_id": self.casino_id,
+                "created_at": self.created_at,
+                "expires_at": self.expires_at,
+            }
+        )
+
+    @classmethod
+    def from_json(cls, user_id: int, id: str, data: str) -> Self:
+        parsed = json.loads(data)
+        return cls(
+            user_id,
+            parsed["reason"],
+            casino_id=parsed["casino_id"],
+            ttl=parsed["expires_at"] - parsed["created_at"],
+            id=id,
+            created_at=parsed["created_at"],
+        )
 
 
 class DatabaseTimeoutManager:
+    """
+    Remembers why users are busy, so whatever they get locked out of can tell them. Every
+    reason expires after its TTL and the store holds at most `MAX_REASONS`, evicting the
+    oldest, so nothing piles up if a context manager never exits. With `MIRROR_TO_REDIS`
+    set, reasons are mirrored to a Redis hash per user (expiring with its newest reason),
+    so other bot processes can tell the user why, casino button included.
+    """
+
     DEFAULT_REASON = ("You're busy doing something else right now!", None)
-    REASONS: dict[int, list[tuple[str, str | None]]] = {}
+    DEFAULT_TTL = 60 * 60
+    MAX_REASONS = 10_000
+    MIRROR_TO_REDIS = False
+
+    # Oldest first, per user
+    REASONS: dict[int, dict[str, DatabaseTimeoutReason]] = {}
+    _reasons: dict[str, DatabaseTimeoutReason] = {}
+    expiries = DeadlineScheduler()
+    counters = {"added": 0, "expired": 0, "evicted": 0, "mirror_errors": 0}
+    _logger = logging.getLogger("vbu.bot.cog.utils.DatabaseTimeoutManager")
 
     @classmethod
     def get_reason(cls, user_id: int) -> tuple[str, str | None]:
-        try:
-            return cls.REASONS.get(user_id, [cls.DEFAULT_REASON])[0]
-        except IndexError:
-            return cls.DEFAULT_REASON
+        for reason in cls.REASONS.get(user_id, {}).values():
+            return reason.reason, reason.casino_id
+        return cls.DEFAULT_REASON
 
     @classmethod
     def get_notification(cls, user_id: int) -> tuple[str, str | None]:
@@ -72,112 +189,532 @@ class DatabaseTimeoutManager:
         return f"{reason} Try again later.", casino_id
 
     @classmethod
-    def add_notification(
-        cls, user_id: int, notification: str, casino_id: str | None = None
-    ) -> None:
-        try:
-            cls.REASONS[user_id].append((notification, casino_id))
-        except KeyError:
-            cls.REASONS[user_id] = [(notification, casino_id)]
+    def get_error(cls, user_id: int) -> DatabaseTimeout:
+        reason, casino_id = cls.get_reason(user_id)
+        return DatabaseTimeout(
+            f"{reason} Try again later.", reason=reason, casino_id=casino_id
+        )
 
     @classmethod
-    def clear_notification(cls, user_id: int, *, index: int = 0) -> None:
+    async def fetch_error(cls, user_id: int) -> DatabaseTimeout:
+        """
+        Like `get_error`, but with the Redis mirror the oldest reason across every process
+        wins, since that's whatever is actually holding the user up
+        """
+        if not cls.MIRROR_TO_REDIS:
+            return cls.get_error(user_id)
+
         try:
-            cls.REASONS[user_id].pop(index)
-        except KeyError:
-            pass
+            mirrored_reasons = await cls.fetch_mirrored_reasons(user_id)
+        except Exception as error:
+            cls.counters["mirror_errors"] += 1
+            cls._logger.error(f"Fetching the reasons of {user_id} failed: {error}")
+            mirrored_reasons = []
+
+        reasons = {reason.id: reason for reason in mirrored_reasons}
+        reasons.update(cls.REASONS.get(user_id, {}))
+
+        if not reasons:
+            return cls.get_error(user_id)
+
+        reason = min(reasons.values(), key=lambda reason: reason.created_at)
+        return DatabaseTimeout(
+            f"{reason.reason} Try again later.",
+            reason=reason.reason,
+            casino_id=reason.casino_id,
+        )
+
+    @classmethod
+    def add_notification(
+        cls,
+        user_id: int,
+        notification: str,
+        casino_id: str | None = None,
+        *,
+        ttl: float | None = None,
+    ) -> DatabaseTimeoutReason:
+        reason = DatabaseTimeoutReason(
+            user_id,
+            notification,
+            casino_id=casino_id,
+            ttl=cls.DEFAULT_TTL if ttl is None else ttl,
+        )
+
+        while len(cls._reasons) >= cls.MAX_REASONS:
+            cls.clear_notification(next(iter(cls._reasons.values())))
+            cls.counters["evicted"] += 1
+
+        cls.REASONS.setdefault(user_id, {})[reason.id] = reason
+        cls._reasons[reason.id] = reason
+        cls.expiries.schedule(
+            reason.id,
+            reason.expires_at - reason.created_at,
+            lambda: cls._expire(reason),
+        )
+        cls.counters["added"] += 1
+
+        return reason
+
+    @classmethod
+    def clear_notification(cls, reason: DatabaseTimeoutReason) -> None:
+        cls.expiries.cancel(reason.id)
+        cls._reasons.pop(reason.id, None)
+
+        user_reasons = cls.REASONS.get(reason.user_id)
+        if user_reasons is None:
+            return
+
+        user_reasons.pop(reason.id, None)
+        if not user_reasons:
+            del cls.REASONS[reason.user_id]
+
+    @classmethod
+    def _expire(cls, reason: DatabaseTimeoutReason) -> None:
+        cls.counters["expired"] += 1
+        cls.clear_notification(reason)
+
+    @staticmethod
+    def _redis_key(user_id: int) -> str:
+        return f"database-timeouts:{user_id}"
+
+    @classmethod
+    async def mirror(cls, reason: DatabaseTimeoutReason) -> None:
+        async with vbu.Redis() as redis:
+            assert redis.pool is not None
+            key = cls._redis_key(reason.user_id)
+            await redis.pool.hset(key, reason.id, reason.to_json())
+            # Never shorten the expiry another reason of the user still needs
+            ttl = math.ceil(reason.expires_at - time.time())
+            if await redis.pool.ttl(key) < ttl:
+                await redis.pool.expire(key, ttl)
+
+    @classmethod
+    async def unmirror(cls, reason: DatabaseTimeoutReason) -> None:
+        async with vbu.Redis() as redis:
+            assert redis.pool is not None
+            await redis.pool.hdel(cls._redis_key(reason.user_id), reason.id)
+
+    @classmethod
+    async def fetch_mirrored_reasons(cls, user_id: int) -> list[DatabaseTimeoutReason]:
+        """Returns the user's unexpired reasons across every process, oldest first"""
+        async with vbu.Redis() as redis:
+            assert redis.pool is not None
+            data = await redis.pool.hgetall(cls._redis_key(user_id), encoding="utf-8")
+
+        now = time.time()
+        reasons = [
+            DatabaseTimeoutReason.from_json(user_id, id, reason_data)
+            for id, reason_data in data.items()
+        ]
+        return sorted(
+            (reason for reason in reasons if reason.expires_at > now),
+            key=lambda reason: reason.created_at,
+        )
 
     @classmethod
     def notify(
-        cls, user_id: int, notification: str, casino_id: str | None = None
+        cls,
+        user_id: int,
+        notification: str,
+        casino_id: str | None = None,
+        *,
+        ttl: float | None = None,
     ) -> NotificationContextManager:
-        return NotificationContextManager(user_id, notification, casino_id=casino_id)
+        return NotificationContextManager(
+            user_id, notification, casino_id=casino_id, ttl=ttl
+        )
+
+    @classmethod
+    def get_stats(cls) -> dict[str, int]:
+        return {
+            **cls.counters,
+            "users": len(cls.REASONS),
+            "reasons": len(cls._reasons),
+            "scheduled_expiries": cls.expiries.size,
+        }
 
 
 class NotificationContextManager(Object):
-    __slots__ = ("user_id", "notification")
-    _repr_attributes = __slots__
+    __slots__ = ("user_id", "notification", "casino_id", "ttl", "reason")
+    _repr_attributes = ("user_id", "notification", "casino_id", "ttl")
 
     def __init__(
-        self, user_id: int, notification: str, *, casino_id: str | None = None
+        self,
+        user_id: int,
+        notification: str,
+        *,
+        casino_id: str | None = None,
+        ttl: float | None = None,
     ) -> None:
         self.user_id = user_id
         self.notification = notification
         self.casino_id = casino_id
+        self.ttl = ttl
+        self.reason: DatabaseTimeoutReason | None = None
 
     def __enter__(self) -> None:
-        DatabaseTimeoutManager.add_notification(
-            self.user_id, self.notification, casino_id=self.casino_id
+        self.reason = DatabaseTimeoutManager.add_notification(
+            self.user_id, self.notification, casino_id=self.casino_id, ttl=self.ttl
         )
 
-    def __exit__(self, exc_type: type[BaseException] | None, *_):
-        if exc_type is None or not issubclass(exc_type, commands.CheckFailure):
-            DatabaseTimeoutManager.clear_notification(self.user_id)
-            return
-        DatabaseTimeoutManager.clear_notification(self.user_id, index=-1)
+    def __exit__(self, *_) -> None:
+        # Only ever clear our own reason, whatever else came and went in the meantime
+        if self.reason is not None:
+            DatabaseTimeoutManager.clear_notification(self.reason)
 
     async def __aenter__(self) -> None:
-        return self.__enter__()
+        self.__enter__()
+
+        if DatabaseTimeoutManager.MIRROR_TO_REDIS:
+            assert self.reason is not None
+            try:
+                await DatabaseTimeoutManager.mirror(self.reason)
+            except Exception as error:
+                DatabaseTimeoutManager.counters["mirror_errors"] += 1
+                DatabaseTimeoutManager._logger.error(
+                    f"Mirroring the reason of {self.user_id} failed: {error}"
+                )
 
     async def __aexit__(self, *args, **kwargs) -> None:
-        return self.__exit__(*args, **kwargs)
+        self.__exit__(*args, **kwargs)
+
+        if DatabaseTimeoutManager.MIRROR_TO_REDIS and self.reason is not None:
+            try:
+                await DatabaseTimeoutManager.unmirror(self.reason)
+            except Exception as error:
+                DatabaseTimeoutManager.counters["mirror_errors"] += 1
+                DatabaseTimeoutManager._logger.error(
+                    f"Unmirroring the reason of {self.user_id} failed, it expires on its"
+                    f" own: {error}"
+                )
 
 
-async def wait_for_component_interaction(
-    bot: Bot,
-    interaction_id: str,
-    *,
-    users: list[discord.User | discord.Member] | None = None,
-    actions: list[str] | None = None,
-    timeout: float | None = 30,
-) -> tuple[discord.ComponentInteraction, str]:
-    """Returns `(component_interaction: commands.ComponentInteraction, action: str)`"""
+class UserCommandQueue(Object):
+    __slots__ = ("lock", "depth", "next_ticket", "last_served_ticket")
+    _repr_attributes = ("depth", "next_ticket", "last_served_ticket")
+
+    def __init__(self) -> None:
+        self.lock = asyncio.Lock()
+        # Running command included
+        self.depth = 0
+        self.next_ticket = 0
+        self.last_served_ticket = -1
+
+
+class UserCommandLockManager:
+    """
+    Runs a user's serialised commands (`Command(serialised=True)`) one at a time, in the
+    order they came in, so they queue up in-process instead of racing each other for row
+    locks in Postgres. With `CROSS_PROCESS` set, for when several bot processes serve the
+    same users, a Redis lock per user is held on top of the in-process one.
+    """
+
+    # Slash commands have to respond within 3 seconds
+    ACQUIRE_TIMEOUT = 2
+    CROSS_PROCESS = False
+    # Renewed while held, so it only runs out if a process dies while holding a lock
+    REDIS_LOCK_TTL = 60
+    REDIS_RENEW_INTERVAL = REDIS_LOCK_TTL / 3
+    REDIS_RETRY_INTERVAL = 0.05
+    REDIS_RELEASE_SCRIPT = """
+        if redis.call('get', KEYS[1]) == ARGV[1] then
+            return redis.call('del', KEYS[1])
+        end
+        return 0
+    """
+    REDIS_RENEW_SCRIPT = """
+        if redis.call('get', KEYS[1]) == ARGV[1] then
+            return redis.call('expire', KEYS[1], ARGV[2])
+        end
+        return 0
+    """
+
+    queues: dict[int, UserCommandQueue] = {}
+    counters = {"acquired": 0, "queued": 0, "timeouts": 0, "out_of_order": 0}
+    max_depth = 0
+    wait_times: deque[float] = deque(maxlen=1000)
+    _logger = logging.getLogger("vbu.bot.cog.utils.UserCommandLockManager")
+
+    @classmethod
+    @contextlib.asynccontextmanager
+    async def hold(
+        cls, user_id: int, *, timeout: float | None = None
+    ) -> AsyncIterator[None]:
+        """
+        Waits for the user's earlier commands to finish, raises `DatabaseTimeout` with the
+        reason of whatever they're busy with if that takes longer than `timeout`
+        """
+        if timeout is None:
+            timeout = cls.ACQUIRE_TIMEOUT
+
+        queue = cls.queues.get(user_id)
+        if queue is None:
+            queue = cls.queues[user_id] = UserCommandQueue()
+
+        ticket = queue.next_ticket
+        queue.next_ticket += 1
+        queue.depth += 1
+        cls.max_depth = max(cls.max_depth, queue.depth)
+        if queue.depth > 1:
+            cls.counters["queued"] += 1
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        redis_token: str | None = None
 
-    def component_interaction_check(
-        component_interaction: discord.ComponentInteraction,
-    ) -> bool:
         try:
-            found_interaction_id, found_action = component_interaction.custom_id.split(
-                "_", 1
+            try:
+                async with asyncio.timeout(timeout):
+                    await queue.lock.acquire()
+                    try:
+                        if cls.CROSS_PROCESS:
+                            redis_token = await cls._acquire_redis_lock(user_id)
+                    except BaseException:
+                        queue.lock.release()
+                        raise
+            except TimeoutError:
+                cls.counters["timeouts"] += 1
+                raise await DatabaseTimeoutManager.fetch_error(user_id)
+
+            if ticket < queue.last_served_ticket:
+                cls.counters["out_of_order"] += 1
+            queue.last_served_ticket = max(queue.last_served_ticket, ticket)
+            cls.counters["acquired"] += 1
+            cls.wait_times.append(loop.time() - start)
+
+            # Serialised commands like /casino can outlast the TTL
+            renewal = (
+                asyncio.create_task(cls._renew_redis_lock(user_id, redis_token))
+                if redis_token is not None
+                else None
             )
-        except ValueError:
-            return False
 
-        if found_interaction_id != interaction_id:
-            return False
+            try:
+                yield
+            finally:
+                if renewal is not None:
+                    renewal.cancel()
+                if redis_token is not None:
+                    await cls._release_redis_lock(user_id, redis_token)
+                queue.lock.release()
+
+        finally:
+            queue.depth -= 1
+            if not queue.depth and cls.queues.get(user_id) is queue:
+                del cls.queues[user_id]
+
+    @classmethod
+    async def _acquire_redis_lock(cls, user_id: int) -> str:
+        """Retries until acquired, so wrap it in a timeout. Returns `token: str`"""
+        token = uuid.uuid4().hex
+
+        async with vbu.Redis() as redis:
+            assert redis.pool is not None
+            while not await redis.pool.set(
+                f"command-locks:{user_id}",
+                token,
+                expire=cls.REDIS_LOCK_TTL,
+                exist=redis.pool.SET_IF_NOT_EXIST,
+            ):
+                await asyncio.sleep(cls.REDIS_RETRY_INTERVAL)
+
+        return token
 
-        if users and component_interaction.user not in users:
-            asyncio.create_task(
-                component_interaction.response.send_message(
-                    random.choice(
-                        [
-                            "This button ain't for you lil bra.",
-                            "Don't click no random ahh buttons that aren't meant for you",
-                            "You not supposed to click that button gang",
-                            (
-                                "You got a rare reward reward for clicking random buttons!!!"
-                                f" Claim it **[here!!!!!](<{MEME_URL}>)**"
-                            ),
-                        ]
-                    ),
-                    ephemeral=True,
+    @classmethod
+    async def _renew_redis_lock(cls, user_id: int, token: str) -> None:
+        """Keeps the lock from expiring until cancelled, or until it's no longer ours"""
+        while True:
+            await asyncio.sleep(cls.REDIS_RENEW_INTERVAL)
+
+            try:
+                async with vbu.Redis() as redis:
+                    assert redis.pool is not None
+                    renewed = await redis.pool.eval(
+                        cls.REDIS_RENEW_SCRIPT,
+                        keys=[f"command-locks:{user_id}"],
+                        args=[token, cls.REDIS_LOCK_TTL],
+                    )
+            except Exception as error:
+                # Next time might work, there's a whole TTL left to try
+                cls._logger.error(
+                    f"Renewing the command lock of {user_id} failed: {error}"
+                )
+                continue
+
+            if not renewed:
+                cls._logger.error(
+                    f"The command lock of {user_id} expired while it was held, other"
+                    " processes can run their commands alongside this one"
                 )
+                return
+
+    @classmethod
+    async def _release_redis_lock(cls, user_id: int, token: str) -> None:
+        try:
+            async with vbu.Redis() as redis:
+                assert redis.pool is not None
+                # Only delete the lock if it's still ours, it might have expired
+                await redis.pool.eval(
+                    cls.REDIS_RELEASE_SCRIPT,
+                    keys=[f"command-locks:{user_id}"],
+                    args=[token],
+                )
+        except Exception as error:
+            cls._logger.error(
+                f"Releasing the command lock of {user_id} failed, it expires on its own"
+                f" in {cls.REDIS_LOCK_TTL}s: {error}"
+            )
+
+    @classmethod
+    def get_stats(cls) -> dict[str, int | float]:
+        wait_times = sorted(cls.wait_times)
+
+        return {
+            **cls.counters,
+            "users": len(cls.queues),
+            "waiting": sum(queue.depth - 1 for queue in cls.queues.values()),
+            "max_depth": cls.max_depth,
+            "p50_wait": statistics.median(wait_times) if wait_times else 0.0,
+            "p99_wait": (
+                wait_times[min(len(wait_times) - 1, int(len(wait_times) * 0.99))]
+                if wait_times
+                else 0.0
+            ),
+        }
+
+
+NOT_FOR_YOU_RESPONSES = [
+    "This button ain't for you lil bra.",
+    "Don't click no random ahh buttons that aren't meant for you",
+    "You not supposed to click that button gang",
+    (
+        "You got a rare reward reward for clicking random buttons!!!"
+        f" Claim it **[here!!!!!](<{MEME_URL}>)**"
+    ),
+]
+
+
+class ComponentInteractionWaiter(Object):
+    __slots__ = ("future", "users", "actions")
+    _repr_attributes = __slots__
+
+    def __init__(
+        self,
+        *,
+        users: list[discord.User | discord.Member] | None = None,
+        actions: list[str] | None = None,
+    ) -> None:
+        self.future: asyncio.Future[tuple[discord.ComponentInteraction, str]] = (
+            asyncio.get_running_loop().create_future()
+        )
+        self.users = users
+        self.actions = actions
+
+
+class ComponentInteractionRouter:
+    """
+    Routes component interactions straight to their waiters using the interaction ID prefix
+    of the custom ID (`{interaction_id}_{action}`), instead of running every waiter's check
+    on every click. See the listener in /cogs/interaction_event_handler.py
+    """
+
+    waiters: dict[str, list[ComponentInteractionWaiter]] = {}
+    # Replies to users clicking someone else's components, kept until they're sent
+    _rejections: set[asyncio.Task[None]] = set()
+
+    @classmethod
+    async def _reject(cls, component_interaction: discord.ComponentInteraction) -> None:
+        try:
+            await component_interaction.response.send_message(
+                random.choice(NOT_FOR_YOU_RESPONSES), ephemeral=True
             )
+        except discord.HTTPException:
+            pass
+
+    @classmethod
+    def route(cls, component_interaction: discord.ComponentInteraction) -> bool:
+        """Returns whether the interaction resolved a waiter"""
+        interaction_id, separator, action = component_interaction.custom_id.partition(
+            "_"
+        )
+        if not separator:
             return False
 
-        if actions and found_action not in actions:
+        waiters = cls.waiters.get(interaction_id)
+        if not waiters:
             return False
 
-        return True
+        unauthorised = False
+        for waiter in waiters:
+            if waiter.future.done():
+                continue
 
-    component_interaction = await bot.wait_for(
-        "component_interaction",
-        check=component_interaction_check,
-        timeout=timeout,
-    )
+            if waiter.users and component_interaction.user not in waiter.users:
+                unauthorised = True
+                continue
+
+            if waiter.actions and action not in waiter.actions:
+                continue
+
+            waiter.future.set_result((component_interaction, action))
+            return True
+
+        if unauthorised:
+            task = asyncio.create_task(cls._reject(component_interaction))
+            cls._rejections.add(task)
+            task.add_done_callback(cls._rejections.discard)
+
+        return False
+
+    @classmethod
+    async def wait_for(
+        cls,
+        interaction_id: str,
+        *,
+        users: list[discord.User | discord.Member] | None = None,
+        actions: list[str] | None = None,
+        timeout: float | None = 30,
+    ) -> tuple[discord.ComponentInteraction, str]:
+        """Returns `(component_interaction: commands.ComponentInteraction, action: str)`"""
+        waiter = ComponentInteractionWaiter(users=users, actions=actions)
+
+        try:
+            cls.waiters[interaction_id].append(waiter)
+        except KeyError:
+            cls.waiters[interaction_id] = [waiter]
+
+        try:
+            return await asyncio.wait_for(waiter.future, timeout=timeout)
+        finally:
+            waiters = cls.waiters.get(interaction_id)
+            if waiters is not None:
+                try:
+                    waiters.remove(waiter)
+                except ValueError:
+                    pass
+                if not waiters:
+                    del cls.waiters[interaction_id]
+
+    @classmethod
+    def get_stats(cls) -> dict[str, int]:
+        return {
+            "interaction_ids": len(cls.waiters),
+            "waiters": sum(len(waiters) for waiters in cls.waiters.values()),
+        }
 
-    found_action = component_interaction.custom_id.split("_", 1)[1]
-    return component_interaction, found_action
+
+async def wait_for_component_interaction(
+    bot: Bot,
+    interaction_id: str,
+    *,
+    users: list[discord.User | discord.Member] | None = None,
+    actions: list[str] | None = None,
+    timeout: float | None = 30,
+) -> tuple[discord.ComponentInteraction, str]:
+    """Returns `(component_interaction: commands.ComponentInteraction, action: str)`"""
+    return await ComponentInteractionRouter.wait_for(
+        interaction_id, users=users, actions=actions, timeout=timeout
+    )
 
 
 class VersionChangelogDict(TypedDict):
@@ -189,6 +726,7 @@ class ChangelogManager:
     CHANGELOG_PATH = "config/changelog.toml"
     latest_version: str = ""
     changelog: dict[str, VersionChangelogDict] = {}
+    snapshot_version = 0
     _logger = logging.getLogger("vbu.bot.cog.utils.ChangelogManager")
 
     @classmethod
@@ -208,8 +746,29 @@ class ChangelogManager:
 
     @classmethod
     def load(cls) -> None:
+        cls.apply(cls.parse())
+
+    @classmethod
+    def get_paths(cls) -> list[str]:
+        return [cls.CHANGELOG_PATH]
+
+    @classmethod
+    def parse(cls) -> tuple[str, dict[str, VersionChangelogDict]]:
+        """Returns `(latest_version: str, changelog: dict[version: str, VersionChangelogDict])`"""
         changelog_data = toml.load(cls.CHANGELOG_PATH)
-        cls.latest_version = changelog_data.pop("latest_version")
+        latest_version = changelog_data.pop("latest_version")
+
+        if latest_version not in changelog_data:
+            raise ValueError(
+                f"Loading changelog failed: {cls.CHANGELOG_PATH} has no changelog for"
+                f" latest version {latest_version!r}"
+            )
+
+        return latest_version, changelog_data
+
+    @classmethod
+    def apply(cls, snapshot: tuple[str, dict[str, VersionChangelogDict]]) -> None:
+        cls.latest_version, cls.changelog = snapshot
+        cls.snapshot_version += 1
         cls._logger.info(f" * Loaded latest version as {cls.latest_version}")
-        cls.changelog = changelog_data
         cls._logger.info(f" * Loaded changelogs for {", ".join(cls.changelog)}")
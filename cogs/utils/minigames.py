@@ -4,7 +4,7 @@ import logging
 import random
 import uuid
 from string import ascii_letters, digits
-from typing import Generic, TypeVar, TypedDict, Mapping, cast
+from typing import Generic, NamedTuple, TypeVar, TypedDict, Mapping, Self, cast
 
 import asyncpg
 import discord
@@ -150,7 +150,7 @@ class ReverseMinigame(Minigame[ReverseContextDict]):
             # assert isinstance(interaction.channel, discord.TextChannel)
             assert interaction.channel is not None
             reply_context, reply = await ReplyManager.wait_for_reply(
-                interaction.channel, check=lambda ctx, _: ctx.author == interaction.user
+                interaction.channel, interaction.user
             )
         except asyncio.TimeoutError:
             embed.colour = RED
@@ -234,7 +234,7 @@ class RepeatMinigame(Minigame[RepeatContextDict]):
             # assert isinstance(interaction.channel, discord.TextChannel)
             assert interaction.channel is not None
             reply_context, reply = await ReplyManager.wait_for_reply(
-                interaction.channel, check=lambda ctx, _: ctx.author == interaction.user
+                interaction.channel, interaction.user
             )
         except asyncio.TimeoutError:
             embed.colour = RED
@@ -337,7 +337,7 @@ class FillInTheBlankMinigame(Minigame[FillInTheBlankContextDict]):
 
         try:
             reply_context, reply = await ReplyManager.wait_for_reply(
-                interaction.channel, check=lambda ctx, _: ctx.author == interaction.user
+                interaction.channel, interaction.user
             )
         except asyncio.TimeoutError:
             embed.colour = RED
@@ -630,46 +630,354 @@ class ClickThatButtonMinigame(Minigame[ClickThatButtonContextDict]):
             pass
 
 
+class _DialogueOptionParser:
+    """Validates a single `[[MINIGAME_ID]]` table of a minigame dialogue file"""
+
+    def __init__(
+        self, option: object, *, path: str, minigame_id: str, keys: tuple[str, ...]
+    ) -> None:
+        self.path = path
+        self.minigame_id = minigame_id
+
+        if not isinstance(option, dict):
+            raise self.error("isn't a table")
+
+        self.option = cast(dict[str, object], option)
+
+        unknown_keys = self.option.keys() - set(keys)
+        if unknown_keys:
+            raise self.error(f"contains unknown key {min(unknown_keys)!r}")
+
+    def error(self, message: str) -> ValueError:
+        return ValueError(
+            f"Loading minigame dialogue failed: Element of minigame {self.minigame_id!r}"
+            f" in {self.path} {message}"
+        )
+
+    def string(self, key: str, default: str | None = None) -> str:
+        value = self.option.get(key, default)
+
+        if value is None:
+            raise self.error(f"missing required key {key!r}")
+        if not isinstance(value, str):
+            raise self.error(f"has non-string value for key {key!r}")
+
+        return value
+
+    def optional_string(self, key: str) -> str | None:
+        if key not in self.option:
+            return None
+        return self.string(key)
+
+    def strings(self, key: str) -> tuple[str, ...]:
+        value = self.option.get(key)
+
+        if value is None:
+            raise self.error(f"missing required key {key!r}")
+        if not isinstance(value, list) or not all(
+            isinstance(item, str) for item in value
+        ):
+            raise self.error(f"has non-string array value for key {key!r}")
+        if not value:
+            raise self.error(f"contains empty dialogue array {key!r}")
+
+        return tuple(value)
+
+    def prompts(self, key: str) -> tuple[tuple[str, str], ...]:
+        value = self.option.get(key)
+
+        if value is None:
+            raise self.error(f"missing required key {key!r}")
+        if not isinstance(value, list) or not value:
+            raise self.error(f"contains empty dialogue array {key!r}")
+
+        prompts: list[tuple[str, str]] = []
+
+        for item in value:
+            if (
+                not isinstance(item, list)
+                or len(item) != 2
+                or not all(isinstance(part, str) for part in item)
+            ):
+                raise self.error(
+                    f"has {key!r} entry {item!r} which isn't a [prompt, answer] pair"
+                )
+
+            prompt, answer = item
+
+            try:
+                prompt.format(answer)
+            except (IndexError, KeyError, ValueError):
+                raise self.error(f"has unformattable prompt {prompt!r}")
+
+            prompts.append((prompt, answer))
+
+        return tuple(prompts)
+
+    def button_style(self, key: str, default: str) -> discord.ButtonStyle:
+        name = self.string(key, default)
+        style = getattr(discord.ButtonStyle, name, None)
+
+        if not isinstance(style, discord.ButtonStyle):
+            raise self.error(f"contains invalid ButtonStyle {name!r}")
+
+        return style
+
+
+class FillInTheBlankDialogue(NamedTuple):
+    person: str
+    situations: tuple[str, ...]
+    reasons: tuple[str, ...]
+    prompts: tuple[tuple[str, str], ...]
+    fails: tuple[str, ...]
+    wins: tuple[str, ...]
+
+    @classmethod
+    def parse(cls, option: object, *, path: str) -> Self:
+        parser = _DialogueOptionParser(
+            option, path=path, minigame_id=FillInTheBlankMinigame.ID, keys=cls._fields
+        )
+        return cls(
+            parser.string("person"),
+            parser.strings("situations"),
+            parser.strings("reasons"),
+            parser.prompts("prompts"),
+            parser.strings("fails"),
+            parser.strings("wins"),
+        )
+
+    def generate(self) -> FillInTheBlankContextDict:
+        prompt, answer = random.choice(self.prompts)
+        return {
+            "person": self.person,
+            "situation": random.choice(self.situations),
+            "reason": random.choice(self.reasons),
+            "prompt": prompt,
+            "answer": answer,
+            "fail": random.choice(self.fails),
+            "win": random.choice(self.wins),
+        }
+
+
+class ReverseDialogue(NamedTuple):
+    person: str
+    situations: tuple[str, ...]
+    reasons: tuple[str, ...]
+    phrases: tuple[str, ...]
+    fails: tuple[str, ...]
+    wins: tuple[str, ...]
+
+    @classmethod
+    def parse(cls, option: object, *, path: str) -> Self:
+        parser = _DialogueOptionParser(
+            option, path=path, minigame_id=ReverseMinigame.ID, keys=cls._fields
+        )
+        return cls(
+            parser.string("person"),
+            parser.strings("situations"),
+            parser.strings("reasons"),
+            parser.strings("phrases"),
+            parser.strings("fails"),
+            parser.strings("wins"),
+        )
+
+    def generate(self) -> ReverseContextDict:
+        return {
+            "person": self.person,
+            "situation": random.choice(self.situations),
+            "reason": random.choice(self.reasons),
+            "phrase": random.choice(self.phrases),
+            "fail": random.choice(self.fails),
+            "win": random.choice(self.wins),
+        }
+
+
+class RepeatDialogue(NamedTuple):
+    person: str
+    situations: tuple[str, ...]
+    reasons: tuple[str, ...]
+    sentences: tuple[str, ...]
+    fails: tuple[str, ...]
+    wins: tuple[str, ...]
+
+    @classmethod
+    def parse(cls, option: object, *, path: str) -> Self:
+        parser = _DialogueOptionParser(
+            option, path=path, minigame_id=RepeatMinigame.ID, keys=cls._fields
+        )
+        return cls(
+            parser.string("person"),
+            parser.strings("situations"),
+            parser.strings("reasons"),
+            parser.strings("sentences"),
+            parser.strings("fails"),
+            parser.strings("wins"),
+        )
+
+    def generate(self) -> RepeatContextDict:
+        return {
+            "person": self.person,
+            "situation": random.choice(self.situations),
+            "reason": random.choice(self.reasons),
+            "sentence": random.choice(self.sentences),
+            "fail": random.choice(self.fails),
+            "win": random.choice(self.wins),
+        }
+
+
+class ClickThatButtonDialogue(NamedTuple):
+    object: str
+    action: str
+    target: str
+    target_emoji: str | None
+    fails: tuple[str, ...]
+    wins: tuple[str, ...]
+    foreground_style: discord.ButtonStyle
+    background_style: discord.ButtonStyle
+    background_label: str
+    background_emoji: str | None
+
+    @classmethod
+    def parse(cls, option: object, *, path: str) -> Self:
+        parser = _DialogueOptionParser(
+            option, path=path, minigame_id=ClickThatButtonMinigame.ID, keys=cls._fields
+        )
+
+        target = parser.string("target", ZERO_WIDTH_CHARACTER)
+        target_emoji = parser.optional_string("target_emoji")
+
+        if target == ZERO_WIDTH_CHARACTER and target_emoji is None:
+            raise parser.error(
+                f"missing required key {'target'!r}, which is only optional when key"
+                f" {'target_emoji'!r} is supplied"
+            )
+
+        return cls(
+            parser.string("object"),
+            parser.string("action", "click"),
+            target,
+            target_emoji,
+            parser.strings("fails"),
+            parser.strings("wins"),
+            parser.button_style("foreground_style", "green"),
+            parser.button_style("background_style", "grey"),
+            parser.string("background_label", ZERO_WIDTH_CHARACTER),
+            parser.optional_string("background_emoji"),
+        )
+
+    def generate(self) -> ClickThatButtonContextDict:
+        return {
+            "object": self.object,
+            "action": self.action,
+            "target": self.target,
+            "target_emoji": self.target_emoji,
+            "fail": random.choice(self.fails),
+            "win": random.choice(self.wins),
+            "foreground_style": self.foreground_style,
+            "background_style": self.background_style,
+            "background_label": self.background_label,
+            "background_emoji": self.background_emoji,
+        }
+
+
+MinigameDialogue = (
+    FillInTheBlankDialogue | ReverseDialogue | RepeatDialogue | ClickThatButtonDialogue
+)
+
+
+class MinigameDialogueSnapshot(NamedTuple):
+    variant: str
+    minigame_directory: str
+    dialogue: dict[tuple[str, str], tuple[MinigameDialogue, ...]]
+
+
 class MinigameDialogueManager:
     DIALOGUE_DIRECTORY = "config/dialogue"
+    DIALOGUE_TYPES: dict[str, type[MinigameDialogue]] = {
+        FillInTheBlankMinigame.ID: FillInTheBlankDialogue,
+        ReverseMinigame.ID: ReverseDialogue,
+        RepeatMinigame.ID: RepeatDialogue,
+        ClickThatButtonMinigame.ID: ClickThatButtonDialogue,
+    }
     variant = "default"
     minigame_directory = f"{DIALOGUE_DIRECTORY}/{variant}/minigames"
-    dialogue: dict[str, dict[str, list[dict]]] = {}
+    dialogue: dict[tuple[str, str], tuple[MinigameDialogue, ...]] = {}
+    snapshot_version = 0
     _logger = logging.getLogger("vbu.bot.cog.utils.MinigameDialogueManager")
 
     @classmethod
     def load(cls) -> None:
+        cls.apply(cls.parse())
+
+    @classmethod
+    def get_paths(cls) -> list[str]:
+        # The directory itself is included so added and removed files are picked up too
+        paths = [f"{cls.DIALOGUE_DIRECTORY}/config.toml", cls.minigame_directory]
+
+        try:
+            paths.extend(
+                f"{cls.minigame_directory}/{subpath}"
+                for subpath in sorted(os.listdir(cls.minigame_directory))
+            )
+        except FileNotFoundError:
+            pass
+
+        return paths
+
+    @classmethod
+    def parse(cls) -> MinigameDialogueSnapshot:
+        """Doesn't touch any of the manager's state, so it's safe to run off-thread"""
         try:
             config = toml.load(f"{cls.DIALOGUE_DIRECTORY}/config.toml")
-            cls.variant = config["variant"]
+            variant = config["variant"]
         except:
             raise FileNotFoundError(
                 f"Loading minigame dialogue failed: Dialogue directory {cls.DIALOGUE_DIRECTORY!r}"
                 " does not contains the required config.toml file."
             )
 
-        cls._logger.info(
-            f" * Loaded variant {cls.variant!r} from {cls.DIALOGUE_DIRECTORY}/config.toml"
-        )
+        minigame_directory = f"{cls.DIALOGUE_DIRECTORY}/{variant}/minigames"
+        dialogue: dict[tuple[str, str], tuple[MinigameDialogue, ...]] = {}
 
-        cls.minigame_directory = f"{cls.DIALOGUE_DIRECTORY}/{cls.variant}/minigames"
-
-        cls.dialogue.clear()
-        for subpath in os.listdir(cls.minigame_directory):
+        for subpath in sorted(os.listdir(minigame_directory)):
             assert subpath.endswith(".toml"), (
                 "Loading minigame dialogue failed: Minigame dialogue directory"
-                f" {cls.minigame_directory!r} contains non-TOML files."
+                f" {minigame_directory!r} contains non-TOML files."
             )
-            cls.dialogue.update(
-                {
-                    subpath.rsplit(".")[0]: toml.load(
-                        f"{cls.minigame_directory}/{subpath}"
+            path = f"{minigame_directory}/{subpath}"
+            section = subpath.rsplit(".")[0]
+
+            for minigame_id, options in toml.load(path).items():
+                try:
+                    dialogue_type = cls.DIALOGUE_TYPES[minigame_id]
+                except KeyError:
+                    raise ValueError(
+                        f"Loading minigame dialogue failed: {path} contains dialogue for"
+                        f" unknown minigame {minigame_id!r}"
                     )
-                }
-            )
-            cls._logger.info(
-                f" * Added minigame dialogue from {cls.minigame_directory}/{subpath}"
-            )
+
+                if not isinstance(options, list) or not options:
+                    raise ValueError(
+                        f"Loading minigame dialogue failed: {path} contains no elements for"
+                        f" minigame {minigame_id!r}"
+                    )
+
+                dialogue[section, minigame_id] = tuple(
+                    dialogue_type.parse(option, path=path) for option in options
+                )
+
+            cls._logger.info(f" * Added minigame dialogue from {path}")
+
+        return MinigameDialogueSnapshot(variant, minigame_directory, dialogue)
+
+    @classmethod
+    def apply(cls, snapshot: MinigameDialogueSnapshot) -> None:
+        cls.variant, cls.minigame_directory, cls.dialogue = snapshot
+        cls.snapshot_version += 1
+
+        cls._logger.info(
+            f" * Loaded variant {cls.variant!r} from {cls.DIALOGUE_DIRECTORY}/config.toml"
+        )
 
     @classmethod
     def generate_random_dialogue(
@@ -682,108 +990,12 @@ class MinigameDialogueManager:
         if cls.variant == "christmas":
             section = "global"
 
-        section_dialogue = cls.dialogue.get(section, {})
-        dialogue_options = section_dialogue.get(minigame_type.ID, [])
-
-        if not dialogue_options:
+        try:
+            dialogue_options = cls.dialogue[section, minigame_type.ID]
+        except KeyError:
             raise ValueError(
                 "No minigame dialogue options associated with the"
                 f" section {section!r} found in {cls.minigame_directory}"
             )
 
-        dialogue_option = random.choice(dialogue_options)
-        try:
-            if minigame_type == FillInTheBlankMinigame:
-                prompt, answer = random.choice(dialogue_option["prompts"])
-                fill_in_the_blank_dialogue: FillInTheBlankContextDict = {
-                    "person": dialogue_option["person"],
-                    "situation": random.choice(dialogue_option["situations"]),
-                    "reason": random.choice(dialogue_option["reasons"]),
-                    "prompt": prompt,
-                    "answer": answer,
-                    "fail": random.choice(dialogue_option["fails"]),
-                    "win": random.choice(dialogue_option["wins"]),
-                }
-
-                return cast(_MinigameContextDictT, fill_in_the_blank_dialogue)
-
-            elif minigame_type == ReverseMinigame:
-                reverse_dialogue: ReverseContextDict = {
-                    "person": dialogue_option["person"],
-                    "situation": random.choice(dialogue_option["situations"]),
-                    "reason": random.choice(dialogue_option["reasons"]),
-                    "phrase": random.choice(dialogue_option["phrases"]),
-                    "fail": random.choice(dialogue_option["fails"]),
-                    "win": random.choice(dialogue_option["wins"]),
-                }
-                return cast(_MinigameContextDictT, reverse_dialogue)
-
-            elif minigame_type == RepeatMinigame:
-                repeat_dialogue: RepeatContextDict = {
-                    "person": dialogue_option["person"],
-                    "situation": random.choice(dialogue_option["situations"]),
-                    "reason": random.choice(dialogue_option["reasons"]),
-                    "sentence": random.choice(dialogue_option["sentences"]),
-                    "fail": random.choice(dialogue_option["fails"]),
-                    "win": random.choice(dialogue_option["wins"]),
-                }
-                return cast(_MinigameContextDictT, repeat_dialogue)
-
-            elif minigame_type == ClickThatButtonMinigame:
-                click_that_button_dialogue: ClickThatButtonContextDict = {
-                    "object": dialogue_option["object"],
-                    "action": dialogue_option.get("action", "click"),
-                    "target": dialogue_option.get("target", ZERO_WIDTH_CHARACTER),
-                    "target_emoji": dialogue_option.get("target_emoji"),
-                    "fail": random.choice(dialogue_option["fails"]),
-                    "win": random.choice(dialogue_option["wins"]),
-                    "foreground_style": getattr(
-                        discord.ButtonStyle,
-                        dialogue_option.get("foreground_style", "green"),
-                    ),
-                    "background_style": getattr(
-                        discord.ButtonStyle,
-                        dialogue_option.get("background_style", "grey"),
-                    ),
-                    "background_label": dialogue_option.get(
-                        "background_label", ZERO_WIDTH_CHARACTER
-                    ),
-                    "background_emoji": dialogue_option.get("background_emoji"),
-                }
-
-                if (
-                    click_that_button_dialogue["target"] == ZERO_WIDTH_CHARACTER
-                    and click_that_button_dialogue["target_emoji"] is None
-                ):
-                    raise ValueError(
-                        f"Can't generate minigame dialogue: Element of section {section!r}"
-                        f", minigame {minigame_type.ID!r} missing required key {'target'!r}, which"
-                        f" is only optional when key {'target_emoji'} is supplied"
-                    )
-
-                return cast(_MinigameContextDictT, click_that_button_dialogue)
-
-        except KeyError as exc:
-            raise ValueError(
-                f"Can't generate minigame dialogue: Element of section {section!r}, minigame"
-                f" {minigame_type.ID!r} missing required key {exc.args[0]!r}"
-            )
-        except IndexError as exc:
-            raise ValueError(
-                f"Can't generate minigame dialogue: Element of section {section!r}, minigame"
-                f" {minigame_type.ID!r} contains empty dialogue array"
-            )
-        except AttributeError as exc:
-            if (
-                exc.obj != discord.ButtonStyle
-            ):  # pyright: ignore  # exc.obj isn't always object
-                raise
-            raise ValueError(
-                f"Can't generate minigame dialogue: Style element of section {section!r}, minigame"
-                f" {minigame_type.ID!r} contains invalid ButtonStyle {exc.name!r}"
-            )
-
-        raise ValueError(
-            f"Can't generate minigame dialogue: No handling for minigame {minigame_type!r}"
-            " available"
-        )
+        return cast(_MinigameContextDictT, random.choice(dialogue_options).generate())
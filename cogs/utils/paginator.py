@@ -5,7 +5,7 @@ from typing import TypeVar, Self, Generic, cast, Literal
 
 import discord
 
-from . import Object, Embed, Bot
+from . import Object, Embed, Bot, wait_for_component_interaction
 
 PaginatorActions = Literal["START", "PREVIOUS", "NEXT", "END"]
 CategorisedPaginatorActions = PaginatorActions | Literal["SELECT_CATEGORY"]
@@ -88,15 +88,10 @@ class Paginator(Object, Generic[_ItemT, _ActionsT]):
         self, user: discord.User | discord.Member
     ) -> tuple[discord.ComponentInteraction, _ActionsT]:
         """Returns `(component_interaction: discord.ComponentInteraction, action: _ActionsT)`"""
-        component_interaction = await self.bot.wait_for(
-            "component_interaction",
-            check=lambda i: i.user == user and i.custom_id.startswith(self.id),
-            timeout=180,
-        )
-        return component_interaction, cast(
-            _ActionsT,
-            component_interaction.custom_id.split("_", 1)[1],
+        component_interaction, action = await wait_for_component_interaction(
+            self.bot, self.id, users=[user], timeout=180
         )
+        return component_interaction, cast(_ActionsT, action)
 
     def handle_interaction(
         self,
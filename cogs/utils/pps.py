@@ -3,11 +3,12 @@ import enum
 import math
 from datetime import datetime, timedelta, UTC
 from decimal import Decimal
-from typing import Self, Literal
+from collections.abc import Awaitable, Callable
+from typing import Any, Self, Literal
 
 import asyncpg
 import discord
-from discord.ext import commands, vbu
+from discord.ext import vbu
 
 from . import (
     InteractionChannel,
@@ -44,21 +45,16 @@ class BoostType(enum.Enum):
         return int(self.value[0] * 100)
 
 
-class DatabaseTimeout(commands.CheckFailure):
-    def __init__(
-        self,
-        message: str | None = None,
-        *args,
-        reason: str,
-        casino_id: str | None = None,
-    ) -> None:
-        super().__init__(message, *args)
-        self.reason = reason
-        self.casino_id = casino_id
-
-
 class Pp(DatabaseWrapperObject):
-    __slots__ = ("user_id", "multiplier", "size", "name", "digging_depth", "created_at")
+    __slots__ = (
+        "user_id",
+        "multiplier",
+        "size",
+        "name",
+        "digging_depth",
+        "created_at",
+        "version",
+    )
     _repr_attributes = __slots__
     _table = "pps"
     _columns = {
@@ -68,10 +64,13 @@ class Pp(DatabaseWrapperObject):
         "pp_name": "name",
         "digging_depth": "digging_depth",
         "created_at": "created_at",
+        "version": "version",
     }
     _column_attributes = {attribute: column for column, attribute in _columns.items()}
     _identifier_attributes = ("user_id",)
     _trackers = ("multiplier", "size", "name", "digging_depth")
+    _version_column = "version"
+    _cacheable = True
 
     def __init__(
         self,
@@ -81,6 +80,7 @@ class Pp(DatabaseWrapperObject):
         name: str,
         digging_depth: int,
         created_at: datetime,
+        version: int = 0,
     ) -> None:
         self.user_id = user_id
         self.multiplier = DifferenceTracker(multiplier, column="pp_multiplier")
@@ -88,6 +88,7 @@ class Pp(DatabaseWrapperObject):
         self.name = DifferenceTracker(name, column="pp_name")
         self.digging_depth = DifferenceTracker(digging_depth, column="digging_depth")
         self.created_at = created_at
+        self.version = version
 
     @property
     def age(self) -> timedelta:
@@ -100,9 +101,17 @@ class Pp(DatabaseWrapperObject):
         channel: str | InteractionChannel | None,
     ) -> tuple[int, list[BoostType], int | Decimal]:
         """Returns `(full_multiplier: int, boosts: list[BoostType], total_boost: int | Decimal)`"""
-        boosts: list[BoostType] = []
+        boosts, total_boost = self.get_boosts(voted=voted, channel=channel)
+        return math.ceil(self.multiplier.value * total_boost), boosts, total_boost
 
-        multiplier = self.multiplier.value
+    @staticmethod
+    def get_boosts(
+        *,
+        voted: bool,
+        channel: str | InteractionChannel | None,
+    ) -> tuple[list[BoostType], int | Decimal]:
+        """Returns `(boosts: list[BoostType], total_boost: int | Decimal)`"""
+        boosts: list[BoostType] = []
 
         if voted:
             boosts.append(BoostType.VOTER)
@@ -129,7 +138,14 @@ class Pp(DatabaseWrapperObject):
         for boost in boosts:
             total_boost += boost.value[0]
 
-        return math.ceil(multiplier * total_boost), boosts, total_boost
+        return boosts, total_boost
+
+    @staticmethod
+    def missing_error() -> PpMissing:
+        return PpMissing(
+            f"You don't have a pp! Go make one with {format_slash_command('new')} and get"
+            " started :)"
+        )
 
     @classmethod
     async def fetch_from_user(
@@ -138,9 +154,14 @@ class Pp(DatabaseWrapperObject):
         user_id: int,
         *,
         edit: bool = False,
+        cached: bool = False,
         timeout: float | None = 2,
     ) -> Self:
         try:
+            if cached and not edit:
+                return await cls.fetch_cached(
+                    connection, {"user_id": user_id}, timeout=timeout
+                )
             return await cls.fetch(
                 connection,
                 {"user_id": user_id},
@@ -148,17 +169,84 @@ class Pp(DatabaseWrapperObject):
                 timeout=timeout,
             )
         except RecordNotFoundError:
-            raise PpMissing(
-                f"You don't have a pp! Go make one with {format_slash_command('new')} and get"
-                " started :)"
-            )
+            raise cls.missing_error()
         except asyncio.TimeoutError:
-            reason, casino_id = DatabaseTimeoutManager.get_reason(user_id)
-            raise DatabaseTimeout(
-                DatabaseTimeoutManager.get_notification(user_id)[0],
-                reason=reason,
-                casino_id=casino_id,
+            raise await DatabaseTimeoutManager.fetch_error(user_id)
+
+    @classmethod
+    async def fetch_and_update_from_user(
+        cls,
+        connection: asyncpg.Connection,
+        user_id: int,
+        modify: Callable[[Self], Awaitable[None] | None],
+        *,
+        timeout: float | None = 2,
+    ) -> Self:
+        """
+        Optimistic alternative to `fetch_from_user(edit=True)` + `update` for short
+        read-modify-writes. See `DatabaseWrapperObject.fetch_and_update`
+        """
+        try:
+            return await cls.fetch_and_update(
+                connection, {"user_id": user_id}, modify, timeout=timeout
             )
+        except RecordNotFoundError:
+            raise cls.missing_error()
+        except asyncio.TimeoutError:
+            raise await DatabaseTimeoutManager.fetch_error(user_id)
+
+    @classmethod
+    async def grow_from_user(
+        cls,
+        connection: asyncpg.Connection,
+        user_id: int,
+        growth: int,
+        *,
+        voted: bool,
+        channel: str | InteractionChannel | None,
+        required_size: int | None = None,
+        timeout: float | None = 2,
+    ) -> Self | None:
+        """
+        Grows the pp by `growth` times its full multiplier in a single
+        `UPDATE ... RETURNING`, without a transaction or a `SELECT ... FOR UPDATE` first.
+        If `required_size` (multiplied too) is given and the pp is smaller than that,
+        nothing changes and `None` is returned
+        """
+        _, total_boost = cls.get_boosts(voted=voted, channel=channel)
+        # Same as get_full_multiplier, NUMERIC keeps the boost exact
+        multiplier_sql = "CEIL(pp_multiplier * $3::NUMERIC)::BIGINT"
+        arguments: list[Any] = [user_id, growth, Decimal(total_boost)]
+
+        query = f"""
+            UPDATE {cls._table}
+            SET
+                pp_size = pp_size + $2 * {multiplier_sql},
+                version = version + 1
+            WHERE user_id = $1
+        """
+        if required_size is not None:
+            query += f" AND pp_size >= $4 * {multiplier_sql}"
+            arguments.append(required_size)
+        query += f" RETURNING *, $2 * {multiplier_sql} AS growth"
+
+        try:
+            record = await connection.fetchrow(query, *arguments, timeout=timeout)
+        except asyncio.TimeoutError:
+            raise await DatabaseTimeoutManager.fetch_error(user_id)
+
+        if record is None:
+            # Raises PpMissing if it's missing rather than too small
+            await cls.fetch_from_user(connection, user_id, timeout=timeout)
+            return None
+
+        columns = dict(record)
+        applied_growth = columns.pop("growth")
+        pp = cls.from_record(columns)
+        pp.invalidate_cached()
+        pp.size = DifferenceTracker(pp.size.value - applied_growth, column="pp_size")
+        pp.size.value += applied_growth
+        return pp
 
     async def has_voted(self) -> bool:
         return await vbu.user_has_voted(self.user_id)
@@ -231,6 +319,7 @@ class PpExtras(DatabaseWrapperObject):
     _column_attributes = {attribute: column for column, attribute in _columns.items()}
     _identifier_attributes = ("user_id",)
     _trackers = ("is_og", "last_played_version")
+    _cacheable = True
 
     def __init__(
         self,
@@ -251,9 +340,17 @@ class PpExtras(DatabaseWrapperObject):
         user_id: int,
         *,
         edit: bool = False,
+        cached: bool = False,
         timeout: float | None = 2,
     ) -> Self:
         try:
+            if cached and not edit:
+                return await cls.fetch_cached(
+                    connection,
+                    {"user_id": user_id},
+                    timeout=timeout,
+                    insert_if_not_found=True,
+                )
             return await cls.fetch(
                 connection,
                 {"user_id": user_id},
@@ -262,12 +359,7 @@ class PpExtras(DatabaseWrapperObject):
                 insert_if_not_found=True,
             )
         except asyncio.TimeoutError:
-            reason, casino_id = DatabaseTimeoutManager.get_reason(user_id)
-            raise DatabaseTimeout(
-                DatabaseTimeoutManager.get_notification(user_id)[0],
-                reason=reason,
-                casino_id=casino_id,
-            )
+            raise await DatabaseTimeoutManager.fetch_error(user_id)
 
 
 class PpGuilds(DatabaseWrapperObject):
@@ -0,0 +1,251 @@
+import asyncio
+from typing import Any, Self
+
+import asyncpg
+
+from . import (
+    Object,
+    DatabaseTimeoutManager,
+    Streaks,
+    InventoryItem,
+    ItemManager,
+    Pp,
+    PpExtras,
+    SnapshotCache,
+)
+
+
+class Profile(Object):
+    """
+    Everything the /show tabs display about a user, loaded in a single query. A tab
+    session keeps its profile in memory for as long as it runs, so switching tabs never
+    goes back to the database
+    """
+
+    __slots__ = ("user_id", "pp", "pp_extras", "streaks", "inventory")
+    _repr_attributes = ("user_id", "version")
+
+    # Invalidated along with any of its rows, see `SnapshotCache.DEPENDENTS`
+    CACHE_TABLE = "profiles"
+
+    def __init__(
+        self,
+        user_id: int,
+        pp: Pp,
+        pp_extras: PpExtras,
+        streaks: Streaks,
+        inventory: list[InventoryItem],
+    ) -> None:
+        self.user_id = user_id
+        self.pp = pp
+        self.pp_extras = pp_extras
+        self.streaks = streaks
+        self.inventory = inventory
+
+    @property
+    def version(self) -> int:
+        return self.pp.version
+
+    @classmethod
+    async def fetch_from_user(
+        cls,
+        connection: asyncpg.Connection,
+        user_id: int,
+        *,
+        cached: bool = False,
+        timeout: float | None = 2,
+    ) -> Self:
+        """
+        With `cached`, the record is served from `SnapshotCache` where possible, for
+        read-only paths
+        """
+        key = (user_id,)
+        record = SnapshotCache.get(cls.CACHE_TABLE, key) if cached else None
+
+        if record is None:
+            generation = SnapshotCache.generation
+            record = await cls._fetch_record(connection, user_id, timeout=timeout)
+
+            # Profiles with rows still to be created aren't worth keeping, the next
+            # fetch finds them all
+            if cached and record["has_pp_extras"] and record["has_streaks"]:
+                SnapshotCache.set(cls.CACHE_TABLE, key, record, generation=generation)
+
+        return await cls._from_record(connection, user_id, record, timeout=timeout)
+
+    @classmethod
+    async def _fetch_record(
+        cls,
+        connection: asyncpg.Connection,
+        user_id: int,
+        *,
+        timeout: float | None,
+    ) -> asyncpg.Record:
+        try:
+            record = await connection.fetchrow(
+                f"""
+                SELECT
+                    {Pp._table}.*,
+                    {PpExtras._table}.user_id IS NOT NULL AS has_pp_extras,
+                    {PpExtras._table}.is_og,
+                    {PpExtras._table}.last_played_version,
+                    {Streaks._table}.user_id IS NOT NULL AS has_streaks,
+                    {Streaks._table}.daily_streak,
+                    {Streaks._table}.last_daily,
+                    inventory.item_numbers,
+                    inventory.item_amounts
+                FROM {Pp._table}
+                LEFT JOIN {PpExtras._table}
+                    ON {PpExtras._table}.user_id = {Pp._table}.user_id
+                LEFT JOIN {Streaks._table}
+                    ON {Streaks._table}.user_id = {Pp._table}.user_id
+                CROSS JOIN LATERAL (
+                    SELECT
+                        array_agg(item_number ORDER BY item_number) AS item_numbers,
+                        array_agg(item_amount ORDER BY item_number) AS item_amounts
+                    FROM {InventoryItem._table}
+                    WHERE user_id = {Pp._table}.user_id
+                ) AS inventory
+                WHERE {Pp._table}.user_id = $1
+                """,
+                user_id,
+                timeout=timeout,
+            )
+        except asyncio.TimeoutError:
+            raise await DatabaseTimeoutManager.fetch_error(user_id)
+
+        if record is None:
+            raise Pp.missing_error()
+
+        return record
+
+    @classmethod
+    async def _from_record(
+        cls,
+        connection: asyncpg.Connection,
+        user_id: int,
+        record: asyncpg.Record,
+        *,
+        timeout: float | None,
+    ) -> Self:
+        columns = dict(record)
+        pp = Pp.from_record(
+            {column: columns.pop(column) for column in Pp._columns}  # type: ignore
+        )
+
+        # Rows that don't exist yet are created with their defaults, like fetch_from_user
+        # does, which only happens the first time someone's profile is loaded
+        if columns["has_pp_extras"]:
+            pp_extras = PpExtras(
+                user_id, columns["is_og"], columns["last_played_version"]
+            )
+        else:
+            pp_extras = await PpExtras.fetch_from_user(
+                connection, user_id, timeout=timeout
+            )
+
+        if columns["has_streaks"]:
+            streaks = Streaks(user_id, columns["daily_streak"], columns["last_daily"])
+        else:
+            streaks = await Streaks.fetch_from_user(
+                connection, user_id, timeout=timeout
+            )
+
+        inventory = [
+            InventoryItem(user_id, ItemManager.get_item_id(item_number), item_amount)
+            for item_number, item_amount in zip(
+                columns["item_numbers"] or [], columns["item_amounts"] or []
+            )
+        ]
+
+        return cls(user_id, pp, pp_extras, streaks, inventory)
+
+
+class ProfileSummary(Object):
+    """Just enough of a profile for /compare, many users at a time"""
+
+    __slots__ = ("user_id", "pp", "item_count")
+    _repr_attributes = __slots__
+
+    # Invalidated along with its rows, see `SnapshotCache.DEPENDENTS`
+    CACHE_TABLE = "profile_summaries"
+
+    def __init__(self, user_id: int, pp: Pp, item_count: int) -> None:
+        self.user_id = user_id
+        self.pp = pp
+        self.item_count = item_count
+
+    @classmethod
+    async def fetch_from_users(
+        cls,
+        connection: asyncpg.Connection,
+        user_ids: list[int],
+        *,
+        cached: bool = False,
+        timeout: float | None = 2,
+    ) -> dict[int, Self]:
+        """
+        Users without a pp are left out. Item counts are summed by the database. With
+        `cached`, summaries are served from `SnapshotCache` where possible and only the
+        rest are queried, for read-only paths
+        """
+        records: dict[int, Any] = {}
+
+        if cached:
+            for user_id in user_ids:
+                record = SnapshotCache.get(cls.CACHE_TABLE, (user_id,))
+                if record is not None:
+                    records[user_id] = record
+
+        missing_user_ids = [user_id for user_id in user_ids if user_id not in records]
+
+        if missing_user_ids:
+            generation = SnapshotCache.generation
+
+            for record in await cls._fetch_records(
+                connection, missing_user_ids, timeout=timeout
+            ):
+                records[record["user_id"]] = record
+
+                if cached:
+                    SnapshotCache.set(
+                        cls.CACHE_TABLE,
+                        (record["user_id"],),
+                        record,
+                        generation=generation,
+                    )
+
+        summaries: dict[int, Self] = {}
+
+        for record in records.values():
+            columns = dict(record)
+            item_count = columns.pop("item_count")
+            pp = Pp.from_record(columns)  # type: ignore
+            summaries[pp.user_id] = cls(pp.user_id, pp, item_count)
+
+        return summaries
+
+    @staticmethod
+    async def _fetch_records(
+        connection: asyncpg.Connection,
+        user_ids: list[int],
+        *,
+        timeout: float | None,
+    ) -> list[asyncpg.Record]:
+        try:
+            return await connection.fetch(
+                f"""
+                SELECT {Pp._table}.*, inventory.item_count
+                FROM {Pp._table}
+                CROSS JOIN LATERAL (
+                    SELECT COALESCE(sum(item_amount), 0)::BIGINT AS item_count
+                    FROM {InventoryItem._table}
+                    WHERE user_id = {Pp._table}.user_id
+                ) AS inventory
+                WHERE {Pp._table}.user_id = ANY($1::BIGINT[])
+                """,
+                user_ids,
+                timeout=timeout,
+            )
+        except asyncio.TimeoutError:
+            raise await DatabaseTimeoutManager.fetch_error(user_ids[0])
@@ -0,0 +1,165 @@
+from __future__ import annotations
+import asyncio
+import heapq
+import itertools
+from collections.abc import Callable, Hashable
+from typing import Any
+
+from . import Object
+
+
+class _ScheduledDeadline:
+    __slots__ = ("deadline", "sequence", "key", "callback", "cancelled")
+
+    def __init__(
+        self,
+        deadline: float,
+        sequence: int,
+        key: Hashable,
+        callback: Callable[[], Any],
+    ) -> None:
+        self.deadline = deadline
+        self.sequence = sequence
+        self.key = key
+        self.callback = callback
+        self.cancelled = False
+
+    def __lt__(self, other: _ScheduledDeadline) -> bool:
+        return (self.deadline, self.sequence) < (other.deadline, other.sequence)
+
+
+class DeadlineScheduler(Object):
+    """
+    Runs a callback per key once its deadline passes. All deadlines live in a heap and only
+    the earliest one is armed with `loop.call_at`, so an idle scheduler costs nothing and
+    rescheduling a key is O(log n).
+    """
+
+    __slots__ = ("_heap", "_entries", "_sequence", "_cancelled", "_handle", "_armed_at")
+    _repr_attributes = ("size",)
+
+    # Rebuild the heap once this many entries (and at least half of it) are stale
+    COMPACT_THRESHOLD = 64
+
+    def __init__(self) -> None:
+        self._heap: list[_ScheduledDeadline] = []
+        self._entries: dict[Hashable, _ScheduledDeadline] = {}
+        self._sequence = itertools.count()
+        self._cancelled = 0
+        self._handle: asyncio.TimerHandle | None = None
+        self._armed_at: float | None = None
+
+    @property
+    def size(self) -> int:
+        return len(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def schedule(
+        self, key: Hashable, delay: float, callback: Callable[[], Any]
+    ) -> float:
+        """
+        (Re)schedules `callback` to run `delay` seconds from now, replacing any deadline
+        previously scheduled for `key`. Returns the deadline in `loop.time()` units.
+        """
+        loop = asyncio.get_running_loop()
+        self._invalidate(key)
+
+        entry = _ScheduledDeadline(
+            loop.time() + delay, next(self._sequence), key, callback
+        )
+        self._entries[key] = entry
+        heapq.heappush(self._heap, entry)
+        self._arm(loop)
+
+        return entry.deadline
+
+    def cancel(self, key: Hashable) -> bool:
+        """Returns whether a deadline was scheduled for `key`"""
+        if not self._invalidate(key):
+            return False
+
+        if not self._entries:
+            self._disarm()
+            self._heap.clear()
+            self._cancelled = 0
+
+        return True
+
+    def cancel_all(self) -> None:
+        self._disarm()
+        self._heap.clear()
+        self._entries.clear()
+        self._cancelled = 0
+
+    def _invalidate(self, key: Hashable) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+
+        entry.cancelled = True
+        self._cancelled += 1
+
+        if self._cancelled >= self.COMPACT_THRESHOLD and self._cancelled * 2 >= len(
+            self._heap
+        ):
+            self._heap = [entry for entry in self._heap if not entry.cancelled]
+            heapq.heapify(self._heap)
+            self._cancelled = 0
+
+        return True
+
+    def _disarm(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+        self._handle = None
+        self._armed_at = None
+
+    def _arm(self, loop: asyncio.AbstractEventLoop) -> None:
+        while self._heap and self._heap[0].cancelled:
+            heapq.heappop(self._heap)
+            self._cancelled -= 1
+
+        if not self._heap:
+            self._disarm()
+            return
+
+        deadline = self._heap[0].deadline
+
+        if self._handle is not None and self._armed_at == deadline:
+            return
+
+        self._disarm()
+        self._handle = loop.call_at(deadline, self._fire, loop)
+        self._armed_at = deadline
+
+    def _fire(self, loop: asyncio.AbstractEventLoop) -> None:
+        # call_at may fire marginally before the deadline due to clock resolution
+        now = max(loop.time(), self._armed_at or 0.0)
+        self._handle = None
+        self._armed_at = None
+
+        while self._heap and (self._heap[0].cancelled or self._heap[0].deadline <= now):
+            entry = heapq.heappop(self._heap)
+
+            if entry.cancelled:
+                self._cancelled -= 1
+                continue
+
+            del self._entries[entry.key]
+
+            try:
+                entry.callback()
+            except Exception as error:
+                loop.call_exception_handler(
+                    {
+                        "message": f"Exception in deadline callback for {entry.key!r}",
+                        "exception": error,
+                    }
+                )
+
+        self._arm(loop)
@@ -22,6 +22,7 @@ class Streaks(DatabaseWrapperObject):
     _column_attributes = {attribute: column for column, attribute in _columns.items()}
     _identifier_attributes = ("user_id",)
     _trackers = ("daily", "last_daily")
+    _cacheable = True
 
     def __init__(self, user_id: int, daily: int, last_daily: datetime) -> None:
         self.user_id = user_id
@@ -41,8 +42,16 @@ class Streaks(DatabaseWrapperObject):
         user_id: int,
         *,
         edit: bool = False,
+        cached: bool = False,
         timeout: float | None = 2,
     ) -> Self:
+        if cached and not edit:
+            return await cls.fetch_cached(
+                connection,
+                {"user_id": user_id},
+                timeout=timeout,
+                insert_if_not_found=True,
+            )
         return await cls.fetch(
             connection,
             {"user_id": user_id},
@@ -0,0 +1,32 @@
+"""
+Connection helpers shared by the maintenance scripts. Connects to the database from the
+bot's own config, unless a DSN is given.
+"""
+
+import argparse
+
+import asyncpg
+import toml
+
+CONFIG_PATH = "config/config.toml"
+
+
+def add_database_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--dsn",
+        help=f"PostgreSQL DSN, defaults to the [database] section of {CONFIG_PATH}",
+    )
+
+
+async def connect(args: argparse.Namespace) -> asyncpg.Connection:
+    if args.dsn is not None:
+        return await asyncpg.connect(args.dsn)
+
+    database_config = toml.load(CONFIG_PATH)["database"]
+    return await asyncpg.connect(
+        user=database_config["user"] or None,
+        password=database_config["password"] or None,
+        database=database_config["database"],
+        host=database_config["host"],
+        port=database_config["port"],
+    )
@@ -0,0 +1,112 @@
+"""
+Maintenance for the donor_totals aggregate behind the donation leaderboard.
+
+    $ python -m scripts.donor_totals backfill   # rebuild donor_totals from donations
+    $ python -m scripts.donor_totals check      # compare donor_totals against donations
+
+`check` exits with status 1 when it finds any mismatches.
+"""
+
+import argparse
+import asyncio
+import sys
+
+import asyncpg
+
+from scripts.database import add_database_arguments, connect
+
+# Computed totals next to stored totals, for every donor that appears in either
+COMPARISON_QUERY = """
+    SELECT
+        COALESCE(computed.donor_id, donor_totals.donor_id) AS donor_id,
+        COALESCE(computed.total_amount, 0) AS computed_amount,
+        COALESCE(donor_totals.total_amount, 0) AS stored_amount
+    FROM (
+        SELECT donor_id, sum(amount) AS total_amount
+        FROM donations
+        GROUP BY donor_id
+    ) AS computed
+    FULL OUTER JOIN donor_totals
+        ON donor_totals.donor_id = computed.donor_id
+    WHERE computed.total_amount IS DISTINCT FROM donor_totals.total_amount
+    ORDER BY donor_id
+"""
+
+
+async def backfill(connection: asyncpg.Connection) -> None:
+    async with connection.transaction():
+        # Blocks new donations (but not reads) so no increment lands between the
+        # recount and the swap
+        await connection.execute("LOCK TABLE donations IN SHARE MODE")
+        await connection.execute("LOCK TABLE donor_totals IN EXCLUSIVE MODE")
+
+        upserted = await connection.execute(
+            """
+            INSERT INTO donor_totals (donor_id, total_amount)
+            SELECT donor_id, sum(amount)
+            FROM donations
+            GROUP BY donor_id
+            ON CONFLICT (donor_id)
+            DO UPDATE SET total_amount = EXCLUDED.total_amount
+            """
+        )
+        deleted = await connection.execute(
+            """
+            DELETE FROM donor_totals
+            WHERE NOT EXISTS (
+                SELECT 1 FROM donations WHERE donations.donor_id = donor_totals.donor_id
+            )
+            """
+        )
+
+    print(f"Backfilled donor_totals ({upserted}, {deleted})")
+
+
+async def check(connection: asyncpg.Connection, *, limit: int) -> bool:
+    """Returns whether donor_totals is consistent with donations"""
+    async with connection.transaction(isolation="repeatable_read", readonly=True):
+        mismatches = await connection.fetch(COMPARISON_QUERY)
+        donor_count = await connection.fetchval("SELECT count(*) FROM donor_totals")
+
+    if not mismatches:
+        print(f"donor_totals is consistent ({donor_count} donors)")
+        return True
+
+    print(f"donor_totals has {len(mismatches)} mismatching donors:")
+    for record in mismatches[:limit]:
+        print(
+            f"  {record['donor_id']}: stored {record['stored_amount']},"
+            f" computed {record['computed_amount']}"
+        )
+    if len(mismatches) > limit:
+        print(f"  ... and {len(mismatches) - limit} more")
+
+    return False
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_database_arguments(parser)
+    subparsers = parser.add_subparsers(dest="action", required=True)
+    subparsers.add_parser("backfill", help="rebuild donor_totals from donations")
+    check_parser = subparsers.add_parser(
+        "check", help="compare donor_totals against donations"
+    )
+    check_parser.add_argument(
+        "--limit", type=int, default=20, help="maximum amount of mismatches to print"
+    )
+    args = parser.parse_args()
+
+    connection = await connect(args)
+
+    try:
+        if args.action == "backfill":
+            await backfill(connection)
+        elif not await check(connection, limit=args.limit):
+            sys.exit(1)
+    finally:
+        await connection.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,246 @@
+"""
+Versioned schema migrations.
+
+    $ python -m scripts.migrate            # apply every pending migration
+    $ python -m scripts.migrate --dry-run  # only show what would be applied
+    $ python -m scripts.migrate --target 2 # stop after migration 0002
+
+`config/database.pgsql` is always the full, current schema. A database without any
+tables is created from it directly and every migration is recorded as applied, so
+`--target` only applies to existing databases. Those are upgraded by applying the
+pending scripts from `config/migrations`, named `{version:04}_{name}.pgsql`, in order.
+Each script runs in its own transaction, unless its first line is
+`-- migrate: no-transaction` (needed for `CREATE INDEX CONCURRENTLY`), in which case
+every `;`-terminated statement is run on its own.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import os
+import re
+import sys
+from typing import NamedTuple
+
+import asyncpg
+
+from scripts.database import add_database_arguments, connect
+
+SCHEMA_PATH = "config/database.pgsql"
+MIGRATIONS_DIRECTORY = "config/migrations"
+NO_TRANSACTION_MARKER = "-- migrate: no-transaction"
+# Arbitrary, just needs to be the same for every runner
+ADVISORY_LOCK_KEY = 0x70705F6D69677261
+
+_MIGRATION_FILENAME_PATTERN = re.compile(r"^(\d{4})_(\w+)\.pgsql$")
+_STATEMENT_END_PATTERN = re.compile(r";\s*$", re.MULTILINE)
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    sql: str
+
+    @property
+    def checksum(self) -> str:
+        return hashlib.sha256(self.sql.encode()).hexdigest()
+
+    @property
+    def transactional(self) -> bool:
+        return not self.sql.startswith(NO_TRANSACTION_MARKER)
+
+    @property
+    def statements(self) -> list[str]:
+        statements: list[str] = []
+        start = 0
+
+        for match in _STATEMENT_END_PATTERN.finditer(self.sql):
+            statements.append(self.sql[start : match.end()].strip())
+            start = match.end()
+
+        if self.sql[start:].strip():
+            statements.append(self.sql[start:].strip())
+
+        return statements
+
+    def __str__(self) -> str:
+        return f"{self.version:04}_{self.name}"
+
+
+def load_migrations(directory: str = MIGRATIONS_DIRECTORY) -> list[Migration]:
+    migrations: list[Migration] = []
+
+    for filename in sorted(os.listdir(directory)):
+        match = _MIGRATION_FILENAME_PATTERN.match(filename)
+
+        if match is None:
+            raise ValueError(
+                f"Migration {directory}/{filename} isn't named {{version:04}}_{{name}}.pgsql"
+            )
+
+        with open(f"{directory}/{filename}") as file:
+            migrations.append(Migration(int(match[1]), match[2], file.read()))
+
+    versions = [migration.version for migration in migrations]
+    if len(set(versions)) != len(versions):
+        raise ValueError(f"{directory} contains duplicate migration versions")
+
+    return migrations
+
+
+async def _ensure_migrations_table(connection: asyncpg.Connection) -> None:
+    await connection.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            checksum TEXT NOT NULL,
+            applied_at TIMESTAMP NOT NULL DEFAULT timezone('UTC', now())
+        )
+        """
+    )
+
+
+async def _record(connection: asyncpg.Connection, migration: Migration) -> None:
+    await connection.execute(
+        """
+        INSERT INTO schema_migrations (version, name, checksum)
+        VALUES ($1, $2, $3)
+        """,
+        migration.version,
+        migration.name,
+        migration.checksum,
+    )
+
+
+async def _apply(connection: asyncpg.Connection, migration: Migration) -> None:
+    if migration.transactional:
+        async with connection.transaction():
+            await connection.execute(migration.sql)
+            await _record(connection, migration)
+        return
+
+    # Statements here must be idempotent (IF NOT EXISTS and such), as a failure halfway
+    # leaves the earlier statements applied and the migration unrecorded
+    for statement in migration.statements:
+        await connection.execute(statement)
+    await _record(connection, migration)
+
+
+async def migrate(
+    connection: asyncpg.Connection,
+    migrations: list[Migration],
+    *,
+    target: int | None = None,
+    dry_run: bool = False,
+    schema_path: str = SCHEMA_PATH,
+) -> list[Migration]:
+    """Returns the migrations that were (or, on a dry run, would be) applied"""
+    await connection.execute("SELECT pg_advisory_lock($1)", ADVISORY_LOCK_KEY)
+
+    try:
+        is_fresh = not await connection.fetchval(
+            "SELECT to_regclass('pps') IS NOT NULL"
+        )
+
+        if is_fresh:
+            # The schema file is the latest version, every migration is already in it
+            if target is not None:
+                raise ValueError(
+                    "A fresh database is always created at the latest version, --target"
+                    " only applies to existing databases"
+                )
+
+            print(f"Fresh database, creating the schema from {schema_path}")
+
+            if dry_run:
+                return migrations
+
+            with open(schema_path) as file:
+                schema = file.read()
+
+            async with connection.transaction():
+                await connection.execute(schema)
+                await _ensure_migrations_table(connection)
+                for migration in migrations:
+                    await _record(connection, migration)
+
+            return migrations
+
+        if not dry_run:
+            await _ensure_migrations_table(connection)
+
+        applied_checksums: dict[int, str] = {}
+        if await connection.fetchval(
+            "SELECT to_regclass('schema_migrations') IS NOT NULL"
+        ):
+            applied_checksums = {
+                record["version"]: record["checksum"]
+                for record in await connection.fetch(
+                    "SELECT version, checksum FROM schema_migrations"
+                )
+            }
+
+        if target is not None:
+            migrations = [
+                migration for migration in migrations if migration.version <= target
+            ]
+
+        pending: list[Migration] = []
+
+        for migration in migrations:
+            checksum = applied_checksums.get(migration.version)
+
+            if checksum is None:
+                pending.append(migration)
+            elif checksum != migration.checksum:
+                raise ValueError(
+                    f"Migration {migration} was changed after it was applied, add a new"
+                    " migration instead"
+                )
+
+        for migration in pending:
+            print(f"Applying {migration}")
+            if not dry_run:
+                await _apply(connection, migration)
+
+        return pending
+
+    finally:
+        await connection.execute("SELECT pg_advisory_unlock($1)", ADVISORY_LOCK_KEY)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_database_arguments(parser)
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="show pending migrations without applying",
+    )
+    parser.add_argument("--target", type=int, help="highest migration version to apply")
+    args = parser.parse_args()
+
+    migrations = load_migrations()
+    connection = await connect(args)
+
+    try:
+        applied = await migrate(
+            connection, migrations, target=args.target, dry_run=args.dry_run
+        )
+    except ValueError as error:
+        print(error, file=sys.stderr)
+        sys.exit(1)
+    finally:
+        await connection.close()
+
+    if not applied:
+        print("Nothing to migrate")
+    elif args.dry_run:
+        print(f"Dry run, {len(applied)} migration(s) not applied")
+    else:
+        print(f"Applied {len(applied)} migration(s)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())